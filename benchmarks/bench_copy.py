@@ -0,0 +1,56 @@
+# -*- coding : utf-8 -*-
+
+# Compares the structural copy() implementations against copy.deepcopy.
+# Run from the repository root with: PYTHONPATH=. python benchmarks/bench_copy.py
+
+from copy import deepcopy
+from timeit import repeat
+
+from geometry import Line, LineSegment, Point, Quaternion, Vector
+from geometry.object.path import Path
+from geometry.object.polygon import Polygon
+
+NUMBER = 20000
+
+OBJECTS = {
+    "Vector": Vector([1.0, 2.0, 3.0]),
+    "Point": Point(1.0, 2.0, 3.0),
+    "Quaternion": Quaternion(1.0, 2.0, 3.0, 4.0),
+    "Line": Line(Vector([1.0, 1.0, 0.0]), Point(1.0, 2.0, 3.0)),
+    "LineSegment": LineSegment(Point(0.0, 0.0, 0.0), Point(1.0, 2.0, 3.0)),
+    "Polygon": Polygon([Point(i, i + 1.0, i + 2.0) for i in range(8)]),
+    "Path": Path([Point(i, i + 1.0, i + 2.0) for i in range(8)]),
+}
+
+
+def best_of(stmt) -> float:
+    return min(repeat(stmt, number=NUMBER, repeat=5)) / NUMBER * 1e6
+
+
+def reference_deepcopy(obj):
+    # copy.deepcopy now dispatches to copy() through __deepcopy__, so the baseline
+    # reproduces the reflection based deepcopy of the instance state
+    cls = obj.__class__
+    clone = cls.__new__(cls)
+    memo = {id(obj): clone}
+    if hasattr(obj, "__dict__"):
+        clone.__dict__.update(deepcopy(obj.__dict__, memo))
+    else:
+        for name in (n for klass in cls.__mro__ for n in klass.__dict__.get("__slots__", ())):
+            setattr(clone, name, deepcopy(getattr(obj, name), memo))
+    return clone
+
+
+def main() -> None:
+    print(f"{'object':<12} {'deepcopy [us]':>14} {'copy() [us]':>12} {'speedup':>8}")
+    for name, obj in OBJECTS.items():
+        slow = best_of(lambda: reference_deepcopy(obj))
+        fast = best_of(obj.copy)
+        print(f"{name:<12} {slow:>14.3f} {fast:>12.3f} {slow / fast:>7.1f}x")
+
+    u, v = Vector([1.0, 2.0, 3.0]), Vector([4.0, 5.0, 6.0])
+    print(f"\nVector.cross: {best_of(lambda: u.cross(v)):.3f} us")
+
+
+if __name__ == "__main__":
+    main()
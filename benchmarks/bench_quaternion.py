@@ -0,0 +1,35 @@
+# -*- coding : utf-8 -*-
+
+# Times the single quaternion arithmetic that runs on the four flat components.
+# Run from the repository root with: PYTHONPATH=. python benchmarks/bench_quaternion.py
+
+from timeit import repeat
+
+from geometry import Quaternion
+
+NUMBER = 100000
+
+
+def best_of(stmt) -> float:
+    return min(repeat(stmt, number=NUMBER, repeat=5)) / NUMBER * 1e6
+
+
+def main() -> None:
+    p, q = Quaternion(1.0, 2.0, 3.0, 4.0), Quaternion(0.5, 0.1, 0.2, 0.3)
+    out = Quaternion()
+    cases = {
+        "p * q": lambda: p * q,
+        "p.multiply(q, out)": lambda: p.multiply(q, out=out),
+        "p.conjugate()": p.conjugate,
+        "p.inverse()": p.inverse,
+        "p.norm()": p.norm,
+        "p.normalize()": p.normalize,
+        "p.slerp(q, 0.3)": lambda: p.normalize().slerp(q.normalize(), 0.3),
+    }
+    print(f"{'operation':<20} {'time [us]':>10}")
+    for name, stmt in cases.items():
+        print(f"{name:<20} {best_of(stmt):>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+# -*- coding : utf-8 -*-
+
+# Times cast_rays on a height field of triangles with and without a BVH.
+# Run from the repository root with: PYTHONPATH=. python benchmarks/bench_raycast.py
+
+from time import perf_counter
+
+import numpy as np
+
+from geometry.spatial import BVH
+from geometry.utilities import cast_rays
+
+GRID = 317
+RAYS = 1000000
+
+
+def terrain(n: int) -> np.ndarray:
+    x, y = np.meshgrid(np.linspace(0, 100, n), np.linspace(0, 100, n))
+    grid = np.stack((x, y, 3 * np.sin(x / 7) * np.cos(y / 5)), axis=-1)
+    a, b, c, d = grid[:-1, :-1], grid[1:, :-1], grid[1:, 1:], grid[:-1, 1:]
+    return np.concatenate((np.stack((a, b, c), axis=-2).reshape(-1, 3, 3),
+                           np.stack((a, c, d), axis=-2).reshape(-1, 3, 3)))
+
+
+def main() -> None:
+    rng = np.random.default_rng(0)
+    triangles = terrain(GRID)
+    origins = np.column_stack((rng.random((RAYS, 2)) * 100, np.full(RAYS, 20.0)))
+    directions = np.column_stack((rng.normal(size=(RAYS, 2)) * 0.3, -np.ones(RAYS)))
+
+    start = perf_counter()
+    bvh = BVH(triangles)
+    print(f"BVH over {len(triangles)} triangles built in {perf_counter() - start:.2f} s")
+
+    start = perf_counter()
+    t, _, _ = cast_rays(origins, directions, bvh)
+    elapsed = perf_counter() - start
+    print(f"{RAYS} rays with BVH: {elapsed:.2f} s, {elapsed / RAYS * 1e6:.2f} us per ray, "
+          f"{np.isfinite(t).mean():.0%} hit")
+
+    sample = RAYS // 10000
+    start = perf_counter()
+    cast_rays(origins[:sample], directions[:sample], triangles)
+    elapsed = perf_counter() - start
+    print(f"{sample} rays without BVH: {elapsed:.2f} s, {elapsed / sample * 1e6:.2f} us per ray")
+
+
+if __name__ == "__main__":
+    main()
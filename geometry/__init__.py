@@ -6,7 +6,12 @@ from geometry.object.vector import Vector
 from geometry.object.axes import Axes
 from geometry.object.point import Point
 from geometry.object.quaternion import Quaternion
+from geometry.object.transform import Transform
 from geometry.object.line import Line
 from geometry.object.line_segment import LineSegment
+from geometry.object.vector_array import VectorArray
+from geometry.object.point_cloud import PointCloud
+from geometry.object.quaternion_array import QuaternionArray
 
-__all__ = ["Vector", "Point", "Quaternion", "Axes", "Line", "LineSegment"]
+__all__ = ["Vector", "Point", "Quaternion", "Transform", "Axes", "Line", "LineSegment", "VectorArray", "PointCloud",
+           "QuaternionArray"]
@@ -1,23 +1,31 @@
 # -*- coding : utf-8 -*-
 
 from math import isclose
-from typing import Optional
+from typing import Optional, Tuple, Union
 
-from geometry import Vector, Point
+import numpy as np
 
+from geometry import Vector, Point, Quaternion, Transform
+from geometry.object.polygon import Polygon
+from geometry.types import Real
+from geometry.utilities.copyable import CopyableMixin
+from geometry.utilities.distance import project_onto_lines
+from geometry.utilities.intersection import _intersect_pair
 
-class Line:
+
+class Line(CopyableMixin):
 
     def __init__(self, direction_vector: Vector = Vector([1, 0, 0]), point: Point = Point(0, 0, 0)):
 
-        if type(direction_vector) != Vector:
+        if not isinstance(direction_vector, Vector) or isinstance(direction_vector, Point):
             raise TypeError("direction_vector must be of type Vector")
         if not isinstance(point, Point):
             raise TypeError("point must be of type Point")
 
         if direction_vector.is_zero_vector():
             raise ValueError(f"direction_vector: {direction_vector} is an undefined vector")
-        self.direction_vector = direction_vector
+        # Subclasses like the vector part of a Quaternion are views, the line keeps its own plain copy
+        self.direction_vector = direction_vector if type(direction_vector) is Vector else direction_vector.copy()
         self.point = point
 
     def contains_point(self, point: Point) -> bool:
@@ -37,39 +45,76 @@ class Line:
 
         return True
 
+    def closest_point(self, point: Point) -> Point:
+        """
+        Returns the orthogonal projection of point onto the line
+        """
+        o, d = self.point.values, self.direction_vector.values
+        t = sum((p - q) * u for p, q, u in zip(point.values, o, d)) / sum(u * u for u in d)
+        return Point._unchecked([q + t * u for q, u in zip(o, d)])
+
+    def distance_to(self, point: Point) -> Real:
+        return point.distance_to(self.closest_point(point))
+
+    def project_points(self, points) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Projects a batch of points onto the line and returns the closest points, their parameters t in
+        multiples of direction_vector from point and the distances, see geometry.utilities.project_onto_lines
+        """
+        return project_onto_lines(points, self.point, self.direction_vector)
+
     def is_parallel(self, other: "Line") -> bool:
-        return (self.direction_vector.is_parallel(other.direction_vector) or
-                self.direction_vector.is_antiparallel(other.direction_vector))
+        d = self.direction_vector._unit_dot(other.direction_vector)
+        return isclose(d, 1.0) or isclose(d, -1.0)
 
     def is_orthogonal(self, other: "Line") -> bool:
         return self.direction_vector.is_orthogonal(other.direction_vector)
 
-    def intersection(self, other: "Line") -> Optional[Point]:
-        if self.is_parallel(other):
-            return None
-        if self.contains_point(other.point):
-            return other.point.copy()
-        elif other.contains_point(self.point):
-            return self.point.copy()
-
-        connector_line = Line.from_points(self.point, other.point)
-        otherXconnector = other.direction_vector.cross(connector_line.direction_vector)
-        otherXself = other.direction_vector.cross(self.direction_vector)
-
-        otherXconnector_mag = otherXconnector.magnitude()
-        otherXself_mag = otherXself.magnitude()
-
-        if any(isclose(i, 0.0, abs_tol=1e-04) for i in (otherXconnector_mag, otherXself_mag)):
-            return None
-
-        quotient = otherXconnector_mag / otherXself_mag
-        interm = self.direction_vector.scale(quotient)
-        if otherXconnector.is_parallel(otherXself):
-            return self.point + interm
-        elif otherXconnector.is_antiparallel(otherXself):
-            return self.point - interm
-        else:
-            raise Exception("Something is wrong with the intersection calculation, please notify the author!")
+    def transform(self, t: Transform) -> None:
+        """
+        Moves the line by t right away, a Line only holds one point and one direction
+        """
+        direction_vector = t.apply(self.direction_vector)
+        if direction_vector.is_zero_vector():
+            raise ValueError("transform collapses the direction of the line")
+        if self.direction_vector._cache is not None:
+            direction_vector.enable_caching()
+        self.point = t.apply(self.point)
+        self.direction_vector = direction_vector
+
+    def translate(self, dx: Real, dy: Real, dz: Real) -> None:
+        self.point = self.point + Vector([dx, dy, dz])
+
+    def rotate(self, q: Quaternion, center: Optional[Point] = None) -> None:
+        self.transform(Transform.rotation(q, center))
+
+    def rotate_around_axis(self, axis: Vector, angle: Real, center: Optional[Point] = None) -> None:
+        self.transform(Transform.rotation_around_axis(axis, angle, center))
+
+    def enable_caching(self) -> "Line":
+        """
+        Opt in to memoizing the normalized direction used by the parallel and orthogonal predicates
+        """
+        self.direction_vector.enable_caching()
+        return self
+
+    def intersection(self, other: Union["Line", Polygon]) -> Optional[Point]:
+        """
+        Returns the point where both lines meet, None for parallel, coincident and skew lines. See
+        geometry.utilities.intersect_lines for intersecting many pairs of lines at once. For a Polygon,
+        returns the point where the line crosses it, see Polygon.intersection.
+        """
+        if isinstance(other, Polygon):
+            return other.intersection(self)
+        _, values = _intersect_pair(self.point.values, self.direction_vector.values, other.point.values,
+                                    other.direction_vector.values)
+        return None if values is None else Point._unchecked(values)
+
+    def copy(self) -> "Line":
+        line = object.__new__(self.__class__)
+        line.direction_vector = self.direction_vector.copy()
+        line.point = self.point.copy()
+        return line
 
     @classmethod
     def from_points(cls, p0: Point, p1: Point) -> "Line":
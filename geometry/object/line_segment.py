@@ -1,24 +1,145 @@
 # -*- coding : utf-8 -*-
 
+from typing import List, Optional, Tuple
+
+import numpy as np
+
 from geometry import Point
+from geometry.types import Real
+from geometry.utilities.copyable import CopyableMixin
+from geometry.utilities.distance import project_onto_segments
+from geometry.utilities.predicates import collinear
+from geometry.utilities.transformable import TransformableMixin
 
 
-class LineSegment:
+class LineSegment(TransformableMixin, CopyableMixin):
 
-    def __init__(self, a: Point = Point(0, 0, 0), b: Point = Point(1, 0, 0)):
+    def __init__(self, a: Optional[Point] = None, b: Optional[Point] = None):
+        # Fresh default end points, a pending transform is applied to the end points in place
+        a = Point(0, 0, 0) if a is None else a
+        b = Point(1, 0, 0) if b is None else b
         if not all(isinstance(p, Point) for p in (a, b)):
             raise TypeError("args a and b must be of type Point")
         if a == b:
             raise ValueError("points a and b are same!")
-        self.a = a
-        self.b = b
+        self._a = a
+        self._b = b
+        self._transform = None
+        self._cache = None
+        self._cache_key = None
+
+    @property
+    def a(self) -> Point:
+        if self._transform is not None:
+            self._apply_pending()
+        return self._a
+
+    @a.setter
+    def a(self, point: Point) -> None:
+        self._apply_pending()
+        self._a = point
+
+    @property
+    def b(self) -> Point:
+        if self._transform is not None:
+            self._apply_pending()
+        return self._b
+
+    @b.setter
+    def b(self, point: Point) -> None:
+        self._apply_pending()
+        self._b = point
+
+    def _transform_targets(self) -> List[Point]:
+        return [self._a, self._b]
 
     @property
     def direction_vector(self):
-        return (self.b - self.a).to_vector()
+        cache = self._valid_cache()
+        if cache is None:
+            return (self.b - self.a).to_vector()
+        direction_vector = cache.get("direction_vector")
+        if direction_vector is None:
+            direction_vector = cache["direction_vector"] = (self.b - self.a).to_vector().enable_caching()
+        # Callers get their own copy, which keeps what the cached vector memoized so far in a separate dict,
+        # so mutating it cannot corrupt the cache
+        result = direction_vector.copy()
+        result._cache = dict(direction_vector._cache)
+        return result
 
-    def contains_point(self, point: Point):
-        return Point.check_collinear(self.a, point, self.b, ordered=True)
+    def contains_point(self, point: Point, exact: bool = False):
+        return Point.check_collinear(self.a, point, self.b, ordered=True, exact=exact)
+
+    def contains_points(self, points, exact: bool = False):
+        """
+        Returns a mask of the points which lie on the segment, for a batch of points given as a PointCloud,
+        an (N, 3) array or an iterable of Points
+        """
+        return collinear(self.a, points, self.b, ordered=True, exact=exact)
+
+    def closest_point(self, point: Point) -> Point:
+        a, b = self.a.values, self.b.values
+        d = [j - i for i, j in zip(a, b)]
+        t = sum((p - i) * u for p, i, u in zip(point.values, a, d)) / sum(u * u for u in d)
+        t = min(max(t, 0.0), 1.0)
+        return Point._unchecked([i + t * u for i, u in zip(a, d)])
+
+    def distance_to(self, point: Point) -> Real:
+        return point.distance_to(self.closest_point(point))
+
+    def project_points(self, points) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the closest points of the segment to a batch of points, their parameters t in [0, 1] from a to
+        b and the distances, see geometry.utilities.project_onto_segments
+        """
+        return project_onto_segments(points, self.a, self.b)
+
+    def bounds(self):
+        return Point.bounding_box((self.a, self.b))
 
     def length(self):
-        return self.a.distance_to(self.b)
+        cache = self._valid_cache()
+        if cache is None:
+            return self.a.distance_to(self.b)
+        length = cache.get("length")
+        if length is None:
+            length = cache["length"] = self.a.distance_to(self.b)
+        return length
+
+    def enable_caching(self) -> "LineSegment":
+        """
+        Opt in to memoizing direction_vector and length until either end point is mutated or replaced.
+        Changes are detected through the caches of the end points, so this also enables caching on both end
+        Points, which affects every other shape sharing them.
+        """
+        self.a.enable_caching()
+        self.b.enable_caching()
+        if self._cache is None:
+            self._cache = {}
+        return self
+
+    def disable_caching(self) -> None:
+        self._cache = None
+        self._cache_key = None
+
+    def _valid_cache(self):
+        if self._cache is None:
+            return None
+        a, b = self.a, self.b
+        if a._cache is None or b._cache is None:
+            return None
+        # End points swap their cache dict on every mutation, so comparing identities detects any change
+        key = self._cache_key
+        if key is None or key[0] is not a or key[1] is not a._cache or key[2] is not b or key[3] is not b._cache:
+            self._cache = {}
+            self._cache_key = (a, a._cache, b, b._cache)
+        return self._cache
+
+    def copy(self) -> "LineSegment":
+        segment = object.__new__(self.__class__)
+        segment._a = self._a.copy()
+        segment._b = self._b.copy()
+        segment._transform = self._transform
+        segment._cache = None if self._cache is None else {}
+        segment._cache_key = None
+        return segment
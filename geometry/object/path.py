@@ -1,15 +1,32 @@
 # -*- coding : utf-8 -*-
 
-from typing import Iterable
+from typing import Iterable, List, Tuple
 
 from geometry import Point
+from geometry.utilities.copyable import CopyableMixin
+from geometry.utilities.transformable import TransformableMixin
 
 
-class Path:
+class Path(TransformableMixin, CopyableMixin):
 
     def __init__(self, points: Iterable[Point]):
-        self.points = points if isinstance(points, list) else [p for p in points]
-        assert len(self.points) > 1, "Number of points must be more than 1"
+        self._points = points if isinstance(points, list) else [p for p in points]
+        self._transform = None
+        assert len(self._points) > 1, "Number of points must be more than 1"
+
+    @property
+    def points(self) -> List[Point]:
+        if self._transform is not None:
+            self._apply_pending()
+        return self._points
+
+    @points.setter
+    def points(self, points: List[Point]) -> None:
+        self._apply_pending()
+        self._points = points
+
+    def _transform_targets(self) -> List[Point]:
+        return self._points
 
     def append(self, point: Point) -> None:
         self.points.append(point)
@@ -22,3 +39,12 @@ class Path:
 
     def pop(self, index) -> None:
         self.points.pop(index)
+
+    def bounds(self) -> Tuple[Point, Point]:
+        return Point.bounding_box(self.points)
+
+    def copy(self) -> "Path":
+        path = object.__new__(self.__class__)
+        path._points = [p.copy() for p in self._points]
+        path._transform = self._transform
+        return path
@@ -1,17 +1,24 @@
 # -*- coding : utf-8 -*-
 
 from math import atan2, sqrt, isnan, isclose
-from typing import Tuple
+from typing import Iterable, Tuple
 
 from geometry import Vector, Axes
 from geometry.error import InvalidSizeError
+from geometry.object.quaternion import Quaternion
 from geometry.types import Real
+from geometry.utilities.predicates import collinear
 
 
 class Point(Vector):
 
+    __slots__ = ()
+
     def __init__(self, x: Real = 0.0, y: Real = 0.0, z: Real = 0.0) -> None:
-        super().__init__([x, y, z])
+        if not (isinstance(x, (int, float)) and isinstance(y, (int, float)) and isinstance(z, (int, float))):
+            raise ValueError("values must be of type Real")
+        self.values = [x, y, z]
+        self._cache = None
 
     @property
     def x(self) -> Real:
@@ -21,6 +28,7 @@ class Point(Vector):
     def x(self, value: Real) -> None:
         assert isinstance(value, (int, float))
         self.values[0] = value
+        self._invalidate()
 
     @property
     def y(self) -> Real:
@@ -30,6 +38,7 @@ class Point(Vector):
     def y(self, value: Real) -> None:
         assert isinstance(value, (int, float))
         self.values[1] = value
+        self._invalidate()
 
     @property
     def z(self) -> Real:
@@ -39,30 +48,7 @@ class Point(Vector):
     def z(self, value) -> None:
         assert isinstance(value, (int, float))
         self.values[2] = value
-
-    def __add__(self, other: "Point") -> "Point":
-        if not isinstance(other, Vector):
-            raise TypeError(f"Cannot add instances of type {type(other)} and {type(self)}")
-
-        return Point(*super().__add__(other))
-
-    def __sub__(self, other: "Point") -> "Point":
-        if not isinstance(other, Vector):
-            raise TypeError(f"Cannot subtract instances of type {type(other)} and {type(self)}")
-
-        return Point(*super().__sub__(other))
-
-    def __mul__(self, other: "Point") -> "Point":
-        if not isinstance(other, Vector):
-            raise TypeError(f"Cannot multiply instances of type {type(other)} and {type(self)}")
-
-        return Point(*super().__mul__(other))
-
-    def __truediv__(self, other: "Point") -> "Point":
-        if not isinstance(other, Vector):
-            raise TypeError(f"Cannot divide instances of type {type(other)} and {type(self)}")
-
-        return Point(*super().__truediv__(other))
+        self._invalidate()
 
     def __eq__(self, other: "Point") -> bool:
         if not isinstance(other, Point):
@@ -70,30 +56,40 @@ class Point(Vector):
         return all(isclose(i, j, rel_tol=1e-09, abs_tol=1e-04) for i, j in zip(self, other))
 
     def __hash__(self) -> int:
-        return hash(self.as_tuple())
+        return Vector.__hash__(self)
 
     def __str__(self) -> str:
         return f"{self.__class__.__name__}(x={self.x:.4f}, y={self.y:.4f}, z={self.z:.4f})"
 
     def __round__(self, n=None) -> "Point":
-        return Point(*(round(i, n) for i in self))
+        return self._unchecked([round(i, n) for i in self.values])
 
     def translate(self, dx: Real, dy: Real, dz: Real) -> None:
-        self.x += dx
-        self.y += dy
-        self.z += dz
+        v = self.values
+        v[0] += dx
+        v[1] += dy
+        v[2] += dz
+        self._invalidate()
 
     def translate_uniform(self, d: Real) -> None:
         self.translate(d, d, d)
 
-    def rotate(self, q) -> "Point":
-        raise NotImplementedError()
+    def rotate(self, q: Quaternion) -> "Point":
+        """
+        Returns a new Point rotated around the origin by the quaternion q
+        """
+        return q.rotate(self)
 
-    def rotate_around_axis(self, axis, angle):
-        raise NotImplementedError()
+    def rotate_around_axis(self, axis: Vector, angle: Real) -> "Point":
+        """
+        Returns a new Point rotated by angle, in radians, counter-clockwise around axis through the origin
+        """
+        return Quaternion.from_axis_angle(axis, angle).rotate(self)
 
     def distance_to(self, other) -> Real:
-        return sqrt((other.x - self.x) ** 2 + (other.y - self.y) ** 2 + (other.z - self.z) ** 2)
+        a, b = self.values, other.values
+        dx, dy, dz = b[0] - a[0], b[1] - a[1], b[2] - a[2]
+        return sqrt(dx * dx + dy * dy + dz * dz)
 
     def near(self, other, threshold=0.01) -> bool:
         return self.distance_to(other) <= threshold
@@ -109,7 +105,7 @@ class Point(Vector):
             raise ValueError("Invalid value for axis")
 
     def to_vector(self) -> "Vector":
-        return Vector(self)
+        return Vector._unchecked(list(self.values))
 
     @property
     def is_undefined(self) -> bool:
@@ -129,15 +125,36 @@ class Point(Vector):
             raise InvalidSizeError("length of tuple must be 3")
         return cls(*tup)
 
+    @classmethod
+    def from_buffer(cls, buffer) -> "Point":
+        point = super().from_buffer(buffer)
+        if len(point) != 3:
+            raise InvalidSizeError("buffer must hold exactly 3 float64 values")
+        return point
+
     @staticmethod
-    def check_collinear(a: "Point", b: "Point", c: "Point", ordered=False) -> bool:
+    def bounding_box(points: Iterable["Point"]) -> Tuple["Point", "Point"]:
+        """
+        Returns the minimum and maximum corners of the axis-aligned bounding box around points
+        """
+        columns = list(zip(*(p.values for p in points)))
+        if not columns:
+            raise ValueError("Cannot compute the bounding box of no points")
+        return Point._unchecked([min(c) for c in columns]), Point._unchecked([max(c) for c in columns])
+
+    @staticmethod
+    def check_collinear(a: "Point", b: "Point", c: "Point", ordered=False, exact=False) -> bool:
+        if exact:
+            # Exact test with robust predicates instead of the fixed tolerances below
+            return collinear(a, b, c, ordered=ordered, exact=True)
+
         if a == b or b == c:
             return True
         elif c == a:
             return not ordered
 
-        u = (b - a).to_vector()
-        v = (c - a).to_vector()
+        u = b - a
+        v = c - a
 
         uXv = u.cross(v)
         if not uXv.is_zero_vector():
@@ -0,0 +1,84 @@
+# -*- coding : utf-8 -*-
+
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+
+from geometry import Point, VectorArray
+from geometry.error import InvalidSizeError
+from geometry.types import Real
+
+
+class PointCloud(VectorArray):
+    """
+    Array backed container of N points stored as one contiguous (N, 3) float64 buffer.
+
+    Point-wise operations mirror the ones on Point, the vertex lists of Polygon and Path convert with
+    from_points and to_points.
+    """
+
+    _element = Point
+
+    def __init__(self, values: Iterable[Iterable[Real]] = ()) -> None:
+        super().__init__(values)
+        if self.values.size == 0:
+            self.values = self.values.reshape(0, 3)
+        if self.values.shape[1] != 3:
+            raise InvalidSizeError(f"points must have 3 coordinates, got {self.values.shape[1]}")
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(size={len(self)})"
+
+    def translate(self, dx: Real, dy: Real, dz: Real) -> None:
+        self.values += (dx, dy, dz)
+
+    def translate_uniform(self, d: Real) -> None:
+        self.values += d
+
+    def centroid(self) -> Point:
+        if not len(self):
+            raise ValueError("Cannot compute the centroid of an empty PointCloud")
+        return Point._unchecked(self.values.mean(axis=0).tolist())
+
+    def bounds(self) -> Tuple[Point, Point]:
+        """
+        Returns the minimum and maximum corners of the axis-aligned bounding box
+        """
+        if not len(self):
+            raise ValueError("Cannot compute the bounds of an empty PointCloud")
+        return Point._unchecked(self.values.min(axis=0).tolist()), Point._unchecked(self.values.max(axis=0).tolist())
+
+    def distance_to(self, other: Point) -> np.ndarray:
+        diff = self.values - np.asarray(other.values, dtype=np.float64)
+        return np.sqrt(np.einsum("ij,ij->i", diff, diff))
+
+    def near(self, other: Point, threshold: Real = 0.01) -> np.ndarray:
+        """
+        Returns a mask of the points within threshold of other, index the cloud with it to filter
+        """
+        diff = self.values - np.asarray(other.values, dtype=np.float64)
+        return np.einsum("ij,ij->i", diff, diff) <= threshold * threshold
+
+    def to_points(self, out: Optional[List[Point]] = None) -> List[Point]:
+        """
+        Returns the rows as new Points, or writes them into the existing Points of out, e.g. the vertices
+        of a Polygon, and returns out
+        """
+        if out is None:
+            return self.to_vectors()
+        if len(out) != len(self):
+            raise InvalidSizeError(f"Cannot write {len(self)} points into a list of {len(out)} points")
+        for point, row in zip(out, self.values.tolist()):
+            point.values[:] = row
+            point._invalidate()
+        return out
+
+    @classmethod
+    def from_points(cls, points: Iterable[Point]) -> "PointCloud":
+        return cls.from_vectors(points)
+
+    @classmethod
+    def from_buffer(cls, buffer, dim: int = 3) -> "PointCloud":
+        if dim != 3:
+            raise InvalidSizeError("points must have 3 coordinates")
+        return super().from_buffer(buffer, dim)
@@ -1,16 +1,110 @@
 # -*- coding : utf-8 -*-
 
-from typing import Iterable
+from typing import TYPE_CHECKING, Iterable, List, Optional, Tuple
+
+import numpy as np
 
 from geometry import Point
-from geometry.types import Real
+from geometry.utilities.copyable import CopyableMixin
+from geometry.utilities.intersection import _ray_triangles
+from geometry.utilities.predicates import _orient2d
+from geometry.utilities.transformable import TransformableMixin
+
+if TYPE_CHECKING:
+    from geometry import Line
 
 
-class Polygon:
+class Polygon(TransformableMixin, CopyableMixin):
 
     def __init__(self, vertices: Iterable[Point]):
-        self.vertices = vertices if isinstance(vertices, list) else [v for v in vertices]
+        self._vertices = vertices if isinstance(vertices, list) else [v for v in vertices]
+        self._transform = None
+
+    @property
+    def vertices(self) -> List[Point]:
+        if self._transform is not None:
+            self._apply_pending()
+        return self._vertices
+
+    @vertices.setter
+    def vertices(self, vertices: List[Point]) -> None:
+        self._apply_pending()
+        self._vertices = vertices
+
+    def _transform_targets(self) -> List[Point]:
+        return self._vertices
+
+    def bounds(self) -> Tuple[Point, Point]:
+        return Point.bounding_box(self.vertices)
+
+    def triangulate(self) -> List[Tuple[int, int, int]]:
+        """
+        Splits the planar, simple polygon into triangles by ear clipping and returns them as triples of vertex
+        indices, wound like the polygon. Takes O(n^2) for n vertices. Degenerate polygons give no triangles.
+        """
+        values = [v.values for v in self.vertices]
+        n = len(values)
+        # Newell's normal, the polygon is clipped in the coordinate plane it is least tilted against
+        normal = [0.0, 0.0, 0.0]
+        for (x0, y0, z0), (x1, y1, z1) in zip(values, values[1:] + values[:1]):
+            normal[0] += (y0 - y1) * (z0 + z1)
+            normal[1] += (z0 - z1) * (x0 + x1)
+            normal[2] += (x0 - x1) * (y0 + y1)
+        axis = max(range(3), key=lambda k: abs(normal[k]))
+        u, v = [k for k in range(3) if k != axis]
+        points = [(p[u], p[v]) for p in values]
+        area = sum(x0 * y1 - x1 * y0 for (x0, y0), (x1, y1) in zip(points, points[1:] + points[:1]))
+        if n < 3 or area == 0:
+            return []
+        sign = 1.0 if area > 0 else -1.0
+
+        def turn(i: int, j: int, k: int) -> float:
+            return sign * _orient2d(points[i], points[j], points[k])
+
+        remaining = list(range(n))
+        triangles = []
+        while len(remaining) > 3:
+            m = len(remaining)
+            for k in range(m):
+                i, j, h = remaining[k - 1], remaining[k], remaining[(k + 1) % m]
+                if turn(i, j, h) <= 0:
+                    continue
+                corners = {points[i], points[j], points[h]}
+                if any(points[o] not in corners and turn(i, j, o) >= 0 and turn(j, h, o) >= 0 and turn(h, i, o) >= 0
+                       for o in remaining):
+                    continue
+                triangles.append((i, j, h))
+                del remaining[k]
+                break
+            else:
+                # No ear left, which only happens at flat corners or for polygons that are not simple
+                k = next((k for k in range(m) if turn(remaining[k - 1], remaining[k], remaining[(k + 1) % m]) == 0),
+                         0)
+                del remaining[k]
+        if turn(*remaining) != 0:
+            triangles.append(tuple(remaining))
+        return triangles
+
+    def intersection(self, line: "Line") -> Optional[Point]:
+        """
+        Returns the point where the line crosses the planar polygon, None when it misses the polygon or runs
+        parallel to its plane. See geometry.utilities.cast_rays for casting many rays at once.
+        """
+        triangles = self.triangulate()
+        if not triangles:
+            return None
+        values = [v.values for v in self.vertices]
+        corners = np.array([[values[k] for k in triangle] for triangle in triangles], dtype=np.float64)
+        t, _, _ = _ray_triangles(np.asarray(line.point.values, dtype=np.float64),
+                                 np.asarray(line.direction_vector.values, dtype=np.float64),
+                                 corners[:, 0], corners[:, 1], corners[:, 2], lines=True)
+        t = t[np.argmin(np.abs(t))]
+        if np.isinf(t):
+            return None
+        return Point._unchecked([p + t * d for p, d in zip(line.point.values, line.direction_vector.values)])
 
-    def translate(self, dx: Real, dy: Real, dz: Real) -> None:
-        for vertex in self.vertices:
-            vertex.translate(dx, dy, dz)
+    def copy(self) -> "Polygon":
+        polygon = object.__new__(self.__class__)
+        polygon._vertices = [v.copy() for v in self._vertices]
+        polygon._transform = self._transform
+        return polygon
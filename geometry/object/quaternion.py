@@ -1,53 +1,149 @@
 # -*- coding : utf-8 -*-
+from array import array
 from math import sqrt, isclose, acos, cos, sin
-from typing import Generator, Tuple
+from numbers import Real as _Number
+from typing import Generator, Iterable, List, Optional, Tuple
+
+import numpy as np
 
 from geometry.types import Real
 from geometry import Vector
+from geometry.error import InvalidSizeError
+from geometry.utilities.arrays import as_float64_view
 from geometry.utilities.copyable import CopyableMixin
 
 
+# Above this cosine of the half angle between two rotations slerp falls back to nlerp
+SLERP_LINEAR_THRESHOLD = 0.9995
+
+
+class _VectorParts:
+    # Sequence over the x, y and z components of a Quaternion, used as the storage of its vector view
+
+    __slots__ = ("_owner",)
+
+    def __init__(self, owner: "Quaternion") -> None:
+        self._owner = owner
+
+    def __len__(self) -> int:
+        return 3
+
+    def __iter__(self) -> Generator[Real, None, None]:
+        q = self._owner
+        yield q.x
+        yield q.y
+        yield q.z
+
+    def __getitem__(self, idx):
+        q = self._owner
+        return (q.x, q.y, q.z)[idx]
+
+    def __setitem__(self, idx: int, value: Real) -> None:
+        setattr(self._owner, _COMPONENTS[1:][idx], value)
+
+    def __repr__(self) -> str:
+        return repr(list(self))
+
+
+class _QuaternionVector(Vector):
+    """
+    Vector part of a Quaternion, reads and writes go through to the quaternion it was taken from.
+    Arithmetic on the view returns plain Vectors.
+    """
+
+    __slots__ = ()
+
+    @classmethod
+    def _view(cls, owner: "Quaternion") -> "_QuaternionVector":
+        obj = object.__new__(cls)
+        obj.values = _VectorParts(owner)
+        obj._cache = None
+        return obj
+
+    @classmethod
+    def _unchecked(cls, values: List[Real]) -> Vector:
+        return Vector._unchecked(values)
+
+    def copy(self) -> Vector:
+        return Vector._unchecked(list(self.values))
+
+    def __str__(self) -> str:
+        # Prints like the plain Vector it stands for
+        return "Vector(" + ", ".join([f"{i:.4f}" for i in self.values]) + ")"
+
+    def enable_caching(self) -> "_QuaternionVector":
+        # The quaternion can change without going through the view, so nothing is memoized
+        return self
+
+    def append(self, value: Real) -> None:
+        raise TypeError("Cannot resize the vector part of a Quaternion")
+
+    def extend(self, values: Iterable[Real]) -> None:
+        raise TypeError("Cannot resize the vector part of a Quaternion")
+
+
+_COMPONENTS = ("w", "x", "y", "z")
+
+# Accepted scalar types, int and float come first as the common case and numbers.Real admits numpy scalars
+_SCALARS = (int, float, _Number)
+
+
 class Quaternion(CopyableMixin):
+    """
+    Quaternion w + xi + yj + zk stored as four flat floats.
 
-    def __init__(self, w: Real = 1, x: Real = 0, y: Real = 0, z: Real = 0):
-        self.scalar = w
-        self.vector = Vector([x, y, z])
+    scalar is an alias of w and vector a view of (x, y, z) that writes through to the quaternion,
+    the arithmetic itself works on the four components directly.
+    """
 
-    @property
-    def w(self) -> Real:
-        return self.scalar
+    __slots__ = _COMPONENTS
 
-    @w.setter
-    def w(self, value: Real) -> None:
-        self.scalar = value
+    # Keeps numpy from treating a Quaternion as an array operand, products with numpy scalars stay Quaternions
+    __array_ufunc__ = None
 
-    @property
-    def x(self) -> Real:
-        return self.vector[0]
+    def __init__(self, w: Real = 1, x: Real = 0, y: Real = 0, z: Real = 0):
+        if not (isinstance(w, _SCALARS) and isinstance(x, _SCALARS) and isinstance(y, _SCALARS) and
+                isinstance(z, _SCALARS)):
+            raise ValueError("values must be of type Real")
+        self.w = w
+        self.x = x
+        self.y = y
+        self.z = z
 
-    @x.setter
-    def x(self, value: Real) -> None:
-        self.vector[0] = value
+    @classmethod
+    def _unchecked(cls, w: Real, x: Real, y: Real, z: Real) -> "Quaternion":
+        # Internal constructor for trusted components, skips validation
+        q = object.__new__(cls)
+        q.w = w
+        q.x = x
+        q.y = y
+        q.z = z
+        return q
 
     @property
-    def y(self) -> Real:
-        return self.vector[1]
+    def scalar(self) -> Real:
+        return self.w
 
-    @y.setter
-    def y(self, value: Real) -> None:
-        self.vector[1] = value
+    @scalar.setter
+    def scalar(self, value: Real) -> None:
+        self.w = value
 
     @property
-    def z(self) -> Real:
-        return self.vector[2]
+    def vector(self) -> Vector:
+        return _QuaternionVector._view(self)
 
-    @z.setter
-    def z(self, value: Real) -> None:
-        self.vector[2] = value
+    @vector.setter
+    def vector(self, value: Iterable[Real]) -> None:
+        values = tuple(value)
+        if len(values) != 3:
+            raise InvalidSizeError(f"Cannot assign a vector of size {len(values)} to the vector part of a Quaternion")
+        self.x, self.y, self.z = values
 
     def __iter__(self) -> Generator[Real, None, None]:
-        yield self.scalar
-        yield from self.vector
+        yield self.w
+        yield self.x
+        yield self.y
+        yield self.z
 
     def __str__(self) -> str:
         return f"{self.__class__.__name__}(w={self.w:.4f}, x={self.x:.4f}, y={self.y:.4f}, z={self.z:.4f})"
@@ -56,17 +152,35 @@ class Quaternion(CopyableMixin):
         return self.__str__()
 
     def __neg__(self) -> "Quaternion":
-        return Quaternion(*(-i for i in self))
+        return Quaternion._unchecked(-self.w, -self.x, -self.y, -self.z)
 
     def __add__(self, other: "Quaternion") -> "Quaternion":
         if not isinstance(other, Quaternion):
             raise TypeError(f"Cannot add instances of type {type(other)} and {type(self)}")
-        return Quaternion(self.scalar + other.scalar, *(self.vector + other.vector))
+        return Quaternion._unchecked(self.w + other.w, self.x + other.x, self.y + other.y, self.z + other.z)
 
     def __sub__(self, other: "Quaternion") -> "Quaternion":
         if not isinstance(other, Quaternion):
             raise TypeError(f"Cannot subtract instances of type {type(other)} and {type(self)}")
-        return Quaternion(self.scalar - other.scalar, *(self.vector - other.vector))
+        return Quaternion._unchecked(self.w - other.w, self.x - other.x, self.y - other.y, self.z - other.z)
+
+    def __iadd__(self, other: "Quaternion") -> "Quaternion":
+        if not isinstance(other, Quaternion):
+            raise TypeError(f"Cannot add instances of type {type(other)} and {type(self)}")
+        self.w += other.w
+        self.x += other.x
+        self.y += other.y
+        self.z += other.z
+        return self
+
+    def __isub__(self, other: "Quaternion") -> "Quaternion":
+        if not isinstance(other, Quaternion):
+            raise TypeError(f"Cannot subtract instances of type {type(other)} and {type(self)}")
+        self.w -= other.w
+        self.x -= other.x
+        self.y -= other.y
+        self.z -= other.z
+        return self
 
     def __div__(self, other: "Quaternion") -> "Quaternion":
         if not isinstance(other, Quaternion):
@@ -76,7 +190,11 @@ class Quaternion(CopyableMixin):
         return self * other.inverse()
 
     def __idiv__(self, other: "Quaternion") -> "Quaternion":
-        return self.__div__(other)
+        if not isinstance(other, Quaternion):
+            other = Quaternion.from_scalar(other)
+        if other.is_zero_quaternion():
+            raise ZeroDivisionError("other is a zero quaternion!")
+        return self.multiply(other.inverse(), out=self)
 
     def __rdiv__(self, other: "Quaternion") -> "Quaternion":
         if not isinstance(other, Quaternion):
@@ -93,32 +211,53 @@ class Quaternion(CopyableMixin):
         return self.__rdiv__(other)
 
     def __mul__(self, other: "Quaternion") -> "Quaternion":
-        if not isinstance(other, Quaternion):
-            other = Quaternion.from_scalar(other)
-
-        _scalar = self.scalar * other.scalar - self.vector.dot(other.vector)
-        _vector = other.vector.scale(self.scalar) + self.vector.scale(other.scalar) + self.vector.cross(other.vector)
-        return Quaternion(_scalar, *_vector)
+        if isinstance(other, Quaternion):
+            w1, x1, y1, z1 = self.w, self.x, self.y, self.z
+            w2, x2, y2, z2 = other.w, other.x, other.y, other.z
+            return Quaternion._unchecked(w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2,
+                                         w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2,
+                                         w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2,
+                                         w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2)
+        if isinstance(other, _SCALARS):
+            return Quaternion._unchecked(self.w * other, self.x * other, self.y * other, self.z * other)
+        # Lets containers such as QuaternionArray handle the product
+        return NotImplemented
 
     def __imul__(self, other: "Quaternion") -> "Quaternion":
-        return self * other
-
-    def __rmul__(self, other: "Quaternion") -> "Quaternion":
         if not isinstance(other, Quaternion):
             other = Quaternion.from_scalar(other)
-        return other * self
+        return self.multiply(other, out=self)
+
+    def multiply(self, other: "Quaternion", out: Optional["Quaternion"] = None) -> "Quaternion":
+        """
+        Hamilton product self * other, written into out when given. out may be one of the operands.
+        """
+        if out is None:
+            return self * other
+        w1, x1, y1, z1 = self.w, self.x, self.y, self.z
+        w2, x2, y2, z2 = other.w, other.x, other.y, other.z
+        out.w = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2
+        out.x = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2
+        out.y = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2
+        out.z = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+        return out
+
+    def __rmul__(self, other: "Quaternion") -> "Quaternion":
+        if isinstance(other, _SCALARS):
+            return Quaternion._unchecked(other * self.w, other * self.x, other * self.y, other * self.z)
+        return NotImplemented
 
     def __pow__(self, exponent: Real) -> "Quaternion":
         norm = self.norm()
         if norm > 0:
-            vector_mag = self.vector.magnitude()
+            x, y, z = self.x, self.y, self.z
+            vector_mag = sqrt(x * x + y * y + z * z)
             if vector_mag <= 0:
-                return Quaternion.from_scalar(self.scalar ** exponent)
-            unit_vector = self.vector.scale(1 / vector_mag)
-            phi = acos(self.scalar / norm)
-            _scalar = cos(exponent * phi)
-            _vector = unit_vector.scale(sin(exponent * phi))
-            return (norm ** exponent) * Quaternion(_scalar, *_vector)
+                return Quaternion.from_scalar(self.w ** exponent)
+            phi = acos(self.w / norm)
+            scale = norm ** exponent
+            s = scale * sin(exponent * phi) / vector_mag
+            return Quaternion._unchecked(scale * cos(exponent * phi), x * s, y * s, z * s)
         return self.copy()
 
     def __eq__(self, other: "Quaternion") -> "Quaternion":
@@ -128,7 +267,7 @@ class Quaternion(CopyableMixin):
         return hash(self.as_tuple())
 
     def is_zero_quaternion(self) -> bool:
-        return self == Quaternion(0, 0, 0, 0)
+        return abs(self.w) <= 1e-09 and abs(self.x) <= 1e-09 and abs(self.y) <= 1e-09 and abs(self.z) <= 1e-09
 
     def is_unit_quaternion(self) -> bool:
         return isclose(self._squared_sum(), 1.0, rel_tol=1e-09)
@@ -137,7 +276,8 @@ class Quaternion(CopyableMixin):
         return self.norm()
 
     def _squared_sum(self) -> Real:
-        return self.scalar ** 2 + self.vector.dot(self.vector)
+        w, x, y, z = self.w, self.x, self.y, self.z
+        return w * w + x * x + y * y + z * z
 
     def norm(self) -> Real:
         return sqrt(self._squared_sum())
@@ -148,39 +288,132 @@ class Quaternion(CopyableMixin):
     def __getitem__(self, idx: int) -> Real:
         if idx > 3:
             raise IndexError(f"Index {idx} is out of range for a Quaternion of size 4")
-        return self.scalar if idx == 0 else self.vector[idx - 1]
+        return (self.w, self.x, self.y, self.z)[idx]
 
     def __setitem__(self, idx: int, value: Real) -> None:
         if idx > 3:
             raise IndexError(f"Index {idx} is out of range for a Quaternion of size 4")
-        if idx == 0:
-            self.scalar = value
-        else:
-            self.vector[idx - 1] = value
+        setattr(self, _COMPONENTS[idx], value)
 
-    def normalize(self) -> "Quaternion":
+    def normalize(self, out: Optional["Quaternion"] = None) -> "Quaternion":
         if self.is_zero_quaternion():
             raise ValueError("Cannot normalize a zero quaternion!")
         n = self.norm()
-        return Quaternion(*(i / n for i in self))
+        if out is None:
+            return Quaternion._unchecked(self.w / n, self.x / n, self.y / n, self.z / n)
+        out.w, out.x, out.y, out.z = self.w / n, self.x / n, self.y / n, self.z / n
+        return out
 
     def inverse(self) -> "Quaternion":
         if self.is_zero_quaternion():
             raise ValueError("Cannot invert a zero quaternion!")
         square_sum = self._squared_sum()
-        return Quaternion(self.scalar / square_sum, *-self.vector.scale(1 / square_sum))
+        return Quaternion._unchecked(self.w / square_sum, -self.x / square_sum, -self.y / square_sum,
+                                     -self.z / square_sum)
 
     def conjugate(self) -> "Quaternion":
-        return Quaternion(self.scalar, -self.vector)
+        return Quaternion._unchecked(self.w, -self.x, -self.y, -self.z)
+
+    def dot(self, other: "Quaternion") -> Real:
+        return self.w * other.w + self.x * other.x + self.y * other.y + self.z * other.z
+
+    def nlerp(self, other: "Quaternion", t: Real) -> "Quaternion":
+        """
+        Normalized linear interpolation between the unit quaternions self and other along the shorter arc.
+        Cheaper than slerp, but the angular speed is not constant.
+        """
+        w1, x1, y1, z1 = self.w, self.x, self.y, self.z
+        w2, x2, y2, z2 = other.w, other.x, other.y, other.z
+        s = 1.0 - t
+        if w1 * w2 + x1 * x2 + y1 * y2 + z1 * z2 < 0:
+            t = -t
+        w, x, y, z = s * w1 + t * w2, s * x1 + t * x2, s * y1 + t * y2, s * z1 + t * z2
+        n = sqrt(w * w + x * x + y * y + z * z)
+        return Quaternion._unchecked(w / n, x / n, y / n, z / n)
+
+    def slerp(self, other: "Quaternion", t: Real) -> "Quaternion":
+        """
+        Spherical linear interpolation between the unit quaternions self and other along the shorter arc,
+        t = 0 gives self and t = 1 gives other at constant angular speed
+        """
+        w1, x1, y1, z1 = self.w, self.x, self.y, self.z
+        w2, x2, y2, z2 = other.w, other.x, other.y, other.z
+        d = w1 * w2 + x1 * x2 + y1 * y2 + z1 * z2
+        sign = 1.0
+        if d < 0:
+            d, sign = -d, -1.0
+        if d > SLERP_LINEAR_THRESHOLD:
+            # sin(theta) vanishes for nearly equal rotations, where nlerp is accurate
+            return self.nlerp(other, t)
+        theta = acos(d)
+        sin_theta = sin(theta)
+        a = sin((1.0 - t) * theta) / sin_theta
+        b = sign * sin(t * theta) / sin_theta
+        return Quaternion._unchecked(a * w1 + b * w2, a * x1 + b * x2, a * y1 + b * y2, a * z1 + b * z2)
+
+    def _rotation_rows(self) -> Tuple[Real, ...]:
+        # Row-major entries of the rotation matrix, scaled by 2 / norm^2 so that non unit quaternions
+        # describe the same rotation as their normalized counterpart
+        w, x, y, z = self.w, self.x, self.y, self.z
+        square_sum = w * w + x * x + y * y + z * z
+        if square_sum == 0:
+            raise ValueError("A zero quaternion does not describe a rotation!")
+        s = 2.0 / square_sum
+        xs, ys, zs = x * s, y * s, z * s
+        wx, wy, wz = w * xs, w * ys, w * zs
+        xx, xy, xz = x * xs, x * ys, x * zs
+        yy, yz, zz = y * ys, y * zs, z * zs
+        return (1.0 - (yy + zz), xy - wz, xz + wy,
+                xy + wz, 1.0 - (xx + zz), yz - wx,
+                xz - wy, yz + wx, 1.0 - (xx + yy))
+
+    def to_rotation_matrix(self) -> np.ndarray:
+        """
+        Returns the 3x3 matrix R of the rotation described by this quaternion, R @ v rotates v
+        """
+        return np.array(self._rotation_rows(), dtype=np.float64).reshape(3, 3)
+
+    def rotate(self, vector: Vector) -> Vector:
+        """
+        Returns a rotated copy of vector, of the same type, e.g. a Point stays a Point. Use
+        VectorArray.rotate or PointCloud.rotate to rotate many vectors at once.
+        """
+        if len(vector) != 3:
+            raise InvalidSizeError(f"Cannot rotate a vector of size {len(vector)}")
+        r = self._rotation_rows()
+        x, y, z = vector.values
+        return vector._unchecked([r[0] * x + r[1] * y + r[2] * z,
+                                  r[3] * x + r[4] * y + r[5] * z,
+                                  r[6] * x + r[7] * y + r[8] * z])
+
+    def copy(self) -> "Quaternion":
+        return self._unchecked(self.w, self.x, self.y, self.z)
 
     def as_tuple(self) -> Tuple[Real]:
-        return tuple(i for i in self)
+        return self.w, self.x, self.y, self.z
 
     @classmethod
     def from_tuple(cls, tup: Tuple[Real]) -> "Quaternion":
         assert len(tup) == 4
         return cls(*tup)
 
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        if copy is False:
+            raise ValueError("A Quaternion cannot be converted without a copy")
+        return np.array(self.as_tuple(), dtype=np.float64 if dtype is None else dtype)
+
+    def to_bytes(self) -> bytes:
+        return array("d", self).tobytes()
+
+    @classmethod
+    def from_buffer(cls, buffer) -> "Quaternion":
+        # A single quaternion is small enough that reading its four values out of the buffer is cheaper
+        # than keeping a view, batches should use an array backed container instead
+        values = as_float64_view(buffer)
+        if len(values) != 4:
+            raise InvalidSizeError("buffer must hold exactly 4 float64 values")
+        return cls(*values)
+
     @classmethod
     def identity(cls) -> "Quaternion":
         return cls(1, 0, 0, 0)
@@ -188,3 +421,40 @@ class Quaternion(CopyableMixin):
     @classmethod
     def from_scalar(cls, scalar: Real) -> "Quaternion":
         return cls(scalar, 0, 0, 0)
+
+    @classmethod
+    def from_axis_angle(cls, axis: Iterable[Real], angle: Real) -> "Quaternion":
+        """
+        Returns the unit quaternion rotating by angle, in radians, counter-clockwise around axis
+        """
+        x, y, z = getattr(axis, "values", axis)
+        mag = sqrt(x * x + y * y + z * z)
+        if mag == 0:
+            raise ValueError("Cannot rotate around a zero vector!")
+        s = sin(angle / 2) / mag
+        return cls(cos(angle / 2), x * s, y * s, z * s)
+
+    @classmethod
+    def from_rotation_matrix(cls, matrix) -> "Quaternion":
+        """
+        Returns the unit quaternion with non-negative scalar part describing the 3x3 rotation matrix
+        """
+        m = np.asarray(matrix, dtype=np.float64)
+        if m.shape != (3, 3):
+            raise InvalidSizeError(f"rotation matrix must have shape (3, 3), got {m.shape}")
+        (m00, m01, m02), (m10, m11, m12), (m20, m21, m22) = m.tolist()
+        # Shepperd's method, dividing by the largest of the four candidates keeps the result accurate
+        trace = m00 + m11 + m22
+        if trace >= max(m00, m11, m22):
+            s = 2.0 * sqrt(1.0 + trace)
+            q = cls(s / 4, (m21 - m12) / s, (m02 - m20) / s, (m10 - m01) / s)
+        elif m00 >= m11 and m00 >= m22:
+            s = 2.0 * sqrt(1.0 + m00 - m11 - m22)
+            q = cls((m21 - m12) / s, s / 4, (m01 + m10) / s, (m02 + m20) / s)
+        elif m11 >= m22:
+            s = 2.0 * sqrt(1.0 + m11 - m00 - m22)
+            q = cls((m02 - m20) / s, (m01 + m10) / s, s / 4, (m12 + m21) / s)
+        else:
+            s = 2.0 * sqrt(1.0 + m22 - m00 - m11)
+            q = cls((m10 - m01) / s, (m02 + m20) / s, (m12 + m21) / s, s / 4)
+        return -q if q.w < 0 else q
@@ -0,0 +1,487 @@
+# -*- coding : utf-8 -*-
+
+import os
+from concurrent.futures import Executor
+from itertools import repeat
+from math import isqrt
+from typing import Generator, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+from geometry import Quaternion
+from geometry.object.quaternion import SLERP_LINEAR_THRESHOLD
+from geometry.error import InvalidSizeError
+from geometry.types import Real
+from geometry.utilities.arrays import as_float64_view
+from geometry.utilities.copyable import CopyableMixin
+
+
+def _hamilton(p: np.ndarray, q: np.ndarray, out: np.ndarray) -> np.ndarray:
+    # Row-wise Hamilton product p * q of (N, 4) or broadcastable (1, 4) arrays, out may alias p or q
+    w1, x1, y1, z1 = p[:, 0], p[:, 1], p[:, 2], p[:, 3]
+    w2, x2, y2, z2 = q[:, 0], q[:, 1], q[:, 2], q[:, 3]
+    w = w1 * w2 - x1 * x2 - y1 * y2 - z1 * z2
+    x = w1 * x2 + x1 * w2 + y1 * z2 - z1 * y2
+    y = w1 * y2 - x1 * z2 + y1 * w2 + z1 * x2
+    z = w1 * z2 + x1 * y2 - y1 * x2 + z1 * w2
+    out[:, 0], out[:, 1], out[:, 2], out[:, 3] = w, x, y, z
+    return out
+
+
+def _arc(p: np.ndarray, q: np.ndarray) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    # Rows of q flipped onto the hemisphere of p, and the angle theta between them with its sine. Rows
+    # marked linear are too close for the spherical weights and use normalized linear weights instead.
+    d = np.einsum("ij,ij->i", *np.broadcast_arrays(p, q))
+    flip = d < 0
+    if flip.any():
+        q = np.where(flip[:, None], -q, q)
+        d = np.abs(d)
+    linear = d > SLERP_LINEAR_THRESHOLD
+    theta = np.arccos(np.minimum(d, 1.0))
+    sin_theta = np.where(linear, 1.0, np.sin(theta))
+    return q, theta, sin_theta, linear
+
+
+def _interpolate(p: np.ndarray, q: np.ndarray, theta: np.ndarray, sin_theta: np.ndarray, linear: np.ndarray,
+                 t: np.ndarray) -> np.ndarray:
+    # Weighted rows a * p + b * q for the interpolation parameters t, renormalizing the linear rows
+    s = 1.0 - t
+    a = np.where(linear, s, np.sin(s * theta) / sin_theta)
+    b = np.where(linear, t, np.sin(t * theta) / sin_theta)
+    result = a[:, None] * p
+    result += b[:, None] * q
+    if linear.any():
+        rows = np.nonzero(linear)[0]
+        result[rows] /= np.sqrt(np.einsum("ij,ij->i", result[rows], result[rows]))[:, None]
+    return result
+
+
+# Number of sequential products after which running products are renormalized
+RENORMALIZE_EVERY = 64
+
+# Number of tasks a scan is split into when it runs on an executor, a few per core for load balancing
+_TASKS = 4 * (os.cpu_count() or 1)
+
+
+def _normalize_rows(values: np.ndarray) -> np.ndarray:
+    values /= np.sqrt(np.einsum("ij,ij->i", values, values))[:, None]
+    return values
+
+
+def _reduce(values: np.ndarray, renormalize: bool = True) -> np.ndarray:
+    # Ordered product of the rows by pairwise tree reduction, one vectorized Hamilton product per level
+    if not len(values):
+        return np.array([1.0, 0.0, 0.0, 0.0])
+    while len(values) > 1:
+        half = len(values) // 2
+        paired = _hamilton(values[0:2 * half:2], values[1:2 * half:2], np.empty((half, 4)))
+        if len(values) % 2:
+            paired = np.concatenate((paired, values[-1:]))
+        values = _normalize_rows(paired) if renormalize else paired
+    return values[0]
+
+
+def _scan_blocks(blocks: np.ndarray, renormalize: bool = True) -> np.ndarray:
+    # Running products along the second axis of (G, B, 4) blocks, one vectorized step for all G blocks.
+    # Steps run on a (B, G, 4) copy so that every step reads and writes contiguous rows.
+    out = np.ascontiguousarray(blocks.transpose(1, 0, 2))
+    for j in range(1, len(out)):
+        _hamilton(out[j - 1], out[j], out[j])
+        if renormalize and j % RENORMALIZE_EVERY == 0:
+            _normalize_rows(out[j])
+    return out.transpose(1, 0, 2)
+
+
+def _shift_blocks(offsets: np.ndarray, blocks: np.ndarray) -> np.ndarray:
+    # Left multiplies every row of block i of (G, B, 4) blocks by offsets[i]
+    g, b, _ = blocks.shape
+    rows = blocks.reshape(-1, 4)
+    return _hamilton(np.repeat(offsets, b, axis=0), rows, rows).reshape(g, b, 4)
+
+
+def _quaternion_values(quaternions: Union["QuaternionArray", Iterable[Quaternion]]) -> np.ndarray:
+    if isinstance(quaternions, QuaternionArray):
+        return quaternions.values
+    return QuaternionArray.from_quaternions(quaternions).values
+
+
+def compose(quaternions: Union["QuaternionArray", Iterable[Quaternion]], executor: Optional[Executor] = None,
+            block_size: int = 1 << 16, renormalize: bool = True) -> Quaternion:
+    """
+    Returns the ordered product q0 * q1 * ... * qn-1 of a chain of quaternions, the identity for an empty
+    chain. Associativity allows a pairwise tree reduction in log2(n) vectorized levels. With an executor,
+    e.g. a ThreadPoolExecutor or ProcessPoolExecutor, chains longer than block_size are split into blocks
+    which are reduced concurrently. With renormalize every level is normalized to stop the drift of long
+    chains of rotations, disable it to compose quaternions which are not unit quaternions.
+    """
+    values = _quaternion_values(quaternions)
+    if len(values) <= block_size:
+        result = _reduce(values, renormalize)
+    else:
+        # Blocks are reduced separately even without an executor, which keeps every level in cache
+        blocks = [values[i:i + block_size] for i in range(0, len(values), block_size)]
+        mapper = map if executor is None else executor.map
+        result = _reduce(np.array(list(mapper(_reduce, blocks, repeat(renormalize)))), renormalize)
+    return Quaternion(*result.tolist())
+
+
+def compose_cumulative(quaternions: Union["QuaternionArray", Iterable[Quaternion]],
+                       executor: Optional[Executor] = None, block_size: Optional[int] = None,
+                       renormalize: bool = True) -> "QuaternionArray":
+    """
+    Returns all prefix products q0, q0 * q1, ..., q0 * ... * qn-1, e.g. the absolute orientations of a
+    chain of relative rotations. The chain is scanned in blocks of block_size, sqrt(n) by default, which
+    are processed in lockstep or spread over the executor, and the prefix of the block totals is then
+    multiplied into every block. See compose for renormalize.
+    """
+    values = _quaternion_values(quaternions)
+    n = len(values)
+    if n == 0:
+        return QuaternionArray()
+    size = block_size or max(1, isqrt(n))
+    count = -(-n // size)
+    blocks = np.zeros((count * size, 4))
+    blocks[:, 0] = 1.0
+    blocks[:n] = values
+    blocks = blocks.reshape(count, size, 4)
+
+    if executor is None:
+        blocks = np.ascontiguousarray(_scan_blocks(blocks, renormalize))
+    else:
+        groups = np.array_split(np.arange(count), min(count, _TASKS))
+        scanned = executor.map(_scan_blocks, (blocks[g] for g in groups), repeat(renormalize))
+        blocks = np.ascontiguousarray(np.concatenate(list(scanned)))
+
+    if count > 1:
+        offsets = compose_cumulative(QuaternionArray._wrap(blocks[:-1, -1]), renormalize=renormalize).values
+        if executor is None:
+            _shift_blocks(offsets, blocks[1:])
+        else:
+            groups = np.array_split(np.arange(1, count), min(count - 1, _TASKS))
+            shifted = executor.map(_shift_blocks, (offsets[g - 1] for g in groups), (blocks[g] for g in groups))
+            blocks[1:] = np.concatenate(list(shifted))
+
+    result = blocks.reshape(-1, 4)[:n]
+    return QuaternionArray._wrap(_normalize_rows(result) if renormalize else result)
+
+
+class QuaternionArray(CopyableMixin):
+    """
+    Container of N quaternions stored in one contiguous (N, 4) float64 buffer with rows (w, x, y, z).
+
+    Operations mirror the ones on Quaternion but act on all rows in one vectorized call. Products are
+    taken row by row, a single Quaternion or scalar operand is broadcast across every row.
+    """
+
+    # Makes numpy scalars and arrays defer to the reflected operators of this class
+    __array_ufunc__ = None
+
+    def __init__(self, values: Iterable[Iterable[Real]] = ()) -> None:
+        values = np.array(values, dtype=np.float64)
+        if values.size == 0:
+            values = values.reshape(0, 4)
+        if values.ndim != 2 or values.shape[1] != 4:
+            raise InvalidSizeError(f"values must have shape (N, 4), got {values.shape}")
+        self.values = values
+
+    @classmethod
+    def _wrap(cls, values: np.ndarray) -> "QuaternionArray":
+        # Trusted constructor for internal use, takes ownership of a (N, 4) float64 array without copying
+        obj = cls.__new__(cls)
+        obj.values = values
+        return obj
+
+    @classmethod
+    def identity(cls, n: int) -> "QuaternionArray":
+        values = np.zeros((n, 4))
+        values[:, 0] = 1.0
+        return cls._wrap(values)
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    @property
+    def w(self) -> np.ndarray:
+        return self.values[:, 0]
+
+    @property
+    def vector(self) -> np.ndarray:
+        return self.values[:, 1:]
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __iter__(self) -> Generator[Quaternion, None, None]:
+        for row in self.values.tolist():
+            yield Quaternion(*row)
+
+    def __getitem__(self, idx: Union[int, slice, np.ndarray]) -> Union[Quaternion, "QuaternionArray"]:
+        if isinstance(idx, (slice, list, np.ndarray)):
+            return self._wrap(self.values[idx])
+        return Quaternion(*self.values[idx].tolist())
+
+    def __setitem__(self, idx: int, value: Quaternion) -> None:
+        if not isinstance(value, Quaternion):
+            raise TypeError(f"Cannot assign an instance of type {type(value)} to a QuaternionArray")
+        self.values[idx] = value.as_tuple()
+
+    def copy(self) -> "QuaternionArray":
+        return self._wrap(self.values.copy())
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(size={len(self)})"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def _operand(self, other: Union["QuaternionArray", Quaternion], operation: str) -> np.ndarray:
+        if isinstance(other, QuaternionArray):
+            if len(other) != len(self):
+                raise InvalidSizeError(f"Cannot {operation} QuaternionArrays of size {len(self)} and {len(other)}")
+            return other.values
+        if isinstance(other, Quaternion):
+            return np.array([other.as_tuple()], dtype=np.float64)
+        if isinstance(other, (int, float)):
+            return np.array([[other, 0.0, 0.0, 0.0]])
+        raise TypeError(f"Cannot {operation} instances of type {type(other)} and {type(self)}")
+
+    def __neg__(self) -> "QuaternionArray":
+        return self._wrap(-self.values)
+
+    def __add__(self, other: Union["QuaternionArray", Quaternion]) -> "QuaternionArray":
+        return self._wrap(self.values + self._operand(other, "add"))
+
+    def __sub__(self, other: Union["QuaternionArray", Quaternion]) -> "QuaternionArray":
+        return self._wrap(self.values - self._operand(other, "subtract"))
+
+    def __iadd__(self, other: Union["QuaternionArray", Quaternion]) -> "QuaternionArray":
+        self.values += self._operand(other, "add")
+        return self
+
+    def __isub__(self, other: Union["QuaternionArray", Quaternion]) -> "QuaternionArray":
+        self.values -= self._operand(other, "subtract")
+        return self
+
+    def multiply(self, other: Union["QuaternionArray", Quaternion, Real],
+                 out: Optional["QuaternionArray"] = None) -> "QuaternionArray":
+        """
+        Row-wise Hamilton product self * other, written into out when given. out may be one of the operands.
+        """
+        if out is not None and out.shape != self.shape:
+            raise InvalidSizeError(f"Cannot write a result of shape {self.shape} into a QuaternionArray of shape "
+                                   f"{out.shape}")
+        if isinstance(other, (int, float)):
+            if out is None:
+                return self._wrap(self.values * other)
+            np.multiply(self.values, other, out=out.values)
+            return out
+        other = self._operand(other, "multiply")
+        if out is None:
+            return self._wrap(_hamilton(self.values, other, np.empty_like(self.values)))
+        _hamilton(self.values, other, out.values)
+        return out
+
+    def __mul__(self, other: Union["QuaternionArray", Quaternion, Real]) -> "QuaternionArray":
+        return self.multiply(other)
+
+    def __rmul__(self, other: Union[Quaternion, Real]) -> "QuaternionArray":
+        if isinstance(other, (int, float)):
+            return self.multiply(other)
+        return self._wrap(_hamilton(self._operand(other, "multiply"), self.values, np.empty_like(self.values)))
+
+    def __imul__(self, other: Union["QuaternionArray", Quaternion, Real]) -> "QuaternionArray":
+        return self.multiply(other, out=self)
+
+    def __truediv__(self, other: Union["QuaternionArray", Quaternion, Real]) -> "QuaternionArray":
+        if isinstance(other, (int, float)):
+            if other == 0:
+                raise ZeroDivisionError("other is a zero quaternion!")
+            return self._wrap(self.values / other)
+        if isinstance(other, Quaternion):
+            return self.multiply(other.inverse())
+        if isinstance(other, QuaternionArray):
+            return self.multiply(other.inverse())
+        raise TypeError(f"Cannot divide instances of type {type(other)} and {type(self)}")
+
+    def __itruediv__(self, other: Union["QuaternionArray", Quaternion, Real]) -> "QuaternionArray":
+        if isinstance(other, (int, float)):
+            if other == 0:
+                raise ZeroDivisionError("other is a zero quaternion!")
+            self.values /= other
+            return self
+        if isinstance(other, (Quaternion, QuaternionArray)):
+            return self.multiply(other.inverse(), out=self)
+        raise TypeError(f"Cannot divide instances of type {type(other)} and {type(self)}")
+
+    def __pow__(self, exponent: Union[Real, Iterable[Real]]) -> "QuaternionArray":
+        exponent = np.asarray(exponent, dtype=np.float64)
+        if exponent.ndim == 1 and exponent.shape[0] != len(self):
+            raise InvalidSizeError(f"Cannot raise a QuaternionArray of size {len(self)} to {exponent.shape[0]} "
+                                   "exponents")
+        norm = self.norm()
+        vector_mag = np.sqrt(np.einsum("ij,ij->i", self.vector, self.vector))
+        result = self.values.copy()
+
+        rotating = vector_mag > 0
+        t = exponent[rotating] if exponent.ndim else exponent
+        phi = np.arccos(np.clip(self.values[rotating, 0] / norm[rotating], -1.0, 1.0))
+        scale = norm[rotating] ** t
+        result[rotating, 0] = scale * np.cos(t * phi)
+        result[rotating, 1:] = self.values[rotating, 1:] * (scale * np.sin(t * phi) / vector_mag[rotating])[:, None]
+
+        # Real quaternions are raised like scalars, zero quaternions stay zero
+        real = ~rotating & (norm > 0)
+        t = exponent[real] if exponent.ndim else exponent
+        result[real, 0] = self.values[real, 0] ** t
+        return self._wrap(result)
+
+    def __eq__(self, other: "QuaternionArray") -> bool:
+        if not isinstance(other, QuaternionArray):
+            raise TypeError(f"Cannot compare instances of type {type(other)} and {type(self)}")
+        if other.shape != self.shape:
+            raise InvalidSizeError(f"Cannot compare QuaternionArrays of shape {self.shape} and {other.shape}")
+        return bool(np.allclose(self.values, other.values, rtol=1e-09, atol=1e-09))
+
+    __hash__ = None
+
+    def _squared_sum(self) -> np.ndarray:
+        return np.einsum("ij,ij->i", self.values, self.values)
+
+    def norm(self) -> np.ndarray:
+        return np.sqrt(self._squared_sum())
+
+    def magnitude(self) -> np.ndarray:
+        return self.norm()
+
+    def is_unit_quaternion(self) -> np.ndarray:
+        return np.isclose(self._squared_sum(), 1.0, rtol=1e-09, atol=0.0)
+
+    def normalize(self, out: Optional["QuaternionArray"] = None) -> "QuaternionArray":
+        norm = self.norm()
+        if not norm.all():
+            raise ValueError("Cannot normalize a QuaternionArray containing zero quaternions!")
+        if out is None:
+            return self._wrap(self.values / norm[:, None])
+        np.divide(self.values, norm[:, None], out=out.values)
+        return out
+
+    def conjugate(self) -> "QuaternionArray":
+        values = -self.values
+        values[:, 0] = self.values[:, 0]
+        return self._wrap(values)
+
+    def inverse(self) -> "QuaternionArray":
+        square_sum = self._squared_sum()
+        if not square_sum.all():
+            raise ValueError("Cannot invert a QuaternionArray containing zero quaternions!")
+        values = self.values / -square_sum[:, None]
+        values[:, 0] *= -1
+        return self._wrap(values)
+
+    def dot(self, other: Union["QuaternionArray", Quaternion]) -> np.ndarray:
+        return np.einsum("ij,ij->i", *np.broadcast_arrays(self.values, self._operand(other, "dot")))
+
+    def _parameters(self, t: Union[Real, Iterable[Real]]) -> np.ndarray:
+        t = np.asarray(t, dtype=np.float64)
+        if t.ndim == 1 and t.shape[0] != len(self):
+            raise InvalidSizeError(f"Cannot interpolate a QuaternionArray of size {len(self)} at {t.shape[0]} "
+                                   "parameters")
+        return np.broadcast_to(t, (len(self),))
+
+    def slerp(self, other: Union["QuaternionArray", Quaternion], t: Union[Real, Iterable[Real]]) -> "QuaternionArray":
+        """
+        Row-wise spherical linear interpolation between the unit quaternions of self and other along the
+        shorter arc, see Quaternion.slerp. t is a scalar or one parameter per row.
+        """
+        p = self.values
+        q, theta, sin_theta, linear = _arc(p, self._operand(other, "interpolate"))
+        q = np.broadcast_to(q, p.shape)
+        return self._wrap(_interpolate(p, q, theta, sin_theta, linear, self._parameters(t)))
+
+    def nlerp(self, other: Union["QuaternionArray", Quaternion], t: Union[Real, Iterable[Real]]) -> "QuaternionArray":
+        """
+        Row-wise normalized linear interpolation, see Quaternion.nlerp
+        """
+        p = self.values
+        q, theta, sin_theta, _ = _arc(p, self._operand(other, "interpolate"))
+        q = np.broadcast_to(q, p.shape)
+        linear = np.ones(len(self), dtype=bool)
+        return self._wrap(_interpolate(p, q, theta, sin_theta, linear, self._parameters(t)))
+
+    def compose(self, executor: Optional[Executor] = None, block_size: int = 1 << 16,
+                renormalize: bool = True) -> Quaternion:
+        """
+        Returns the ordered product of all rows, see compose
+        """
+        return compose(self, executor, block_size, renormalize)
+
+    def cumulative(self, executor: Optional[Executor] = None, block_size: Optional[int] = None,
+                   renormalize: bool = True) -> "QuaternionArray":
+        """
+        Returns the prefix products of the rows, see compose_cumulative
+        """
+        return compose_cumulative(self, executor, block_size, renormalize)
+
+    def iter_resample(self, times: Iterable[Real], rate: Real, start: Optional[Real] = None,
+                      end: Optional[Real] = None, chunk_size: int = 4096, method: str = "slerp"
+                      ) -> Generator[Tuple[np.ndarray, "QuaternionArray"], None, None]:
+        """
+        Resamples the orientation trajectory with keyframes self at the increasing times at rate samples per
+        unit of time, from start to end which default to the first and last keyframe. Yields the sample
+        times and orientations in chunks of at most chunk_size samples, so that long trajectories are never
+        materialized at once. method is "slerp" or "nlerp". Samples outside of the keyframes are clamped.
+        """
+        times = np.asarray(times, dtype=np.float64)
+        if times.shape != (len(self),) or len(self) < 2:
+            raise InvalidSizeError(f"Need one time for each of at least two keyframes, got {times.shape[0]} times "
+                                   f"for {len(self)} keyframes")
+        if not np.all(np.diff(times) > 0):
+            raise ValueError("keyframe times must be strictly increasing")
+        if rate <= 0 or chunk_size < 1:
+            raise ValueError("rate and chunk_size must be positive")
+        if method not in ("slerp", "nlerp"):
+            raise ValueError(f"Unknown interpolation method {method}")
+
+        start = times[0] if start is None else float(start)
+        end = times[-1] if end is None else float(end)
+        count = max(0, int(np.floor((end - start) * rate + 1e-09)) + 1)
+
+        # Arc of every keyframe segment, computed once for all samples falling into it
+        p = self.values[:-1]
+        q, theta, sin_theta, linear = _arc(p, self.values[1:])
+        if method == "nlerp":
+            linear = np.ones_like(linear)
+        span = np.diff(times)
+
+        for lo in range(0, count, chunk_size):
+            sample_times = start + np.arange(lo, min(count, lo + chunk_size)) / rate
+            seg = np.clip(np.searchsorted(times, sample_times, side="right") - 1, 0, len(span) - 1)
+            u = np.clip((sample_times - times[seg]) / span[seg], 0.0, 1.0)
+            values = _interpolate(p[seg], q[seg], theta[seg], sin_theta[seg], linear[seg], u)
+            yield sample_times, self._wrap(values)
+
+    @property
+    def __array_interface__(self) -> dict:
+        # Shares the underlying buffer, numpy keeps this container alive as the base of the resulting array
+        return self.values.__array_interface__
+
+    def to_bytes(self) -> bytes:
+        return self.values.tobytes()
+
+    @classmethod
+    def from_buffer(cls, buffer) -> "QuaternionArray":
+        """
+        Wraps a buffer of float64 values or raw bytes as an (N, 4) array without copying
+        """
+        values = np.frombuffer(as_float64_view(buffer), dtype=np.float64)
+        if values.size % 4:
+            raise InvalidSizeError(f"buffer of {values.size} values cannot be split into quaternions")
+        return cls._wrap(values.reshape(-1, 4))
+
+    def to_quaternions(self) -> List[Quaternion]:
+        return [Quaternion(*row) for row in self.values.tolist()]
+
+    @classmethod
+    def from_quaternions(cls, quaternions: Iterable[Quaternion]) -> "QuaternionArray":
+        return cls([q.as_tuple() for q in quaternions])
@@ -1,8 +1,12 @@
 # -*- coding : utf-8 -*-
 
+import math
+
+import numpy as np
 import pytest
 
-from geometry import Line, Point, Vector
+from geometry import Axes, Line, Point, PointCloud, Transform, Vector
+from geometry.object.polygon import Polygon
 
 
 def test_line_generation():
@@ -57,3 +61,50 @@ def test_intersection_1():
     l3 = Line(direction_vector=Vector([-1, 1, 0]), point=Point(3, 0, 0))
     assert l1.intersection(l2) == Point(0, 0, 0)
     assert l3.intersection(l2) == Point(0, 3, 0)
+
+
+def test_line_copy():
+    l1 = Line(direction_vector=Vector([1, 1, 1]), point=Point(2, 2, 2))
+    l2 = l1.copy()
+    assert l2.direction_vector == l1.direction_vector and l2.point == l1.point
+    assert l2.direction_vector is not l1.direction_vector and l2.point is not l1.point
+
+
+def test_line_transform():
+    line = Line(Vector([1, 0, 0]), Point(0, 1, 0))
+    line.rotate_around_axis(Axes.Z, math.pi / 2)
+    assert line.point == Point(-1, 0, 0)
+    assert line.direction_vector == Vector([0, 1, 0])
+
+    line = Line(Vector([0, 1, 0]), Point(-1, 0, 0))
+    line.translate(1, 0, 0)
+    assert line.contains_point(Point(0, 3, 0))
+
+    with pytest.raises(ValueError):
+        line.transform(Transform.scaling(1, 0, 1))
+
+
+def test_intersection_skew_and_parallel():
+    l1 = Line()
+    assert l1.intersection(Line(Vector([0, 1, 0]), Point(0, 0, 1))) is None
+    assert l1.intersection(Line(Vector([-1, 0, 0]), Point(0, 1, 0))) is None
+    assert l1.intersection(Line(Vector([2, 0, 0]), Point(4, 0, 0))) is None
+
+
+def test_line_projection():
+    line = Line(Vector([1, 1, 0]), Point(1, 0, 0))
+    assert line.closest_point(Point(3, 0, 0)) == Point(2, 1, 0)
+    assert math.isclose(line.distance_to(Point(3, 0, 0)), math.sqrt(2))
+    assert math.isclose(line.distance_to(Point(4, 3, 0)), 0, abs_tol=1e-12)
+
+    closest, t, distances = line.project_points(PointCloud([(3, 0, 0), (1, 0, 5)]))
+    assert np.allclose(closest, [(2, 1, 0), (1, 0, 0)])
+    assert np.allclose(t, [1, 0]) and np.allclose(distances, [math.sqrt(2), 5])
+
+
+def test_line_polygon_intersection():
+    square = Polygon([Point(0, 0, 1), Point(2, 0, 1), Point(2, 2, 1), Point(0, 2, 1)])
+    assert Line(Vector([0, 0, 1]), Point(1, 1, -3)).intersection(square) == Point(1, 1, 1)
+    assert square.intersection(Line(Vector([1, 1, 1]), Point(0, 0, 0))) == Point(1, 1, 1)
+    assert square.intersection(Line(Vector([1, 0, 0]), Point(1, 1, 5))) is None
+    assert square.intersection(Line(Vector([0, 0, 1]), Point(3, 1, 5))) is None
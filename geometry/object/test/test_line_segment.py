@@ -2,7 +2,7 @@
 
 import pytest
 
-from geometry import Point, LineSegment
+from geometry import Point, LineSegment, PointCloud, Vector
 
 
 def test_line_segment_generation():
@@ -29,3 +29,52 @@ def test_length():
     ls2 = LineSegment(Point(3, 0, 0), Point(0, 4, 0))
     assert ls1.length() == 1
     assert ls2.length() == 5
+
+
+def test_caching():
+    a, b = Point(0, 0, 0), Point(3, 4, 0)
+    ls1 = LineSegment(a, b).enable_caching()
+    assert ls1.length() == 5
+    assert ls1.direction_vector == ls1.direction_vector and ls1.direction_vector is not ls1.direction_vector
+    assert a._cache is not None and b._cache is not None
+
+    # The returned vector is a copy, mutating it leaves the cached state of the segment intact
+    direction = ls1.direction_vector
+    assert direction.magnitude() == 5
+    direction *= 2
+    direction.normalize(out=direction)
+    assert direction.magnitude() == 1
+    assert ls1.direction_vector == Vector([3, 4, 0]) and ls1.direction_vector.magnitude() == 5
+
+    b.z = 12
+    assert ls1.length() == 13
+    assert ls1.direction_vector == Point(3, 4, 12).to_vector()
+
+    a.translate(3, 4, 12)
+    assert ls1.length() == 0
+
+    ls1.b = Point(1, 0, 0)
+    assert ls1.length() == ls1.a.distance_to(ls1.b)
+
+    copied = ls1.copy()
+    copied.b.x = 10
+    assert copied.length() != ls1.length()
+
+
+def test_contains_points():
+    ls1 = LineSegment(Point(1, 1, 1), Point(2, 2, 2))
+    points = [Point(1.2, 1.2, 1.2), Point(0.5, 0.5, 0.5), Point(1, 1, 1), Point(2, 2, 2), Point(0, 1, 0)]
+
+    assert ls1.contains_points(points).tolist() == [ls1.contains_point(p) for p in points]
+    assert ls1.contains_points(PointCloud.from_points(points)).tolist() == [True, False, True, True, False]
+
+
+def test_line_segment_projection():
+    segment = LineSegment(Point(0, 0, 0), Point(4, 0, 0))
+    assert segment.closest_point(Point(1, 2, 0)) == Point(1, 0, 0)
+    assert segment.closest_point(Point(6, 1, 0)) == Point(4, 0, 0)
+    assert segment.distance_to(Point(-3, 4, 0)) == 5
+
+    closest, t, distances = segment.project_points(PointCloud([(1, 2, 0), (6, 1, 0), (-3, 4, 0)]))
+    assert closest.tolist() == [[1, 0, 0], [4, 0, 0], [0, 0, 0]]
+    assert t.tolist() == [0.25, 1, 0] and distances[2] == 5
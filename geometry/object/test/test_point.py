@@ -1,9 +1,10 @@
 # -*- coding : utf-8 -*-
+import math
 import random
 
 import pytest
 
-from geometry import Point
+from geometry import Axes, Point, Quaternion
 
 
 @pytest.fixture
@@ -111,3 +112,33 @@ def test_point_collinear():
     assert Point.check_collinear(a, a, c, ordered=True)
     assert not Point.check_collinear(a, b, a, ordered=True)
     assert Point.check_collinear(c, b, a, ordered=True)
+
+
+def test_point_slots(rand_point):
+    assert not hasattr(rand_point, "__dict__")
+    with pytest.raises(AttributeError):
+        rand_point.w = 1.0
+
+    assert type(rand_point + rand_point) is Point
+    assert type(rand_point - rand_point) is Point
+    assert type(round(rand_point)) is Point
+
+
+def test_point_scalar_operators():
+    p0 = Point(1, 2, 3)
+    assert type(p0 * 2) is Point and p0 * 2 == Point(2, 4, 6)
+    assert type(2 * p0) is Point and 2 * p0 == Point(2, 4, 6)
+    assert p0 - 1 == Point(0, 1, 2)
+    assert type(p0.axpy(0.5, Point(1, 1, 1))) is Point
+
+
+def test_point_rotate():
+    p = Point(1, 2, 3)
+    q = Quaternion.from_axis_angle(Axes.X, math.pi / 2)
+    rotated = p.rotate(q)
+    assert isinstance(rotated, Point) and rotated is not p
+    assert rotated == Point(1, -3, 2)
+    assert p == Point(1, 2, 3)
+
+    assert p.rotate_around_axis(Axes.Z, math.pi) == Point(-1, -2, 3)
+    assert p.rotate_around_axis(Axes.Y, 2 * math.pi) == p
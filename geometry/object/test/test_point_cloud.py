@@ -0,0 +1,81 @@
+# -*- coding : utf-8 -*-
+
+import numpy as np
+import pytest
+
+from geometry import Point, PointCloud, Quaternion, Vector, VectorArray
+from geometry.error import InvalidSizeError
+from geometry.object.polygon import Polygon
+
+
+@pytest.fixture
+def points():
+    return [Point(0, 0, 0), Point(1, 2, 3), Point(-2, 4, 1), Point(3, -1, 2)]
+
+
+def test_point_cloud_generation(points):
+    cloud = PointCloud.from_points(points)
+    assert len(cloud) == 4
+    assert cloud.to_points() == points
+    assert type(cloud[1]) is Point
+    assert type(cloud + Point(1, 1, 1)) is PointCloud
+    assert type(cloud[1:].normalize()) is VectorArray
+    assert len(PointCloud()) == 0
+
+    with pytest.raises(InvalidSizeError):
+        PointCloud([[1, 2]])
+
+
+def test_point_cloud_translate(points):
+    cloud = PointCloud.from_points(points)
+    cloud.translate(1, 2, 3)
+    for p in points:
+        p.translate(1, 2, 3)
+    assert cloud.to_points() == points
+
+    cloud.translate_uniform(-1)
+    assert cloud[0] == Point(0, 1, 2)
+
+
+def test_point_cloud_centroid_bounds(points):
+    cloud = PointCloud.from_points(points)
+    assert cloud.centroid() == Point(0.5, 1.25, 1.5)
+    assert cloud.bounds() == (Point(-2, -1, 0), Point(3, 4, 3))
+
+    with pytest.raises(ValueError):
+        PointCloud().centroid()
+
+
+def test_point_cloud_distances(points):
+    cloud = PointCloud.from_points(points)
+    ref = Point(1, 1, 1)
+    assert np.allclose(cloud.distance_to(ref), [p.distance_to(ref) for p in points])
+
+    mask = cloud.near(Point(1, 2, 3.005))
+    assert mask.tolist() == [False, True, False, False]
+    assert cloud[mask].to_points() == [Point(1, 2, 3)]
+
+
+def test_point_cloud_polygon_roundtrip(points):
+    polygon = Polygon(points)
+    cloud = PointCloud.from_points(polygon.vertices)
+    cloud.translate(0, 0, 10)
+    vertices = cloud.to_points(out=polygon.vertices)
+    assert vertices is polygon.vertices and polygon.vertices[1] is points[1]
+    assert points[1] == Point(1, 2, 13)
+    assert (cloud - Vector([0, 0, 10])).to_points()[2] == Point(-2, 4, 1)
+
+
+def test_point_cloud_rotate(points):
+    cloud = PointCloud.from_points(points)
+    q = Quaternion.from_axis_angle((1, 1, 0), 0.7)
+    rotated = cloud.rotate(q)
+    assert isinstance(rotated, PointCloud)
+    assert rotated.to_points() == [p.rotate(q) for p in points]
+    assert cloud.rotate_around_axis((1, 1, 0), 0.7) == rotated
+
+    assert cloud.rotate(q, out=cloud) is cloud
+    assert cloud == rotated
+
+    with pytest.raises(InvalidSizeError):
+        VectorArray([[1, 0]]).rotate(q)
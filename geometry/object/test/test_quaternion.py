@@ -1,8 +1,10 @@
 # -*- coding : utf-8 -*-
 
+import numpy as np
 import pytest
 
-from geometry import Quaternion
+from geometry import Line, Point, Quaternion, Vector
+from geometry.error import InvalidSizeError
 
 
 def test_quaternion_generation():
@@ -120,3 +122,152 @@ def test_quaternion_inverse():
     with pytest.raises(ValueError):
         zero_q = Quaternion(0, 0, 0, 0)
         zero_q.inverse()
+
+
+def test_quaternion_copy():
+    q1 = Quaternion(1, 2, 3, 4)
+    q2 = q1.copy()
+    assert q1 == q2
+
+    q2.x = 10
+    assert q1 == Quaternion(1, 2, 3, 4)
+
+
+def test_quaternion_inplace():
+    q1 = Quaternion(1, 2, 3, 4)
+    q2 = Quaternion(0, 1, 0, 0)
+    ref = id(q1)
+    expected = q1 * q2
+
+    q1 *= q2
+    assert id(q1) == ref and q1 == expected
+
+    q1 /= q2
+    assert id(q1) == ref and q1 == Quaternion(1, 2, 3, 4)
+
+    q1 *= 2
+    assert q1 == Quaternion(2, 4, 6, 8)
+
+
+def test_quaternion_out():
+    q1 = Quaternion(1, 2, 3, 4)
+    q2 = Quaternion(4, 3, 2, 1)
+    out = Quaternion()
+    assert q1.multiply(q2, out=out) is out and out == q1 * q2
+
+    expected = q2 * q1
+    assert q2.multiply(q1, out=q1) is q1 and q1 == expected
+
+    assert q2.normalize(out=q2) is q2 and q2.is_unit_quaternion()
+
+
+def test_quaternion_numpy_scalars():
+    q = Quaternion(1, 2, 3, 4)
+    assert Quaternion(np.int64(1), np.float32(2), 3, 4) == q
+    for product in (q * np.int64(2), np.float64(2) * q, 2 * q, q / np.float64(0.5)):
+        assert type(product) is Quaternion and product == Quaternion(2, 4, 6, 8)
+
+    # numpy defers to the Quaternion instead of treating it as a 4-element array
+    with pytest.raises(TypeError):
+        q * np.array([1.0, 2.0])
+    with pytest.raises(TypeError):
+        np.array([1.0, 2.0]) * q
+    with pytest.raises(ValueError):
+        Quaternion("1", 0, 0, 0)
+
+
+def test_quaternion_buffer():
+    q1 = Quaternion(1, 2, 3, 4)
+    assert Quaternion.from_buffer(q1.to_bytes()) == q1
+    assert Quaternion.from_buffer(np.array([1.0, 2.0, 3.0, 4.0])) == q1
+    assert np.array_equal(np.asarray(q1), [1, 2, 3, 4])
+
+    with pytest.raises(TypeError):
+        Quaternion.from_buffer(np.array([1, 2, 3, 4], dtype=np.float32))
+    with pytest.raises(TypeError):
+        Quaternion.from_buffer(np.array([1, 2, 3, 4], dtype=np.int32))
+
+
+def test_quaternion_rotation():
+    q = Quaternion.from_axis_angle(Vector([0, 0, 2]), np.pi / 2)
+    assert q.is_unit_quaternion()
+    assert np.allclose(q.to_rotation_matrix(), [[0, -1, 0], [1, 0, 0], [0, 0, 1]])
+    assert q.rotate(Vector([1, 0, 0])) == Vector([0, 1, 0])
+
+    # The matrix agrees with the sandwich product q v q^-1, also for non unit quaternions
+    rng = np.random.default_rng(1)
+    for w, x, y, z in rng.normal(size=(10, 4)).tolist():
+        q = Quaternion(w, x, y, z)
+        v = Vector(rng.normal(size=3).tolist())
+        sandwich = q * Quaternion(0, *v) * q.inverse()
+        assert q.rotate(v) == Vector([sandwich.x, sandwich.y, sandwich.z])
+        assert Quaternion.from_rotation_matrix(q.to_rotation_matrix()) in (q.normalize(), -q.normalize())
+
+    with pytest.raises(ValueError):
+        Quaternion(0, 0, 0, 0).to_rotation_matrix()
+    with pytest.raises(ValueError):
+        Quaternion.from_axis_angle((0, 0, 0), 1.0)
+
+
+def test_quaternion_slerp():
+    p = Quaternion.from_axis_angle(Vector([0, 0, 1]), 0.2)
+    q = Quaternion.from_axis_angle(Vector([0, 0, 1]), 1.4)
+    assert p.slerp(q, 0) == p and p.slerp(q, 1) == q
+    assert p.slerp(q, 0.5) == Quaternion.from_axis_angle(Vector([0, 0, 1]), 0.8)
+    assert p.slerp(q, 0.25) == p * (p.inverse() * q) ** 0.25
+
+    # The shorter arc is taken when the quaternions lie on opposite hemispheres
+    assert p.slerp(-q, 0.5) == Quaternion.from_axis_angle(Vector([0, 0, 1]), 0.8)
+    assert p.nlerp(q, 0.5) == Quaternion.from_axis_angle(Vector([0, 0, 1]), 0.8)
+    assert p.nlerp(q, 0.25).is_unit_quaternion()
+
+    close = Quaternion.from_axis_angle(Vector([0, 0, 1]), 0.2 + 1e-06)
+    assert p.slerp(close, 0.5) == Quaternion.from_axis_angle(Vector([0, 0, 1]), 0.2 + 5e-07)
+
+
+def test_quaternion_flat_layout():
+    q = Quaternion(1, 2, 3, 4)
+    assert not hasattr(q, "__dict__")
+    assert q.conjugate().as_tuple() == (1, -2, -3, -4)
+    assert q * q.conjugate() == Quaternion.from_scalar(q._squared_sum())
+    assert q * q.inverse() == Quaternion.identity()
+    assert q * 2 == 2 * q == Quaternion(2, 4, 6, 8)
+    assert q[-1] == 4
+
+    with pytest.raises(ValueError):
+        Quaternion(1, "a", 0, 0)
+
+
+def test_quaternion_scalar_vector_views():
+    q = Quaternion(1, 2, 3, 4)
+    assert q.scalar == 1 and q.vector == Vector([2, 3, 4])
+    assert q.vector.cross(Vector([1, 0, 0])) == Vector([0, 4, -3])
+
+    # The vector view writes through to the quaternion and follows later changes of it
+    v = q.vector
+    v[0] = 5
+    assert q.x == 5
+    q.z = 7
+    assert v == Vector([5, 3, 7])
+    q.vector += Vector([1, 1, 1])
+    q.scalar = 0
+    assert q.as_tuple() == (0, 6, 4, 8)
+
+    # Arithmetic and copies give plain, detached Vectors
+    w = q.vector.copy()
+    assert type(w) is Vector and type(q.vector + w) is Vector
+    w[0] = 100
+    assert q.x == 6
+
+    with pytest.raises(InvalidSizeError):
+        q.vector = Vector([1, 2])
+    with pytest.raises(TypeError):
+        q.vector.append(1)
+
+    # The view prints as a Vector and is accepted wherever a Vector is, without tying the result to q
+    assert str(q.vector) == repr(q.vector) == str(Vector([6, 4, 8]))
+    line = Line(q.vector, Point(0, 0, 0))
+    q.x = 0
+    assert type(line.direction_vector) is Vector and line.direction_vector == Vector([6, 4, 8])
+    with pytest.raises(TypeError):
+        Line(Point(1, 0, 0))
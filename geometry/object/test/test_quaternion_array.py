@@ -0,0 +1,184 @@
+# -*- coding : utf-8 -*-
+
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from geometry import Quaternion, QuaternionArray
+from geometry.error import InvalidSizeError
+from geometry.object.quaternion_array import compose, compose_cumulative
+
+
+@pytest.fixture
+def quaternions():
+    rng = np.random.default_rng(9)
+    return [Quaternion(*row) for row in rng.normal(size=(20, 4)).tolist()]
+
+
+def test_quaternion_array_generation(quaternions):
+    arr = QuaternionArray.from_quaternions(quaternions)
+    assert arr.shape == (20, 4) and len(arr) == 20
+    assert arr.to_quaternions() == quaternions
+    assert arr[3] == quaternions[3]
+    assert len(QuaternionArray()) == 0
+    assert QuaternionArray.identity(3).to_quaternions() == [Quaternion.identity()] * 3
+
+    with pytest.raises(InvalidSizeError):
+        QuaternionArray([[1, 2, 3]])
+
+
+def test_quaternion_array_multiply(quaternions):
+    arr = QuaternionArray.from_quaternions(quaternions)
+    other = QuaternionArray.from_quaternions(reversed(quaternions))
+    others = list(reversed(quaternions))
+
+    assert (arr * other).to_quaternions() == [p * q for p, q in zip(quaternions, others)]
+    q = Quaternion(0.5, -1, 2, 0.25)
+    assert (arr * q).to_quaternions() == [p * q for p in quaternions]
+    assert (q * arr).to_quaternions() == [q * p for p in quaternions]
+    assert (arr * 2).to_quaternions() == [p * 2 for p in quaternions]
+    assert (arr / q).to_quaternions() == [p / q for p in quaternions]
+    assert (arr / other).to_quaternions() == [p / r for p, r in zip(quaternions, others)]
+
+    out = arr.copy()
+    out *= other
+    assert out == arr * other
+    assert arr.multiply(other, out=other) is other
+    assert other == out
+
+    with pytest.raises(InvalidSizeError):
+        arr * arr[:3]
+    with pytest.raises(TypeError):
+        arr * "1"
+
+
+def test_quaternion_array_norm_inverse(quaternions):
+    arr = QuaternionArray.from_quaternions(quaternions)
+    assert np.allclose(arr.norm(), [q.norm() for q in quaternions])
+    assert arr.normalize().to_quaternions() == [q.normalize() for q in quaternions]
+    assert arr.normalize().is_unit_quaternion().all()
+    assert arr.inverse().to_quaternions() == [q.inverse() for q in quaternions]
+    assert arr * arr.inverse() == QuaternionArray.identity(20)
+    assert arr.conjugate().to_quaternions() == [Quaternion(q.w, -q.x, -q.y, -q.z) for q in quaternions]
+
+    zeros = QuaternionArray([[0, 0, 0, 0], [1, 0, 0, 0]])
+    with pytest.raises(ValueError):
+        zeros.normalize()
+    with pytest.raises(ValueError):
+        zeros.inverse()
+
+
+def test_quaternion_array_pow(quaternions):
+    arr = QuaternionArray.from_quaternions(quaternions)
+    for exponent in (2, 0.5, -1.5):
+        assert (arr ** exponent).to_quaternions() == [q ** exponent for q in quaternions]
+    exponents = np.linspace(-2, 2, 20)
+    assert (arr ** exponents).to_quaternions() == [q ** e for q, e in zip(quaternions, exponents.tolist())]
+
+    special = QuaternionArray([[2, 0, 0, 0], [0, 0, 0, 0]])
+    assert special ** 3 == QuaternionArray([[8, 0, 0, 0], [0, 0, 0, 0]])
+
+
+def test_quaternion_array_buffer(quaternions):
+    arr = QuaternionArray.from_quaternions(quaternions)
+    data = bytearray(arr.to_bytes())
+    view = QuaternionArray.from_buffer(data)
+    assert view == arr
+    view.values[0, 0] = 100
+    assert QuaternionArray.from_buffer(data)[0].w == 100
+    assert np.shares_memory(np.asarray(arr), arr.values)
+
+    with pytest.raises(InvalidSizeError):
+        QuaternionArray.from_buffer(bytes(24))
+    with pytest.raises(TypeError):
+        QuaternionArray.from_buffer(np.zeros((2, 4), dtype=np.float32))
+
+    exported = np.asarray(view)
+    assert np.shares_memory(exported, np.frombuffer(data)) and exported[0, 0] == 100
+
+
+def unit_quaternions(n, seed):
+    return QuaternionArray(np.random.default_rng(seed).normal(size=(n, 4))).normalize()
+
+
+def test_quaternion_array_slerp():
+    p, q = unit_quaternions(50, 1), unit_quaternions(50, 2)
+    t = np.linspace(0, 1, 50)
+    assert p.slerp(q, t).to_quaternions() == [a.slerp(b, s) for a, b, s in zip(p, q, t.tolist())]
+    assert p.nlerp(q, t).to_quaternions() == [a.nlerp(b, s) for a, b, s in zip(p, q, t.tolist())]
+    assert p.slerp(q[0], 0.3).to_quaternions() == [a.slerp(q[0], 0.3) for a in p]
+    assert p.slerp(p, 0.3) == p
+    assert np.allclose(p.dot(q), [a.dot(b) for a, b in zip(p, q)])
+
+    with pytest.raises(InvalidSizeError):
+        p.slerp(q, [0.1, 0.2])
+
+
+def test_quaternion_array_resample():
+    keyframes = unit_quaternions(11, 3)
+    times = np.linspace(0.0, 1.0, 11) ** 2
+
+    chunks = list(keyframes.iter_resample(times, rate=100, chunk_size=16))
+    assert all(len(c) <= 16 for _, c in chunks)
+    sample_times = np.concatenate([t for t, _ in chunks])
+    samples = [q for _, c in chunks for q in c]
+    assert len(samples) == 101
+    assert np.allclose(sample_times, np.arange(101) / 100)
+    assert samples[0] == keyframes[0] and samples[-1] == keyframes[-1]
+
+    for s, q in zip(sample_times.tolist()[::7], samples[::7]):
+        seg = min(int(np.searchsorted(times, s, side="right")) - 1, 9)
+        u = (s - times[seg]) / (times[seg + 1] - times[seg])
+        assert q == keyframes[seg].slerp(keyframes[seg + 1], u)
+
+    nlerped = [q for _, c in keyframes.iter_resample(times, rate=10, method="nlerp") for q in c]
+    assert nlerped[5] == keyframes[7].nlerp(keyframes[8], (0.5 - 0.49) / (0.64 - 0.49))
+
+    # Samples before the first keyframe are clamped
+    first = next(keyframes.iter_resample(times, rate=10, start=-1.0))[1]
+    assert first[0] == keyframes[0]
+
+    with pytest.raises(ValueError):
+        next(keyframes.iter_resample(times[::-1], rate=10))
+    with pytest.raises(InvalidSizeError):
+        next(keyframes.iter_resample(times[:3], rate=10))
+
+
+def sequential(quaternions):
+    result, prefixes = Quaternion.identity(), []
+    for q in quaternions:
+        result = result * q
+        prefixes.append(result)
+    return prefixes
+
+
+def test_quaternion_array_compose():
+    chain = unit_quaternions(1001, 4)
+    expected = sequential(chain)
+    assert compose(chain) == expected[-1]
+    assert chain.compose() == expected[-1]
+    assert compose(chain.to_quaternions()[:3]) == expected[2]
+    assert compose([]) == Quaternion.identity()
+
+    scaled = chain * 2
+    assert compose(scaled[:5], renormalize=False) == sequential(scaled[:5])[-1]
+
+    with ThreadPoolExecutor(4) as executor:
+        assert compose(chain, executor=executor, block_size=64) == expected[-1]
+    with ProcessPoolExecutor(2) as executor:
+        assert compose(chain, executor=executor, block_size=300) == expected[-1]
+
+
+def test_quaternion_array_cumulative():
+    chain = unit_quaternions(1001, 5)
+    expected = QuaternionArray.from_quaternions(sequential(chain))
+    assert compose_cumulative(chain) == expected
+    assert chain.cumulative(block_size=7) == expected
+    assert chain[:1].cumulative() == chain[:1]
+    assert len(compose_cumulative([])) == 0
+
+    with ThreadPoolExecutor(4) as executor:
+        assert chain.cumulative(executor=executor, block_size=16) == expected
+    with ProcessPoolExecutor(2) as executor:
+        assert chain.cumulative(executor=executor) == expected
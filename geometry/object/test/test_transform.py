@@ -0,0 +1,103 @@
+# -*- coding : utf-8 -*-
+
+import math
+
+import numpy as np
+import pytest
+
+from geometry import Axes, LineSegment, Point, Quaternion, Transform, Vector
+from geometry.error import InvalidSizeError
+from geometry.object.path import Path
+from geometry.object.polygon import Polygon
+
+
+def test_transform_generation():
+    assert Transform().is_identity()
+    assert Transform.translation(1, 2, 3) * Point(1, 1, 1) == Point(2, 3, 4)
+    assert Transform.translation(1, 2, 3) * Vector([1, 1, 1]) == Vector([1, 1, 1])
+    assert Transform.scaling(2) * Point(1, 2, 3) == Point(2, 4, 6)
+    assert Transform.scaling(1, 2, 3) * Point(1, 1, 1) == Point(1, 2, 3)
+
+    q = Quaternion.from_axis_angle(Axes.Z, math.pi / 2)
+    assert Transform.rotation(q) * Point(1, 0, 5) == Point(0, 1, 5)
+    assert Transform.rotation(q, center=Point(1, 1, 0)) * Point(2, 1, 0) == Point(1, 2, 0)
+
+    with pytest.raises(InvalidSizeError):
+        Transform(np.eye(3))
+    with pytest.raises(ValueError):
+        Transform(np.ones((4, 4)))
+    with pytest.raises(ValueError):
+        Transform.identity().matrix[0, 0] = 2
+
+
+def test_transform_compose():
+    q = Quaternion.from_axis_angle((1, 2, 3), 0.4)
+    t = Transform.translation(1, -2, 0.5)
+    s = Transform.scaling(2, 1, 0.5)
+    composed = t * Transform.rotation(q) * s
+    p = Point(0.3, -1.2, 2.0)
+    assert composed * p == t * (Transform.rotation(q) * (s * p))
+    assert composed.inverse() * (composed * p) == p
+    assert composed * composed.inverse() == Transform.identity()
+
+    values = np.random.default_rng(0).normal(size=(10, 3))
+    expected = [composed * Point(*row) for row in values.tolist()]
+    assert [Point(*row) for row in composed.apply_to_array(values).tolist()] == expected
+
+    with pytest.raises(ValueError):
+        Transform.scaling(0).inverse()
+
+
+def test_lazy_polygon():
+    vertices = [Point(0, 0, 0), Point(1, 0, 0), Point(1, 1, 0)]
+    polygon = Polygon(vertices)
+    q = Quaternion.from_axis_angle(Axes.Z, math.pi / 2)
+
+    polygon.translate(1, 0, 0)
+    polygon.rotate(q)
+    polygon.scale(2)
+    # Nothing is applied until the vertices are read
+    assert vertices[1] == Point(1, 0, 0)
+    assert polygon.pending_transform == Transform.scaling(2) * Transform.rotation(q) * Transform.translation(1, 0, 0)
+
+    assert polygon.vertices == [Point(0, 2, 0), Point(0, 4, 0), Point(-2, 4, 0)]
+    assert polygon.vertices[0] is vertices[0]
+    assert polygon.pending_transform.is_identity()
+
+    copied = polygon.copy()
+    polygon.rotate_around_axis(Axes.Z, math.pi, center=Point(0, 2, 0))
+    assert polygon.bounds() == (Point(0, 0, 0), Point(2, 2, 0))
+    assert copied.vertices == [Point(0, 2, 0), Point(0, 4, 0), Point(-2, 4, 0)]
+
+    # A vertex listed twice is moved once
+    shared = Point(1, 1, 1)
+    closed = Polygon([shared, Point(0, 0, 0), shared])
+    closed.translate(1, 1, 1)
+    assert closed.vertices[0] == Point(2, 2, 2)
+
+
+def test_lazy_path():
+    path = Path([Point(0, 0, 0), Point(1, 0, 0)])
+    path.translate(0, 1, 0)
+    path.append(Point(5, 5, 5))
+    assert path.points == [Point(0, 1, 0), Point(1, 1, 0), Point(5, 5, 5)]
+
+    path.translate(0, 0, 1)
+    path.points = [Point(0, 0, 0), Point(1, 1, 1)]
+    assert path.points == [Point(0, 0, 0), Point(1, 1, 1)]
+
+
+def test_lazy_line_segment():
+    segment = LineSegment(Point(1, 0, 0), Point(2, 0, 0)).enable_caching()
+    assert segment.length() == 1
+
+    segment.rotate(Quaternion.from_axis_angle(Axes.Z, math.pi / 2))
+    segment.scale(3)
+    assert segment.a == Point(0, 3, 0) and segment.b == Point(0, 6, 0)
+    assert segment.length() == pytest.approx(3)
+    assert segment.direction_vector == Vector([0, 3, 0])
+
+    # Default end points are not shared between segments
+    moved = LineSegment()
+    moved.translate(1, 1, 1)
+    assert moved.a == Point(1, 1, 1) and LineSegment().a == Point(0, 0, 0)
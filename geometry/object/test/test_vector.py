@@ -1,9 +1,12 @@
 # -*- coding : utf-8 -*-
 import math
+from copy import deepcopy
 
+import numpy as np
 import pytest
 
 from geometry import Vector
+from geometry.error import InvalidSizeError
 
 
 def test_vector_generation():
@@ -142,3 +145,131 @@ def test_vector_orthogonal():
     assert v2.is_orthogonal(v3)
     assert v3.is_orthogonal(v1)
     assert not v1.is_orthogonal(v4)
+
+
+def test_vector_copy():
+    v1 = Vector([1, 2, 3])
+    v2 = v1.copy()
+    assert v1 == v2 and v1.values is not v2.values
+
+    v2[0] = 5
+    assert v1 == Vector([1, 2, 3])
+
+    v3 = deepcopy([v1])[0]
+    assert type(v3) is Vector and v3 == v1 and v3 is not v1
+
+
+def test_vector_cross_leaves_operands():
+    v1 = Vector([2, 3])
+    v2 = Vector([2, 7, 4])
+    v1.cross(v2)
+    assert len(v1) == 2 and len(v2) == 3
+
+
+def test_vector_inplace():
+    v1 = Vector([1, 2, 3])
+    values = v1.values
+    v1 += Vector([1, 1, 1])
+    assert v1 == Vector([2, 3, 4])
+    v1 -= Vector([1, 2, 3])
+    assert v1 == Vector([1, 1, 1])
+    v1 *= Vector([2, 4, 6])
+    assert v1 == Vector([2, 4, 6])
+    v1 /= Vector([2, 2, 2])
+    assert v1 == Vector([1, 2, 3])
+    assert v1.values is values
+
+    with pytest.raises(InvalidSizeError):
+        v1 += Vector([1, 2])
+
+
+def test_vector_out():
+    v1 = Vector([3, 4, 0])
+    out = Vector([0, 0, 0])
+    assert v1.normalize(out=out) is out and out == Vector([0.6, 0.8, 0])
+    assert v1.scale(2, out=v1) is v1 and v1 == Vector([6, 8, 0])
+
+    v2 = Vector([2, 7, 4])
+    v3 = Vector([3, 9, 8])
+    assert v2.cross(v3, out=v2) is v2 and v2 == Vector([20, -4, -3])
+
+    with pytest.raises(InvalidSizeError):
+        v2.cross(v3, out=Vector([0, 0]))
+
+
+def test_vector_scalar_operators():
+    v1 = Vector([1, 2, 4])
+    assert v1 * 2 == Vector([2, 4, 8])
+    assert 2 * v1 == Vector([2, 4, 8])
+    assert v1 + 1 == Vector([2, 3, 5])
+    assert 1 + v1 == Vector([2, 3, 5])
+    assert v1 - 1 == Vector([0, 1, 3])
+    assert 1 - v1 == Vector([0, -1, -3])
+    assert v1 / 2 == Vector([0.5, 1, 2])
+    assert 4 / v1 == Vector([4, 2, 1])
+
+    v1 *= 2
+    assert v1 == Vector([2, 4, 8])
+
+    with pytest.raises(TypeError):
+        v1 * "2"
+
+
+def test_vector_axpy():
+    x = Vector([1, 2, 3])
+    y = Vector([1, 1, 1])
+    assert x.axpy(2, y) == Vector([3, 5, 7])
+    assert x.axpy(2, y, out=y) is y and y == Vector([3, 5, 7])
+
+
+def test_vector_caching():
+    v1 = Vector([3, 4, 0]).enable_caching()
+    assert v1.magnitude() == 5
+    assert v1.normalize() == Vector([0.6, 0.8, 0])
+
+    v1[2] = 12
+    assert v1.magnitude() == 13
+    v1.append(84)
+    assert v1.magnitude() == 85
+    v1 *= 2
+    assert v1.magnitude() == 170
+    v1.scale(0.5, out=v1)
+    assert v1.normalize() == Vector([3, 4, 12, 84]).normalize()
+
+    v1.disable_caching()
+    v1[0] = 0
+    assert v1.magnitude() == Vector([0, 4, 12, 84]).magnitude()
+
+
+def test_vector_buffer():
+    data = np.array([1.0, 2.0, 3.0])
+    v1 = Vector.from_buffer(data)
+    v1[0] = 5
+    assert data[0] == 5
+    data[1] = 7
+    assert v1 == Vector([5, 7, 3])
+    assert np.shares_memory(np.asarray(v1, copy=False), data)
+
+    v2 = Vector([1, 2, 3])
+    assert np.array_equal(np.asarray(v2), [1, 2, 3])
+    assert Vector.from_buffer(v2.to_bytes()) == v2
+    assert Vector.from_buffer(bytearray(v2.to_bytes())) == v2
+    with pytest.raises(ValueError):
+        np.asarray(v2, copy=False)
+
+    # Buffers of other types are rejected instead of reinterpreting their bytes as float64
+    with pytest.raises(TypeError):
+        Vector.from_buffer(np.array([1, 2, 3], dtype=np.float32))
+    with pytest.raises(TypeError):
+        Vector.from_buffer(np.array([1, 2, 3], dtype=np.int64))
+    with pytest.raises(ValueError):
+        Vector.from_buffer(bytes(12))
+
+    with pytest.raises(TypeError):
+        v1.append(4)
+
+
+def test_is_zero_vector_exact():
+    assert Vector([1e-05, 0, 0]).is_zero_vector()
+    assert not Vector([1e-05, 0, 0]).is_zero_vector(exact=True)
+    assert Vector([0.0, -0.0, 0]).is_zero_vector(exact=True)
@@ -0,0 +1,116 @@
+# -*- coding : utf-8 -*-
+
+import numpy as np
+import pytest
+
+from geometry import Vector, VectorArray
+from geometry.error import InvalidSizeError
+
+
+@pytest.fixture
+def vectors():
+    return [Vector([1, 2, 3]), Vector([4, 5, 6]), Vector([-1, 0, 2])]
+
+
+def test_vector_array_generation(vectors):
+    arr = VectorArray.from_vectors(vectors)
+    assert arr.shape == (3, 3)
+    assert len(arr) == 3 and arr.dim == 3
+    assert arr.to_vectors() == vectors
+    assert arr[1] == Vector([4, 5, 6])
+
+    with pytest.raises(InvalidSizeError):
+        VectorArray([1, 2, 3])
+
+
+def test_vector_array_arithmetic(vectors):
+    arr = VectorArray.from_vectors(vectors)
+    other = VectorArray.from_vectors(reversed(vectors))
+    others = list(reversed(vectors))
+
+    assert (arr + other).to_vectors() == [u + v for u, v in zip(vectors, others)]
+    assert (arr - other).to_vectors() == [u - v for u, v in zip(vectors, others)]
+    assert (arr * other).to_vectors() == [u * v for u, v in zip(vectors, others)]
+    assert (-arr).to_vectors() == [-v for v in vectors]
+
+    offset = Vector([1, 1, 1])
+    assert (arr + offset).to_vectors() == [v + offset for v in vectors]
+
+    with pytest.raises(InvalidSizeError):
+        arr + Vector([1, 2])
+
+    with pytest.raises(TypeError):
+        arr + "1"
+
+
+def test_vector_array_div():
+    arr = VectorArray([[2, 4, 6], [3, 3, 3]])
+    assert arr / VectorArray([[2, 2, 2], [3, 1, 3]]) == VectorArray([[1, 2, 3], [1, 3, 1]])
+
+
+def test_vector_array_scale(vectors):
+    arr = VectorArray.from_vectors(vectors)
+    assert arr.scale(2).to_vectors() == [v.scale(2) for v in vectors]
+    assert arr.scale([1, 2, 3]).to_vectors() == [v.scale(f) for v, f in zip(vectors, (1, 2, 3))]
+
+
+def test_vector_array_dot_magnitude_normalize(vectors):
+    arr = VectorArray.from_vectors(vectors)
+    assert np.allclose(arr.dot(arr), [v.dot(v) for v in vectors])
+    assert np.allclose(arr.magnitude(), [v.magnitude() for v in vectors])
+    assert all(v.is_unit_vector() for v in arr.normalize())
+
+    with pytest.raises(ZeroDivisionError):
+        VectorArray([[0, 0, 0]]).normalize()
+
+
+def test_vector_array_cross():
+    arr = VectorArray([[2, 7, 4], [2, 3, 0]])
+    other = VectorArray([[3, 9, 8], [1, 7, 0]])
+    assert arr.cross(other).to_vectors() == [Vector([20, -4, -3]), Vector([0, 0, 11])]
+
+    flat = VectorArray([[2, 3]])
+    assert flat.cross(VectorArray([[1, 7]])).to_vectors() == [Vector([11])]
+    assert flat.cross(Vector([2, 7, 4])).to_vectors() == [Vector([12, -8, 8])]
+
+
+def test_vector_array_scalar_operators(vectors):
+    arr = VectorArray.from_vectors(vectors)
+    assert (arr * 2).to_vectors() == [v * 2 for v in vectors]
+    assert (2 * arr).to_vectors() == [2 * v for v in vectors]
+    assert (np.float64(2) * arr).to_vectors() == [2 * v for v in vectors]
+    assert (1 - arr).to_vectors() == [1 - v for v in vectors]
+    assert (arr / 2).to_vectors() == [v / 2 for v in vectors]
+
+    values = arr.values
+    arr += 1
+    assert arr.values is values and arr.to_vectors() == [v + 1 for v in vectors]
+
+
+def test_vector_array_axpy(vectors):
+    x = VectorArray.from_vectors(vectors)
+    y = VectorArray(np.ones((3, 3)))
+    expected = [v.axpy(3, Vector([1, 1, 1])) for v in vectors]
+    assert x.axpy(3, y).to_vectors() == expected
+    assert x.axpy(3, y, out=y) is y and y.to_vectors() == expected
+
+
+def test_vector_array_buffer(vectors):
+    arr = VectorArray.from_vectors(vectors)
+    assert np.shares_memory(np.asarray(arr), arr.values)
+
+    data = bytearray(arr.to_bytes())
+    wrapped = VectorArray.from_buffer(data, 3)
+    assert wrapped == arr
+
+    wrapped += 1
+    assert VectorArray.from_buffer(data, 3) == arr + 1
+
+    with pytest.raises(InvalidSizeError):
+        VectorArray.from_buffer(data, 4)
+    with pytest.raises(TypeError):
+        VectorArray.from_buffer(arr.values.astype(np.float32), 3)
+
+    # numpy reads the buffer through __array_interface__ without copying
+    exported = np.asarray(wrapped)
+    assert np.shares_memory(exported, np.frombuffer(data)) and exported.shape == (len(arr), 3)
@@ -0,0 +1,155 @@
+# -*- coding : utf-8 -*-
+
+from typing import Iterable, List, Optional, Union
+
+import numpy as np
+
+from geometry import Point, Quaternion, Vector
+from geometry.error import InvalidSizeError
+from geometry.types import Real
+
+
+class Transform:
+    """
+    Affine transformation of R3 stored as a 4x4 matrix acting on homogeneous column vectors.
+
+    Transforms compose by multiplication, (a * b) applies b first and then a, so any chain of translations,
+    rotations and scalings folds into a single matrix. Applied to a Point the full transformation is used,
+    applied to a Vector only its linear part, since directions are not moved by translations.
+    Transforms are immutable.
+    """
+
+    __slots__ = ("matrix",)
+
+    def __init__(self, matrix: Optional[Iterable[Iterable[Real]]] = None) -> None:
+        if matrix is None:
+            matrix = np.eye(4)
+        else:
+            matrix = np.array(matrix, dtype=np.float64)
+            if matrix.shape != (4, 4):
+                raise InvalidSizeError(f"matrix must have shape (4, 4), got {matrix.shape}")
+            if not np.array_equal(matrix[3], (0.0, 0.0, 0.0, 1.0)):
+                raise ValueError("the last row of an affine matrix must be (0, 0, 0, 1)")
+        matrix.flags.writeable = False
+        self.matrix = matrix
+
+    @classmethod
+    def _wrap(cls, matrix: np.ndarray) -> "Transform":
+        # Trusted constructor for internal use, takes ownership of an affine 4x4 float64 array
+        obj = cls.__new__(cls)
+        matrix.flags.writeable = False
+        obj.matrix = matrix
+        return obj
+
+    @classmethod
+    def identity(cls) -> "Transform":
+        return cls()
+
+    @classmethod
+    def translation(cls, dx: Real, dy: Real, dz: Real) -> "Transform":
+        matrix = np.eye(4)
+        matrix[:3, 3] = dx, dy, dz
+        return cls._wrap(matrix)
+
+    @classmethod
+    def rotation(cls, q: Quaternion, center: Optional[Point] = None) -> "Transform":
+        """
+        Rotation by the quaternion q around center, or around the origin when center is omitted
+        """
+        matrix = np.eye(4)
+        matrix[:3, :3] = q.to_rotation_matrix()
+        if center is not None:
+            c = np.asarray(center.values, dtype=np.float64)
+            matrix[:3, 3] = c - matrix[:3, :3] @ c
+        return cls._wrap(matrix)
+
+    @classmethod
+    def rotation_around_axis(cls, axis: Vector, angle: Real, center: Optional[Point] = None) -> "Transform":
+        return cls.rotation(Quaternion.from_axis_angle(axis, angle), center)
+
+    @classmethod
+    def scaling(cls, sx: Real, sy: Optional[Real] = None, sz: Optional[Real] = None) -> "Transform":
+        """
+        Scaling about the origin, uniform when only sx is given
+        """
+        matrix = np.eye(4)
+        matrix[0, 0] = sx
+        matrix[1, 1] = sx if sy is None else sy
+        matrix[2, 2] = sx if sz is None else sz
+        return cls._wrap(matrix)
+
+    @property
+    def linear(self) -> np.ndarray:
+        return self.matrix[:3, :3]
+
+    @property
+    def offset(self) -> np.ndarray:
+        return self.matrix[:3, 3]
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}({self.matrix[:3].tolist()})"
+
+    def __repr__(self) -> str:
+        return self.__str__()
+
+    def __mul__(self, other: Union["Transform", Vector]) -> Union["Transform", Vector]:
+        if isinstance(other, Transform):
+            return self._wrap(self.matrix @ other.matrix)
+        if isinstance(other, Vector):
+            return self.apply(other)
+        return NotImplemented
+
+    def __eq__(self, other: "Transform") -> bool:
+        if not isinstance(other, Transform):
+            raise TypeError(f"Cannot compare instances of type {type(other)} and {type(self)}")
+        return bool(np.allclose(self.matrix, other.matrix, rtol=1e-09, atol=1e-09))
+
+    __hash__ = None
+
+    def is_identity(self) -> bool:
+        return bool(np.array_equal(self.matrix, np.eye(4)))
+
+    def inverse(self) -> "Transform":
+        linear = self.linear
+        if np.linalg.det(linear) == 0:
+            raise ValueError("Cannot invert a singular transform!")
+        matrix = np.eye(4)
+        matrix[:3, :3] = np.linalg.inv(linear)
+        matrix[:3, 3] = -matrix[:3, :3] @ self.offset
+        return self._wrap(matrix)
+
+    def apply(self, vector: Vector) -> Vector:
+        """
+        Returns a transformed copy of vector of the same type. Points are transformed fully, other vectors
+        only by the linear part.
+        """
+        if len(vector) != 3:
+            raise InvalidSizeError(f"Cannot transform a vector of size {len(vector)}")
+        (m00, m01, m02, m03), (m10, m11, m12, m13), (m20, m21, m22, m23) = self.matrix[:3].tolist()
+        x, y, z = vector.values
+        values = [m00 * x + m01 * y + m02 * z, m10 * x + m11 * y + m12 * z, m20 * x + m21 * y + m22 * z]
+        if isinstance(vector, Point):
+            values[0] += m03
+            values[1] += m13
+            values[2] += m23
+        return vector._unchecked(values)
+
+    def apply_to_array(self, values: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+        """
+        Transforms the rows of an (N, 3) array of point coordinates with one matrix multiply
+        """
+        out = np.matmul(values, self.linear.T, out=out)
+        out += self.offset
+        return out
+
+    def apply_to_points(self, points: Iterable[Point]) -> None:
+        """
+        Transforms Points in place in one pass, a Point listed more than once is only transformed once
+        """
+        unique: List[Point] = list({id(p): p for p in points}.values())
+        if not unique:
+            return
+        values = self.apply_to_array(np.array([p.values for p in unique], dtype=np.float64))
+        for point, (x, y, z) in zip(unique, values.tolist()):
+            v = point._out_values(3)
+            v[0], v[1], v[2] = x, y, z
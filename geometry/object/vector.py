@@ -1,64 +1,194 @@
 # -*- coding : utf-8 -*-
 
+from array import array
 from math import sqrt, acos, isclose
-from typing import Generator, Iterable, Tuple, Union
+from typing import Generator, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
 
 from geometry.error import InvalidSizeError
 from geometry.types import Real
+from geometry.utilities.arrays import as_float64_view
 from geometry.utilities.copyable import CopyableMixin
+from geometry.utilities.spatial_hash import grid_key
+
+# Twice the absolute tolerance of __eq__
+HASH_CELL_SIZE = 2e-04
 
 
 class Vector(CopyableMixin):
 
+    __slots__ = ("values", "_cache")
+
+    # Makes numpy scalars defer to the reflected operators instead of broadcasting over the vector
+    __array_ufunc__ = None
+
     def __init__(self, values: Iterable[Real] = []) -> None:
         self.values = [v for v in values]
+        self._cache = None
         if not all(isinstance(v, (int, float)) for v in self.values):
             raise ValueError("values must be of type Real")
 
+    @classmethod
+    def _unchecked(cls, values: List[Real]) -> "Vector":
+        # Internal constructor for trusted operands, takes ownership of values without copying or validation
+        obj = object.__new__(cls)
+        obj.values = values
+        obj._cache = None
+        return obj
+
     def __iter__(self) -> Generator[Real, None, None]:
         yield from self.values
 
     def __neg__(self) -> "Vector":
-        return Vector(-i for i in self)
+        return self._unchecked([-i for i in self.values])
 
-    def __add__(self, other: "Vector") -> "Vector":
+    def __add__(self, other: Union["Vector", Real]) -> "Vector":
+        a = self.values
+        if isinstance(other, (int, float)):
+            return self._unchecked([i + other for i in a])
         if not isinstance(other, Vector):
             raise TypeError(f"Cannot add instances of type {type(other)} and {type(self)}")
-        if len(self) != len(other):
+        b = other.values
+        if len(a) != len(b):
             raise InvalidSizeError(f"Cannot add vectors of size {len(self)} and {len(other)}")
-        return Vector(i + j for i, j in zip(self, other))
-
-    def __sub__(self, other: "Vector") -> "Vector":
+        if len(a) == 3:
+            return self._unchecked([a[0] + b[0], a[1] + b[1], a[2] + b[2]])
+        return self._unchecked([i + j for i, j in zip(a, b)])
+
+    def __sub__(self, other: Union["Vector", Real]) -> "Vector":
+        a = self.values
+        if isinstance(other, (int, float)):
+            return self._unchecked([i - other for i in a])
         if not isinstance(other, Vector):
             raise TypeError(f"Cannot subtract instances of type {type(other)} and {type(self)}")
-        if len(self) != len(other):
+        b = other.values
+        if len(a) != len(b):
             raise InvalidSizeError(f"Cannot subtract vectors of size {len(self)} and {len(other)}")
-        return Vector(i - j for i, j in zip(self, other))
-
-    def __mul__(self, other: "Vector") -> "Vector":
+        if len(a) == 3:
+            return self._unchecked([a[0] - b[0], a[1] - b[1], a[2] - b[2]])
+        return self._unchecked([i - j for i, j in zip(a, b)])
+
+    def __mul__(self, other: Union["Vector", Real]) -> "Vector":
+        a = self.values
+        if isinstance(other, (int, float)):
+            return self._unchecked([i * other for i in a])
         if not isinstance(other, Vector):
             raise TypeError(f"Cannot multiply instances of type {type(other)} and {type(self)}")
-        if len(self) != len(other):
+        b = other.values
+        if len(a) != len(b):
             raise InvalidSizeError(f"Cannot multiply vectors of size {len(self)} and {len(other)}")
-        return Vector(i * j for i, j in zip(self, other))
-
-    def __truediv__(self, other: "Vector") -> "Vector":
+        if len(a) == 3:
+            return self._unchecked([a[0] * b[0], a[1] * b[1], a[2] * b[2]])
+        return self._unchecked([i * j for i, j in zip(a, b)])
+
+    def __truediv__(self, other: Union["Vector", Real]) -> "Vector":
+        a = self.values
+        if isinstance(other, (int, float)):
+            return self._unchecked([i / other for i in a])
         if not isinstance(other, Vector):
             raise TypeError(f"Cannot divide instances of type {type(other)} and {type(self)}")
-        if len(self) != len(other):
+        b = other.values
+        if len(a) != len(b):
             raise InvalidSizeError(f"Cannot divide vectors of size {len(self)} and {len(other)}")
-        return Vector(i / j for i, j in zip(self, other))
+        if len(a) == 3:
+            return self._unchecked([a[0] / b[0], a[1] / b[1], a[2] / b[2]])
+        return self._unchecked([i / j for i, j in zip(a, b)])
 
-    def __div__(self, other: "Vector") -> "Vector":
+    def __div__(self, other: Union["Vector", Real]) -> "Vector":
         return self.__truediv__(other)
 
+    def __radd__(self, other: Real) -> "Vector":
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        return self._unchecked([other + i for i in self.values])
+
+    def __rsub__(self, other: Real) -> "Vector":
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        return self._unchecked([other - i for i in self.values])
+
+    def __rmul__(self, other: Real) -> "Vector":
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        return self._unchecked([other * i for i in self.values])
+
+    def __rtruediv__(self, other: Real) -> "Vector":
+        if not isinstance(other, (int, float)):
+            return NotImplemented
+        return self._unchecked([other / i for i in self.values])
+
+    def __iadd__(self, other: Union["Vector", Real]) -> "Vector":
+        a = self.values
+        self._invalidate()
+        if isinstance(other, (int, float)):
+            for idx, i in enumerate(a):
+                a[idx] = i + other
+            return self
+        if not isinstance(other, Vector):
+            raise TypeError(f"Cannot add instances of type {type(other)} and {type(self)}")
+        b = other.values
+        if len(a) != len(b):
+            raise InvalidSizeError(f"Cannot add vectors of size {len(self)} and {len(other)}")
+        for idx, j in enumerate(b):
+            a[idx] += j
+        return self
+
+    def __isub__(self, other: Union["Vector", Real]) -> "Vector":
+        a = self.values
+        self._invalidate()
+        if isinstance(other, (int, float)):
+            for idx, i in enumerate(a):
+                a[idx] = i - other
+            return self
+        if not isinstance(other, Vector):
+            raise TypeError(f"Cannot subtract instances of type {type(other)} and {type(self)}")
+        b = other.values
+        if len(a) != len(b):
+            raise InvalidSizeError(f"Cannot subtract vectors of size {len(self)} and {len(other)}")
+        for idx, j in enumerate(b):
+            a[idx] -= j
+        return self
+
+    def __imul__(self, other: Union["Vector", Real]) -> "Vector":
+        a = self.values
+        self._invalidate()
+        if isinstance(other, (int, float)):
+            for idx, i in enumerate(a):
+                a[idx] = i * other
+            return self
+        if not isinstance(other, Vector):
+            raise TypeError(f"Cannot multiply instances of type {type(other)} and {type(self)}")
+        b = other.values
+        if len(a) != len(b):
+            raise InvalidSizeError(f"Cannot multiply vectors of size {len(self)} and {len(other)}")
+        for idx, j in enumerate(b):
+            a[idx] *= j
+        return self
+
+    def __itruediv__(self, other: Union["Vector", Real]) -> "Vector":
+        a = self.values
+        self._invalidate()
+        if isinstance(other, (int, float)):
+            for idx, i in enumerate(a):
+                a[idx] = i / other
+            return self
+        if not isinstance(other, Vector):
+            raise TypeError(f"Cannot divide instances of type {type(other)} and {type(self)}")
+        b = other.values
+        if len(a) != len(b):
+            raise InvalidSizeError(f"Cannot divide vectors of size {len(self)} and {len(other)}")
+        for idx, j in enumerate(b):
+            a[idx] /= j
+        return self
+
     def __pow__(self, exponent: Union[Real, "Vector"]) -> "Vector":
         if isinstance(exponent, Vector):
             if len(self) != len(exponent):
                 raise InvalidSizeError(f"Cannot expontiate vectors of size {len(self)} and {len(exponent)}")
-            return Vector(i ** j for i, j in zip(self, exponent))
+            return Vector._unchecked([i ** j for i, j in zip(self.values, exponent.values)])
         else:
-            return Vector(i ** exponent for i in self)
+            return Vector._unchecked([i ** exponent for i in self.values])
 
     def __eq__(self, other: "Vector") -> "Vector":
         if not isinstance(other, Vector):
@@ -77,9 +207,14 @@ class Vector(CopyableMixin):
         if idx >= len(self.values):
             raise IndexError(f"index {idx} is out of range for a Vector of size {len(self.values)}")
         self.values[idx] = value
+        self._invalidate()
 
     def __hash__(self) -> int:
-        return hash(self.as_tuple())
+        # Hashes the tolerance grid cell rather than the raw floats, so that near-equal vectors land in the same
+        # bucket unless they straddle a cell boundary, where equal vectors hash differently. Sets and dicts are
+        # therefore only a fast approximate dedupe, geometry.utilities.unique_points and SpatialHash remove
+        # every near-duplicate.
+        return hash(grid_key(self.values, HASH_CELL_SIZE))
 
     def __str__(self) -> str:
         return f"{self.__class__.__name__}(" + ", ".join([f"{i:.4f}" for i in self.values]) + ")"
@@ -88,78 +223,177 @@ class Vector(CopyableMixin):
         return str(self)
 
     def __round__(self, n=None) -> "Vector":
-        return Vector(round(i, n) for i in self)
+        return self._unchecked([round(i, n) for i in self.values])
 
     def __len__(self) -> int:
         return len(self.values)
 
+    def copy(self) -> "Vector":
+        vector = self._unchecked(list(self.values))
+        if self._cache is not None:
+            vector._cache = {}
+        return vector
+
     def append(self, value: Real) -> None:
+        if isinstance(self.values, memoryview):
+            raise TypeError("Cannot resize a Vector that wraps a buffer")
         self.values.append(value)
+        self._invalidate()
 
     def extend(self, values: Iterable[Real]) -> None:
+        if isinstance(self.values, memoryview):
+            raise TypeError("Cannot resize a Vector that wraps a buffer")
         for v in values:
             self.values.append(v)
-
-    def is_zero_vector(self) -> bool:
+        self._invalidate()
+
+    def enable_caching(self) -> "Vector":
+        """
+        Opt in to memoizing magnitude and normalized direction until the vector is mutated
+        """
+        if self._cache is None:
+            self._cache = {}
+        return self
+
+    def disable_caching(self) -> None:
+        self._cache = None
+
+    def _invalidate(self) -> None:
+        # Mutations swap in a fresh cache dict, dependents holding the old one can detect the change by identity
+        if self._cache is not None:
+            self._cache = {}
+
+    def is_zero_vector(self, exact: bool = False) -> bool:
+        if exact:
+            return not any(self.values)
         return all(isclose(i, 0.0, abs_tol=1e-04) for i in self)
 
     def is_unit_vector(self) -> bool:
         return isclose(self._squared_sum(), 1.0, rel_tol=1e-09)
 
     def magnitude(self) -> Real:
-        return sqrt(self._squared_sum())
-
-    def _squared_sum(self):
-        return sum(i ** 2 for i in self)
-
-    def normalize(self) -> "Vector":
+        cache = self._cache
+        if cache is None:
+            return sqrt(self._squared_sum())
+        mag = cache.get("magnitude")
+        if mag is None:
+            mag = cache["magnitude"] = sqrt(self._squared_sum())
+        return mag
+
+    def _unit_values(self) -> Tuple[Real]:
+        cache = self._cache
+        if cache is not None:
+            unit = cache.get("unit")
+            if unit is not None:
+                return unit
         mag = self.magnitude()
-        return Vector(i / mag for i in self)
+        unit = tuple(i / mag for i in self.values)
+        if cache is not None:
+            cache["unit"] = unit
+        return unit
+
+    def _unit_dot(self, other: "Vector") -> Real:
+        u, v = self._unit_values(), other._unit_values()
+        if len(u) != len(v):
+            raise InvalidSizeError(f"Cannot multiply vectors of size {len(self)} and {len(other)}")
+        return sum(i * j for i, j in zip(u, v))
 
-    def scale(self, factor: Real) -> "Vector":
-        return Vector(i * factor for i in self)
+    def _squared_sum(self):
+        v = self.values
+        if len(v) == 3:
+            return v[0] * v[0] + v[1] * v[1] + v[2] * v[2]
+        return sum(i * i for i in v)
+
+    def normalize(self, out: Optional["Vector"] = None) -> "Vector":
+        unit = self._unit_values()
+        if out is None:
+            return Vector._unchecked(list(unit))
+        target = out._out_values(len(unit))
+        for idx, i in enumerate(unit):
+            target[idx] = i
+        return out
+
+    def scale(self, factor: Real, out: Optional["Vector"] = None) -> "Vector":
+        if out is None:
+            return Vector._unchecked([i * factor for i in self.values])
+        target = out._out_values(len(self.values))
+        for idx, i in enumerate(self.values):
+            target[idx] = i * factor
+        return out
+
+    def axpy(self, a: Real, y: "Vector", out: Optional["Vector"] = None) -> "Vector":
+        """
+        Fused a * self + y in a single pass, written into out when given. out=y updates y in place.
+        """
+        if not isinstance(y, Vector):
+            raise TypeError(f"Cannot add instances of type {type(y)} and {type(self)}")
+        u, v = self.values, y.values
+        if len(u) != len(v):
+            raise InvalidSizeError(f"Cannot add vectors of size {len(self)} and {len(y)}")
+        if out is None:
+            if len(u) == 3:
+                return y._unchecked([a * u[0] + v[0], a * u[1] + v[1], a * u[2] + v[2]])
+            return y._unchecked([a * i + j for i, j in zip(u, v)])
+        target = out._out_values(len(u))
+        for idx, i in enumerate(u):
+            target[idx] = a * i + v[idx]
+        return out
+
+    def _out_values(self, size: int) -> List[Real]:
+        # Storage of an out= target, which may be one of the operands itself
+        if size != len(self.values):
+            raise InvalidSizeError(f"Cannot write a result of size {size} into a vector of size {len(self)}")
+        self._invalidate()
+        return self.values
 
     def angle(self, other: "Vector") -> Real:
         return acos(self.dot(other) / self.magnitude() * other.magnitude())
 
     def dot(self, other: "Vector") -> Real:
-        return sum(self * other)
+        if not isinstance(other, Vector):
+            raise TypeError(f"Cannot multiply instances of type {type(other)} and {type(self)}")
+        a, b = self.values, other.values
+        if len(a) != len(b):
+            raise InvalidSizeError(f"Cannot multiply vectors of size {len(self)} and {len(other)}")
+        if len(a) == 3:
+            return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
+        return sum(i * j for i, j in zip(a, b))
 
-    def cross(self, other: "Vector") -> "Vector":
+    def cross(self, other: "Vector", out: Optional["Vector"] = None) -> "Vector":
         size_self, size_other = len(self), len(other)
         if not 1 < size_self < 4 or not 1 < size_other < 4:
             raise InvalidSizeError(f"Cross product of vector with size {len(self)} and {len(other)} is undefined!")
 
-        u = self.copy()
-        v = other.copy()
+        u, v = self.values, other.values
         if size_self < size_other:
-            u.append(0)
+            u = [*u, 0]
         elif size_self > size_other:
-            v.append(0)
+            v = [*v, 0]
 
         if len(u) == 2:
             u0, u1 = u
             v0, v1 = v
-            return Vector([u0 * v1 - u1 * v0])
-        else:
-            u0, u1, u2 = u
-            v0, v1, v2 = v
-            return Vector([u1 * v2 - u2 * v1, u2 * v0 - u0 * v2, u0 * v1 - u1 * v0])
+            if out is None:
+                return Vector._unchecked([u0 * v1 - u1 * v0])
+            out._out_values(1)[0] = u0 * v1 - u1 * v0
+            return out
+
+        u0, u1, u2 = u
+        v0, v1, v2 = v
+        if out is None:
+            return Vector._unchecked([u1 * v2 - u2 * v1, u2 * v0 - u0 * v2, u0 * v1 - u1 * v0])
+        target = out._out_values(3)
+        target[0], target[1], target[2] = u1 * v2 - u2 * v1, u2 * v0 - u0 * v2, u0 * v1 - u1 * v0
+        return out
 
     def is_parallel(self, other: "Vector") -> bool:
-        v1 = self.normalize()
-        v2 = other.normalize()
-        return isclose(v1.dot(v2), 1.0)
+        return isclose(self._unit_dot(other), 1.0)
 
     def is_antiparallel(self, other: "Vector") -> bool:
-        v1 = self.normalize()
-        v2 = other.normalize()
-        return isclose(v1.dot(v2), -1.0)
+        return isclose(self._unit_dot(other), -1.0)
 
     def is_orthogonal(self, other: "Vector") -> Real:
-        v1 = self.normalize()
-        v2 = other.normalize()
-        return isclose(abs(v1.dot(v2)), 0.0, abs_tol=1e-04)
+        return isclose(abs(self._unit_dot(other)), 0.0, abs_tol=1e-04)
 
     def as_tuple(self) -> Tuple[Real]:
         return tuple(i for i in self)
@@ -167,3 +401,26 @@ class Vector(CopyableMixin):
     @classmethod
     def from_tuple(cls, tup: Tuple[Real]) -> "Vector":
         return cls(tup)
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """
+        Exports the values to numpy. A vector wrapping a buffer, see from_buffer, is exported without a copy
+        when copy is False, a list backed vector is always copied. to_bytes gives the raw float64 values.
+        """
+        if copy is False and not isinstance(self.values, memoryview):
+            raise ValueError(f"A list backed {self.__class__.__name__} cannot be converted without a copy")
+        return np.array(self.values, dtype=np.float64 if dtype is None else dtype, copy=copy)
+
+    def to_bytes(self) -> bytes:
+        if isinstance(self.values, memoryview):
+            return self.values.tobytes()
+        return array("d", self.values).tobytes()
+
+    @classmethod
+    def from_buffer(cls, buffer) -> "Vector":
+        """
+        Wraps a buffer of float64 values or raw bytes without copying, writes to the vector are visible in the
+        buffer and vice versa. The size of the vector is fixed by the buffer. Buffers of other types raise a
+        TypeError, see as_float64_view.
+        """
+        return cls._unchecked(as_float64_view(buffer))
@@ -0,0 +1,257 @@
+# -*- coding : utf-8 -*-
+
+from typing import Generator, Iterable, List, Optional, Union
+
+import numpy as np
+
+from geometry import Quaternion, Vector
+from geometry.error import InvalidSizeError
+from geometry.types import Real
+from geometry.utilities.arrays import as_float64_view
+from geometry.utilities.copyable import CopyableMixin
+
+
+class VectorArray(CopyableMixin):
+    """
+    Container of N vectors of size D stored in one contiguous (N, D) float64 buffer.
+
+    Operations mirror the ones on Vector but act on all rows in one vectorized call.
+    A single Vector or scalar operand is broadcast across every row.
+    """
+
+    # Makes numpy scalars and arrays defer to the reflected operators of this class
+    __array_ufunc__ = None
+
+    # Type of the single rows handed out by indexing and iteration
+    _element = Vector
+
+    def __init__(self, values: Iterable[Iterable[Real]] = ()) -> None:
+        values = np.array(values, dtype=np.float64)
+        if values.ndim == 1 and values.size == 0:
+            values = values.reshape(0, 0)
+        if values.ndim != 2:
+            raise InvalidSizeError(f"values must be two dimensional, got an array with {values.ndim} dimensions")
+        self.values = values
+
+    @classmethod
+    def _wrap(cls, values: np.ndarray) -> "VectorArray":
+        # Trusted constructor for internal use, takes ownership of a (N, D) float64 array without copying
+        obj = cls.__new__(cls)
+        obj.values = values
+        return obj
+
+    @property
+    def dim(self) -> int:
+        return self.values.shape[1]
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def __len__(self) -> int:
+        return self.values.shape[0]
+
+    def __iter__(self) -> Generator[Vector, None, None]:
+        for row in self.values.tolist():
+            yield self._element._unchecked(row)
+
+    def __getitem__(self, idx: Union[int, slice, np.ndarray]) -> Union[Vector, "VectorArray"]:
+        if isinstance(idx, (slice, list, np.ndarray)):
+            return self._wrap(self.values[idx])
+        return self._element._unchecked(self.values[idx].tolist())
+
+    def __setitem__(self, idx: int, value: Vector) -> None:
+        if len(value) != self.dim:
+            raise InvalidSizeError(f"Cannot assign a vector of size {len(value)} to a VectorArray of dim {self.dim}")
+        self.values[idx] = list(value)
+
+    def copy(self) -> "VectorArray":
+        return self._wrap(self.values.copy())
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}(size={len(self)}, dim={self.dim})"
+
+    def __repr__(self) -> str:
+        return str(self)
+
+    def _operand(self, other: Union["VectorArray", Vector, Real], operation: str) -> Union[np.ndarray, Real]:
+        if isinstance(other, (int, float)):
+            return other
+        if isinstance(other, VectorArray):
+            if other.shape != self.shape:
+                raise InvalidSizeError(f"Cannot {operation} VectorArrays of shape {self.shape} and {other.shape}")
+            return other.values
+        if isinstance(other, Vector):
+            if len(other) != self.dim:
+                raise InvalidSizeError(f"Cannot {operation} a VectorArray of dim {self.dim} and a vector of size "
+                                       f"{len(other)}")
+            return np.asarray(other.values, dtype=np.float64)
+        raise TypeError(f"Cannot {operation} instances of type {type(other)} and {type(self)}")
+
+    def __neg__(self) -> "VectorArray":
+        return self._wrap(-self.values)
+
+    def __add__(self, other: Union["VectorArray", Vector]) -> "VectorArray":
+        return self._wrap(self.values + self._operand(other, "add"))
+
+    def __sub__(self, other: Union["VectorArray", Vector]) -> "VectorArray":
+        return self._wrap(self.values - self._operand(other, "subtract"))
+
+    def __mul__(self, other: Union["VectorArray", Vector]) -> "VectorArray":
+        return self._wrap(self.values * self._operand(other, "multiply"))
+
+    def __truediv__(self, other: Union["VectorArray", Vector]) -> "VectorArray":
+        return self._wrap(self.values / self._operand(other, "divide"))
+
+    def __radd__(self, other: Union[Vector, Real]) -> "VectorArray":
+        return self._wrap(self._operand(other, "add") + self.values)
+
+    def __rsub__(self, other: Union[Vector, Real]) -> "VectorArray":
+        return self._wrap(self._operand(other, "subtract") - self.values)
+
+    def __rmul__(self, other: Union[Vector, Real]) -> "VectorArray":
+        return self._wrap(self._operand(other, "multiply") * self.values)
+
+    def __rtruediv__(self, other: Union[Vector, Real]) -> "VectorArray":
+        return self._wrap(self._operand(other, "divide") / self.values)
+
+    def __iadd__(self, other: Union["VectorArray", Vector, Real]) -> "VectorArray":
+        self.values += self._operand(other, "add")
+        return self
+
+    def __isub__(self, other: Union["VectorArray", Vector, Real]) -> "VectorArray":
+        self.values -= self._operand(other, "subtract")
+        return self
+
+    def __imul__(self, other: Union["VectorArray", Vector, Real]) -> "VectorArray":
+        self.values *= self._operand(other, "multiply")
+        return self
+
+    def __itruediv__(self, other: Union["VectorArray", Vector, Real]) -> "VectorArray":
+        self.values /= self._operand(other, "divide")
+        return self
+
+    def __eq__(self, other: "VectorArray") -> bool:
+        if not isinstance(other, VectorArray):
+            raise TypeError(f"Cannot compare instances of type {type(other)} and {type(self)}")
+        if other.shape != self.shape:
+            raise InvalidSizeError(f"Cannot compare VectorArrays of shape {self.shape} and {other.shape}")
+        return bool(np.allclose(self.values, other.values, rtol=1e-09, atol=1e-04))
+
+    __hash__ = None
+
+    def magnitude(self) -> np.ndarray:
+        return np.sqrt(self._squared_sum())
+
+    def _squared_sum(self) -> np.ndarray:
+        return np.einsum("ij,ij->i", self.values, self.values)
+
+    def normalize(self) -> "VectorArray":
+        mag = self.magnitude()
+        if not mag.all():
+            raise ZeroDivisionError("Cannot normalize a VectorArray containing zero vectors")
+        return VectorArray._wrap(self.values / mag[:, None])
+
+    def scale(self, factor: Union[Real, Iterable[Real]]) -> "VectorArray":
+        factor = np.asarray(factor, dtype=np.float64)
+        if factor.ndim == 1:
+            if factor.shape[0] != len(self):
+                raise InvalidSizeError(f"Cannot scale a VectorArray of size {len(self)} by {factor.shape[0]} factors")
+            factor = factor[:, None]
+        return VectorArray._wrap(self.values * factor)
+
+    def axpy(self, a: Real, y: Union["VectorArray", Vector], out: Optional["VectorArray"] = None) -> "VectorArray":
+        """
+        Fused a * self + y, written into out when given. out=y updates y in place.
+        """
+        y_values = self._operand(y, "add")
+        if out is None:
+            result = self.values * a
+            result += y_values
+            return self._wrap(result)
+        if out.shape != self.shape:
+            raise InvalidSizeError(f"Cannot write a result of shape {self.shape} into a VectorArray of shape "
+                                   f"{out.shape}")
+        if out is y:
+            out.values += a * self.values
+        else:
+            np.multiply(self.values, a, out=out.values)
+            out.values += y_values
+        return out
+
+    def dot(self, other: Union["VectorArray", Vector]) -> np.ndarray:
+        other = self._operand(other, "dot")
+        if other.ndim == 1:
+            return self.values @ other
+        return np.einsum("ij,ij->i", self.values, other)
+
+    def cross(self, other: Union["VectorArray", Vector]) -> "VectorArray":
+        if isinstance(other, Vector):
+            other_values = np.asarray(other.values, dtype=np.float64)[None, :]
+        elif isinstance(other, VectorArray):
+            if len(other) != len(self):
+                raise InvalidSizeError(f"Cannot cross VectorArrays of size {len(self)} and {len(other)}")
+            other_values = other.values
+        else:
+            raise TypeError(f"Cannot cross instances of type {type(other)} and {type(self)}")
+
+        size_self, size_other = self.dim, other_values.shape[1]
+        if not 1 < size_self < 4 or not 1 < size_other < 4:
+            raise InvalidSizeError(f"Cross product of vector with size {size_self} and {size_other} is undefined!")
+
+        u, v = self.values, other_values
+        if size_self == size_other == 2:
+            return VectorArray._wrap((u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0])[:, None])
+        if size_self == 2:
+            u = np.pad(u, ((0, 0), (0, 1)))
+        elif size_other == 2:
+            v = np.pad(v, ((0, 0), (0, 1)))
+        return VectorArray._wrap(np.cross(u, v))
+
+    def rotate(self, q: Quaternion, out: Optional["VectorArray"] = None) -> "VectorArray":
+        """
+        Rotates every row by the quaternion q, which is converted to a rotation matrix once so that the whole
+        array costs a single matrix multiply. The result keeps the type of self and is written into out when
+        given, out=self rotates in place.
+        """
+        if self.dim != 3:
+            raise InvalidSizeError(f"Cannot rotate vectors of size {self.dim}")
+        rotation = q.to_rotation_matrix().T
+        if out is None:
+            return self._wrap(self.values @ rotation)
+        if out.shape != self.shape:
+            raise InvalidSizeError(f"Cannot write a result of shape {self.shape} into a VectorArray of shape "
+                                   f"{out.shape}")
+        np.matmul(self.values, rotation, out=out.values)
+        return out
+
+    def rotate_around_axis(self, axis: Vector, angle: Real, out: Optional["VectorArray"] = None) -> "VectorArray":
+        """
+        Rotates every row by angle, in radians, counter-clockwise around axis through the origin, see rotate
+        """
+        return self.rotate(Quaternion.from_axis_angle(axis, angle), out=out)
+
+    @property
+    def __array_interface__(self) -> dict:
+        # Shares the underlying buffer, numpy keeps this container alive as the base of the resulting array
+        return self.values.__array_interface__
+
+    def to_bytes(self) -> bytes:
+        return self.values.tobytes()
+
+    @classmethod
+    def from_buffer(cls, buffer, dim: int) -> "VectorArray":
+        """
+        Wraps a buffer of float64 values or raw bytes as an (N, dim) array without copying
+        """
+        values = np.frombuffer(as_float64_view(buffer), dtype=np.float64)
+        if values.size % dim:
+            raise InvalidSizeError(f"buffer of {values.size} values cannot be split into vectors of size {dim}")
+        return cls._wrap(values.reshape(-1, dim))
+
+    def to_vectors(self) -> List[Vector]:
+        return [self._element._unchecked(row) for row in self.values.tolist()]
+
+    @classmethod
+    def from_vectors(cls, vectors: Iterable[Vector]) -> "VectorArray":
+        return cls([v.values for v in vectors])
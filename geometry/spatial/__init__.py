@@ -0,0 +1,9 @@
+# -*- coding : utf-8 -*-
+
+# init in geometry.spatial package
+
+from geometry.spatial.bvh import BVH
+from geometry.spatial.kdtree import KDTree
+from geometry.spatial.octree import Octree
+
+__all__ = ["BVH", "KDTree", "Octree"]
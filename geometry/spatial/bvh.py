@@ -0,0 +1,393 @@
+# -*- coding : utf-8 -*-
+
+from typing import Callable, Iterable, Optional, Tuple
+
+import numpy as np
+
+from geometry.error import InvalidSizeError
+from geometry.types import Real
+from geometry.utilities.arrays import as_query_array, as_segment_array
+from geometry.utilities.distance import _closest_on_triangles, _project
+from geometry.utilities.intersection import _ray_segments, _ray_triangles
+from geometry.utilities.predicates import _broadcast
+
+# Upper bound on the number of coordinates gathered at once while scanning leaves
+_CHUNK_VALUES = 1 << 21
+
+# Number of rays traced together, bounds the size of the traversal frontier
+_RAY_BATCH = 1 << 16
+
+
+class BVH:
+    """
+    Bounding volume hierarchy of axis-aligned boxes over line segments or triangles.
+
+    primitives is an (N, 2, D) array of segment end points or an (N, 3, 3) array of triangle corners, see
+    from_segments and from_polygons for building one from shapes. The tree is built by splitting every node
+    at the median centroid along its widest axis until it holds at most leaf_size primitives, queries only
+    descend into the boxes that can still contain an answer, which takes O(log n) on average.
+
+    Like KDTree, batches of queries are answered together by processing every level of the tree for all
+    (query, node) pairs at once. owner maps every primitive to the shape it was taken from.
+
+    Moving geometry is handled by refit, which keeps the tree and only recomputes the boxes in O(n). The
+    queries stay exact after a refit but become slower when primitives move far from their neighbours.
+    """
+
+    def __init__(self, primitives, leaf_size: int = 4, owner: Optional[Iterable[int]] = None) -> None:
+        if leaf_size < 1:
+            raise ValueError("leaf_size must be positive")
+        primitives = np.array(primitives, dtype=np.float64)
+        if primitives.ndim != 3 or primitives.shape[1] not in (2, 3):
+            raise InvalidSizeError(f"primitives must have shape (N, 2, D) or (N, 3, 3), got {primitives.shape}")
+        if primitives.shape[1] == 3 and primitives.shape[2] != 3:
+            raise InvalidSizeError("triangles must have 3 coordinates")
+        if not len(primitives):
+            raise ValueError("Cannot build a BVH without primitives")
+        self.primitives = primitives
+        self.leaf_size = leaf_size
+        self.owner = np.arange(len(primitives)) if owner is None else np.array(owner, dtype=np.intp)
+        self._source: Optional[Callable[[], np.ndarray]] = None
+        self._build()
+
+    @classmethod
+    def from_segments(cls, segments, leaf_size: int = 4) -> "BVH":
+        """
+        BVH over an iterable of LineSegments or an (N, 2, D) array of end points. A BVH built from
+        LineSegments reads their end points again on refit().
+        """
+        values = as_segment_array(segments)
+        bvh = cls(values, leaf_size)
+        if not isinstance(segments, np.ndarray):
+            segments = list(segments)
+            bvh._source = lambda: as_segment_array(segments)
+        return bvh
+
+    @classmethod
+    def from_polygons(cls, polygons, faces: bool = False, leaf_size: int = 4) -> "BVH":
+        """
+        BVH over the edges of Polygons, or over their faces split into triangles when faces is set. owner
+        holds the index of the polygon of every primitive, refit() reads the vertices again.
+        """
+        polygons = list(polygons)
+        owner, corners = [], []
+        for i, polygon in enumerate(polygons):
+            n = len(polygon.vertices)
+            if faces:
+                triples = polygon.triangulate()
+            else:
+                triples = [(k, (k + 1) % n) for k in range(n)] if n > 1 else []
+            owner.extend([i] * len(triples))
+            corners.extend(triples)
+
+        def source() -> np.ndarray:
+            values = np.empty((len(corners), 3 if faces else 2, 3))
+            for row, (polygon, triple) in enumerate(zip(owner, corners)):
+                vertices = polygons[polygon].vertices
+                values[row] = [vertices[k].values for k in triple]
+            return values
+
+        bvh = cls(source(), leaf_size, owner)
+        bvh._source = source
+        return bvh
+
+    def __len__(self) -> int:
+        return len(self.primitives)
+
+    @property
+    def dim(self) -> int:
+        return self.primitives.shape[2]
+
+    @property
+    def is_triangles(self) -> bool:
+        return self.primitives.shape[1] == 3
+
+    def _build(self) -> None:
+        centroids = self.primitives.mean(axis=1)
+        indices = np.arange(len(self.primitives))
+        start, end, left, right, depth = [0], [len(indices)], [-1], [-1], [0]
+
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            lo, hi = start[node], end[node]
+            if hi - lo <= self.leaf_size:
+                continue
+            idx = indices[lo:hi]
+            c = centroids[idx]
+            spread = c.max(axis=0) - c.min(axis=0)
+            axis = int(np.argmax(spread))
+            if spread[axis] == 0:
+                # All centroids coincide, the node stays a leaf
+                continue
+            mid = (hi - lo) // 2
+            indices[lo:hi] = idx[np.argpartition(c[:, axis], mid)]
+            for child_lo, child_hi in ((lo, lo + mid), (lo + mid, hi)):
+                start.append(child_lo)
+                end.append(child_hi)
+                left.append(-1)
+                right.append(-1)
+                depth.append(depth[node] + 1)
+                stack.append(len(start) - 1)
+            left[node], right[node] = len(start) - 2, len(start) - 1
+
+        self._left = np.array(left, dtype=np.intp)
+        self._right = np.array(right, dtype=np.intp)
+        depth = np.array(depth, dtype=np.intp)
+        inner = np.nonzero(self._left >= 0)[0]
+        # Inner nodes grouped by depth, deepest first, so that refit can merge child boxes level by level
+        self._depth = int(depth.max())
+        self._levels = [inner[depth[inner] == d] for d in range(self._depth - 1, -1, -1)]
+
+        leaves = np.nonzero(self._left < 0)[0]
+        self._leaves = leaves
+        self._leaf_of = np.full(len(left), -1, dtype=np.intp)
+        self._leaf_of[leaves] = np.arange(len(leaves))
+        width = max(end[n] - start[n] for n in leaves)
+        # Padded leaf blocks, the padding points to the last primitive and is masked by _leaf_valid
+        self._leaf_ids = np.full((len(leaves), width), -1, dtype=np.intp)
+        for i, n in enumerate(leaves):
+            self._leaf_ids[i, :end[n] - start[n]] = indices[start[n]:end[n]]
+        self._leaf_valid = self._leaf_ids >= 0
+        self._leaf_ids[~self._leaf_valid] = len(self.primitives) - 1
+
+        self.lower = np.empty((len(left), self.dim))
+        self.upper = np.empty((len(left), self.dim))
+        self._fit()
+
+    def _fit(self) -> None:
+        lower = np.where(self._leaf_valid[:, :, None], self.primitives.min(axis=1)[self._leaf_ids], np.inf)
+        upper = np.where(self._leaf_valid[:, :, None], self.primitives.max(axis=1)[self._leaf_ids], -np.inf)
+        self.lower[self._leaves] = lower.min(axis=1)
+        self.upper[self._leaves] = upper.max(axis=1)
+        for nodes in self._levels:
+            self.lower[nodes] = np.minimum(self.lower[self._left[nodes]], self.lower[self._right[nodes]])
+            self.upper[nodes] = np.maximum(self.upper[self._left[nodes]], self.upper[self._right[nodes]])
+
+    def refit(self, primitives=None) -> None:
+        """
+        Updates the boxes after the primitives moved, keeping the tree. primitives is the new array of the
+        same shape, when omitted the shapes a BVH was built from are read again.
+        """
+        if primitives is None:
+            if self._source is None:
+                raise ValueError("This BVH was built from an array, pass the moved primitives to refit")
+            primitives = self._source()
+        primitives = np.array(primitives, dtype=np.float64)
+        if primitives.shape != self.primitives.shape:
+            raise InvalidSizeError(f"Cannot refit primitives of shape {self.primitives.shape} with {primitives.shape}")
+        self.primitives = primitives
+        self._fit()
+
+    def _box_distances(self, points: np.ndarray, node: np.ndarray) -> np.ndarray:
+        # Squared distances of points to the boxes of node, zero inside
+        gap = np.maximum(self.lower[node] - points, 0.0) + np.maximum(points - self.upper[node], 0.0)
+        return np.einsum("ij,ij->i", gap, gap)
+
+    def _scan(self, node: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        # Primitive indices and validity of the (pair, width) leaf blocks of node
+        leaf = self._leaf_of[node]
+        return self._leaf_ids[leaf], self._leaf_valid[leaf]
+
+    def _chunks(self, size: int) -> Iterable[slice]:
+        width = self._leaf_ids.shape[1]
+        step = max(1, _CHUNK_VALUES // (width * self.primitives.shape[1] * self.dim))
+        for lo in range(0, size, step):
+            yield slice(lo, lo + step)
+
+    @staticmethod
+    def _keep_best(q: np.ndarray, value: np.ndarray, ids: np.ndarray, best: np.ndarray, best_i: np.ndarray
+                   ) -> None:
+        # Lowers best[q] to the smallest candidate value of every query in q and records its primitive
+        order = np.lexsort((value, q))
+        q, value, ids = q[order], value[order], ids[order]
+        first = np.ones(len(q), dtype=bool)
+        first[1:] = q[1:] != q[:-1]
+        q, value, ids = q[first], value[first], ids[first]
+        better = value < best[q]
+        best[q[better]] = value[better]
+        best_i[q[better]] = ids[better]
+
+    def _distances(self, points: np.ndarray, ids: np.ndarray) -> np.ndarray:
+        corners = self.primitives[ids]
+        if self.is_triangles:
+            return _closest_on_triangles(points, corners[:, 0], corners[:, 1], corners[:, 2])[1]
+        return _project(points, corners[:, 0], corners[:, 1] - corners[:, 0], clamp=True)[2]
+
+    def _scan_nearest(self, queries: np.ndarray, q: np.ndarray, node: np.ndarray, best: np.ndarray,
+                      best_i: np.ndarray) -> None:
+        for part in self._chunks(len(q)):
+            ids, valid = self._scan(node[part])
+            rows = np.broadcast_to(q[part, None], ids.shape)[valid]
+            ids = ids[valid]
+            self._keep_best(rows, self._distances(queries[rows], ids), ids, best, best_i)
+
+    def nearest(self, points) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """
+        Returns the distances to, the indices of and the closest points on the nearest primitives, as a
+        scalar, an index and a point for a single query point and as arrays for a batch
+        """
+        queries, single = as_query_array(points, self.dim)
+        m = len(queries)
+        best = np.full(m, np.inf)
+        best_i = np.full(m, -1, dtype=np.intp)
+
+        # Greedy descent into the nearer child gives a tight initial bound for pruning the rest of the tree
+        home = np.zeros(m, dtype=np.intp)
+        active = np.nonzero(self._left[home] >= 0)[0]
+        while active.size:
+            n = home[active]
+            a, b = self._left[n], self._right[n]
+            nearer_left = self._box_distances(queries[active], a) <= self._box_distances(queries[active], b)
+            home[active] = np.where(nearer_left, a, b)
+            active = active[self._left[home[active]] >= 0]
+        self._scan_nearest(queries, np.arange(m), home, best, best_i)
+
+        q = np.arange(m)
+        node = np.zeros(m, dtype=np.intp)
+        while q.size:
+            keep = self._box_distances(queries[q], node) <= best[q] * best[q]
+            q, node = q[keep], node[keep]
+            is_leaf = self._left[node] < 0
+            visit = is_leaf & (node != home[q])
+            self._scan_nearest(queries, q[visit], node[visit], best, best_i)
+            inner = ~is_leaf
+            q = np.concatenate((q[inner], q[inner]))
+            node = np.concatenate((self._left[node[inner]], self._right[node[inner]]))
+
+        corners = self.primitives[best_i]
+        if self.is_triangles:
+            closest = _closest_on_triangles(queries, corners[:, 0], corners[:, 1], corners[:, 2])[0]
+        else:
+            closest = _project(queries, corners[:, 0], corners[:, 1] - corners[:, 0], clamp=True)[0]
+        if single:
+            return best[0], best_i[0], closest[0]
+        return best, best_i, closest
+
+    def _slab(self, origins: np.ndarray, inverse: np.ndarray, node: np.ndarray, pad: Real
+              ) -> Tuple[np.ndarray, np.ndarray]:
+        # Parameter interval in which each ray crosses the padded box of its node, empty when t_near > t_far.
+        # inverse holds the reciprocal directions, a ray parallel to a slab gets an infinite interval inside
+        # of it and an empty one outside, NaN from an origin on the slab boundary is skipped by fmax and fmin.
+        lower, upper = self.lower[node], self.upper[node]
+        if pad:
+            lower, upper = lower - pad, upper + pad
+        with np.errstate(invalid="ignore"):
+            t1 = (lower - origins) * inverse
+            t2 = (upper - origins) * inverse
+        t_min, t_max = np.minimum(t1, t2), np.maximum(t1, t2)
+        t_near, t_far = t_min[:, 0], t_max[:, 0]
+        for k in range(1, self.dim):
+            t_near = np.fmax(t_near, t_min[:, k])
+            t_far = np.fmin(t_far, t_max[:, k])
+        return t_near, t_far
+
+    def _hits(self, origins: np.ndarray, directions: np.ndarray, ids: np.ndarray, abs_tol: Real) -> np.ndarray:
+        corners = self.primitives[ids]
+        if self.is_triangles:
+            return _ray_triangles(origins, directions, corners[:, 0], corners[:, 1], corners[:, 2])[0]
+        return _ray_segments(origins, directions, corners[:, 0], corners[:, 1], abs_tol)
+
+    def _trace(self, origins: np.ndarray, directions: np.ndarray, best: np.ndarray, best_i: np.ndarray,
+               abs_tol: Real) -> None:
+        # Lowers best to the first hit of every ray, best holds the largest admissible t on entry. Every ray
+        # walks the tree depth first with its own stack, nearer child first, so that the boxes behind its
+        # first hit are skipped. Each round pops one node for all rays that still have one.
+        pad = 0.0 if self.is_triangles else abs_tol
+        m = len(origins)
+        stack = np.empty((m, self._depth + 2), dtype=np.intp)
+        entry = np.empty((m, self._depth + 2))
+        size = np.zeros(m, dtype=np.intp)
+        with np.errstate(divide="ignore"):
+            inverse = 1.0 / directions
+
+        def push(q: np.ndarray, node: np.ndarray, t_near: np.ndarray, t_far: np.ndarray) -> None:
+            hit = (t_near <= t_far) & (t_far >= 0) & (t_near <= best[q])
+            q = q[hit]
+            stack[q, size[q]] = node[hit]
+            entry[q, size[q]] = t_near[hit]
+            size[q] += 1
+
+        q = np.arange(m)
+        root = np.zeros(m, dtype=np.intp)
+        push(q, root, *self._slab(origins, inverse, root, pad))
+        q = q[size > 0]
+        while q.size:
+            size[q] -= 1
+            node, t_near = stack[q, size[q]], entry[q, size[q]]
+            keep = t_near <= best[q]
+            p, node = q[keep], node[keep]
+            is_leaf = self._left[node] < 0
+
+            leaf_q = p[is_leaf]
+            if leaf_q.size:
+                ids, valid = self._scan(node[is_leaf])
+                rows = np.broadcast_to(leaf_q[:, None], ids.shape)
+                t = np.full(ids.shape, np.inf)
+                t[valid] = self._hits(origins[rows[valid]], directions[rows[valid]], ids[valid], abs_tol)
+                col = np.argmin(t, axis=1)
+                t = t[np.arange(len(t)), col]
+                better = t < best[leaf_q]
+                best[leaf_q[better]] = t[better]
+                best_i[leaf_q[better]] = ids[better, col[better]]
+
+            inner_q, inner = p[~is_leaf], node[~is_leaf]
+            if inner_q.size:
+                o, inv = origins[inner_q], inverse[inner_q]
+                a, b = self._left[inner], self._right[inner]
+                near_a, far_a = self._slab(o, inv, a, pad)
+                near_b, far_b = self._slab(o, inv, b, pad)
+                # The farther child goes first so that the nearer one is popped next
+                a_first = near_a > near_b
+                push(inner_q, np.where(a_first, a, b), np.where(a_first, near_a, near_b),
+                     np.where(a_first, far_a, far_b))
+                push(inner_q, np.where(a_first, b, a), np.where(a_first, near_b, near_a),
+                     np.where(a_first, far_b, far_a))
+            q = q[size[q] > 0]
+
+    def first_hit(self, origins, directions, max_distance: Real = np.inf, abs_tol: Real = 1e-09
+                  ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Casts the rays origins + t * directions, t >= 0, and returns the parameter t of the first primitive
+        each ray hits and its index, inf and -1 for rays that hit nothing up to max_distance. t is measured
+        in multiples of directions, so it is the distance for unit directions. A single origin or direction
+        is broadcast against a batch. Segments count as hit when a ray passes within abs_tol of them.
+        """
+        (origins, directions), single = _broadcast(origins, directions)
+        if origins.shape[1] != self.dim:
+            raise InvalidSizeError(f"rays must have {self.dim} coordinates, got {origins.shape[1]}")
+        origins, directions = np.broadcast_arrays(origins, directions)
+        if not np.einsum("ij,ij->i", directions, directions).all():
+            raise ValueError("directions must not contain zero vectors")
+        m = len(origins)
+        best = np.full(m, float(max_distance))
+        best_i = np.full(m, -1, dtype=np.intp)
+        for lo in range(0, m, _RAY_BATCH):
+            part = slice(lo, lo + _RAY_BATCH)
+            self._trace(origins[part], directions[part], best[part], best_i[part], abs_tol)
+        best[best_i < 0] = np.inf
+        if single:
+            return best[0], best_i[0]
+        return best, best_i
+
+    def query_box(self, lower, upper) -> np.ndarray:
+        """
+        Returns the sorted indices of the primitives whose bounding boxes overlap the box from lower to upper
+        """
+        lower = np.asarray(getattr(lower, "values", lower), dtype=np.float64)
+        upper = np.asarray(getattr(upper, "values", upper), dtype=np.float64)
+        if lower.shape != (self.dim,) or upper.shape != (self.dim,):
+            raise InvalidSizeError(f"box corners must have {self.dim} coordinates")
+        node = np.zeros(1, dtype=np.intp)
+        found = [np.empty(0, dtype=np.intp)]
+        while node.size:
+            node = node[np.all((self.lower[node] <= upper) & (lower <= self.upper[node]), axis=1)]
+            is_leaf = self._left[node] < 0
+            ids, valid = self._scan(node[is_leaf])
+            ids = ids[valid]
+            overlap = np.all((self.primitives[ids].min(axis=1) <= upper) & (lower <= self.primitives[ids].max(axis=1)),
+                             axis=1)
+            found.append(ids[overlap])
+            inner = node[~is_leaf]
+            node = np.concatenate((self._left[inner], self._right[inner]))
+        return np.sort(np.concatenate(found))
@@ -0,0 +1,222 @@
+# -*- coding : utf-8 -*-
+
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from geometry.types import Real
+from geometry.utilities.arrays import as_array, as_query_array
+
+# Upper bound on the number of coordinates gathered at once while scanning leaves
+_CHUNK_VALUES = 1 << 21
+
+
+class KDTree:
+    """
+    KD-tree over a static set of points for nearest neighbour and radius queries.
+
+    Building the tree takes O(n log n): every node is split at the median of the axis with the largest
+    spread until it holds at most leaf_size points. A query only visits the subtrees whose region is
+    closer than the current search radius, which takes O(log n) on average.
+
+    Points can be given as a PointCloud or VectorArray, an (N, D) array or an iterable of Points. Queries
+    accept a single Point or a batch of points. Batches are answered together, every level of the tree is
+    processed for all (query, node) pairs at once so that the work stays vectorized.
+    """
+
+    def __init__(self, points, leaf_size: int = 32) -> None:
+        if leaf_size < 1:
+            raise ValueError("leaf_size must be positive")
+        self.data = np.array(as_array(points), dtype=np.float64)
+        self.leaf_size = leaf_size
+        self._build()
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    @property
+    def dim(self) -> int:
+        return self.data.shape[1]
+
+    def _build(self) -> None:
+        indices = np.arange(len(self.data))
+        start, end, dim, split, left, right = [0], [len(self.data)], [-1], [0.0], [-1], [-1]
+
+        stack = [0]
+        while stack:
+            node = stack.pop()
+            lo, hi = start[node], end[node]
+            if hi - lo <= self.leaf_size:
+                continue
+
+            idx = indices[lo:hi]
+            pts = self.data[idx]
+            spread = pts.max(axis=0) - pts.min(axis=0)
+            axis = int(np.argmax(spread))
+            if spread[axis] == 0:
+                # All points in this node coincide
+                continue
+
+            mid = (hi - lo) // 2
+            order = np.argpartition(pts[:, axis], mid)
+            indices[lo:hi] = idx[order]
+            dim[node] = axis
+            split[node] = float(pts[order[mid], axis])
+            for child_lo, child_hi in ((lo, lo + mid), (lo + mid, hi)):
+                start.append(child_lo)
+                end.append(child_hi)
+                dim.append(-1)
+                split.append(0.0)
+                left.append(-1)
+                right.append(-1)
+                stack.append(len(start) - 1)
+            left[node], right[node] = len(start) - 2, len(start) - 1
+
+        self._dim = np.array(dim, dtype=np.intp)
+        self._split = np.array(split, dtype=np.float64)
+        self._left = np.array(left, dtype=np.intp)
+        self._right = np.array(right, dtype=np.intp)
+
+        # Leaves are stored as padded blocks so that any set of (query, leaf) pairs is scanned in one go,
+        # padding sits at infinity and never matches
+        leaves = np.nonzero(self._dim < 0)[0]
+        self._leaf_of = np.full(len(dim), -1, dtype=np.intp)
+        self._leaf_of[leaves] = np.arange(len(leaves))
+        width = max(1, max((end[n] - start[n] for n in leaves), default=1))
+        self._leaf_ids = np.full((len(leaves), width), -1, dtype=np.intp)
+        self._leaf_points = np.full((len(leaves), width, self.dim), np.inf)
+        for i, n in enumerate(leaves):
+            ids = indices[start[n]:end[n]]
+            self._leaf_ids[i, :len(ids)] = ids
+            self._leaf_points[i, :len(ids)] = self.data[ids]
+
+    def _descend(self, queries: np.ndarray) -> np.ndarray:
+        # Node index of the leaf each query point falls into
+        node = np.zeros(len(queries), dtype=np.intp)
+        active = np.nonzero(self._dim[node] >= 0)[0]
+        while active.size:
+            n = node[active]
+            go_left = queries[active, self._dim[n]] <= self._split[n]
+            node[active] = np.where(go_left, self._left[n], self._right[n])
+            active = active[self._dim[node[active]] >= 0]
+        return node
+
+    def _expand(self, queries: np.ndarray, q: np.ndarray, node: np.ndarray, offset: np.ndarray,
+                lower: np.ndarray, bound: np.ndarray):
+        # Replaces internal (query, node) pairs by their child pairs whose squared distance lower bound,
+        # maintained incrementally from the per-axis offsets, does not exceed bound
+        axis = self._dim[node]
+        diff = queries[q, axis] - self._split[node]
+        near = np.where(diff <= 0, self._left[node], self._right[node])
+        far = np.where(diff <= 0, self._right[node], self._left[node])
+
+        far_lower = lower - offset[np.arange(len(q)), axis] ** 2 + diff * diff
+        reach = far_lower <= bound[q]
+        far_offset = offset[reach].copy()
+        far_offset[np.arange(reach.sum()), axis[reach]] = diff[reach]
+
+        return (np.concatenate((q, q[reach])), np.concatenate((near, far[reach])),
+                np.concatenate((offset, far_offset)), np.concatenate((lower, far_lower[reach])))
+
+    def _scan(self, queries: np.ndarray, q: np.ndarray, node: np.ndarray):
+        # Squared distances (P, width) and point indices of every (query, leaf) pair, in chunks
+        leaf = self._leaf_of[node]
+        width = self._leaf_ids.shape[1]
+        step = max(1, _CHUNK_VALUES // (width * self.dim))
+        for lo in range(0, len(q), step):
+            qs, ls = q[lo:lo + step], leaf[lo:lo + step]
+            diff = queries[qs, None, :] - self._leaf_points[ls]
+            yield qs, np.einsum("ijk,ijk->ij", diff, diff), self._leaf_ids[ls]
+
+    @staticmethod
+    def _merge(q: np.ndarray, d2: np.ndarray, ids: np.ndarray, best_d: np.ndarray, best_i: np.ndarray) -> None:
+        # Keeps the k smallest of the current best and the new candidates for every query in q, sorted
+        k = best_d.shape[1]
+        if d2.shape[1] > k:
+            part = np.argpartition(d2, k - 1, axis=1)[:, :k]
+            d2, ids = np.take_along_axis(d2, part, axis=1), np.take_along_axis(ids, part, axis=1)
+        rows = np.unique(q)
+        all_q = np.concatenate((np.repeat(q, d2.shape[1]), np.repeat(rows, k)))
+        all_d = np.concatenate((d2.ravel(), best_d[rows].ravel()))
+        all_i = np.concatenate((ids.ravel(), best_i[rows].ravel()))
+        order = np.lexsort((all_d, all_q))
+        all_q, all_d, all_i = all_q[order], all_d[order], all_i[order]
+        group_start = np.searchsorted(all_q, all_q, side="left")
+        keep = np.arange(len(all_q)) - group_start < k
+        best_d[rows] = all_d[keep].reshape(-1, k)
+        best_i[rows] = all_i[keep].reshape(-1, k)
+
+    def query(self, points, k: int = 1) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Returns the distances to and the indices of the k nearest points, sorted by distance. The arrays
+        have shape (k,) for a single query point and (M, k) for a batch of M points.
+        """
+        queries, single = as_query_array(points, self.dim)
+        if not 0 < k <= len(self):
+            raise ValueError(f"k must be between 1 and the number of indexed points ({len(self)})")
+
+        m = len(queries)
+        best_d = np.full((m, k), np.inf)
+        best_i = np.full((m, k), -1, dtype=np.intp)
+
+        # The leaf holding the query gives a tight initial bound for pruning the rest of the tree
+        home = self._descend(queries)
+        for qs, d2, ids in self._scan(queries, np.arange(m), home):
+            self._merge(qs, d2, ids, best_d, best_i)
+
+        q = np.arange(m)
+        node = np.zeros(m, dtype=np.intp)
+        offset = np.zeros((m, self.dim))
+        lower = np.zeros(m)
+        while q.size:
+            keep = lower <= best_d[q, -1]
+            q, node, offset, lower = q[keep], node[keep], offset[keep], lower[keep]
+
+            is_leaf = self._dim[node] < 0
+            visit = is_leaf & (node != home[q])
+            for qs, d2, ids in self._scan(queries, q[visit], node[visit]):
+                self._merge(qs, d2, ids, best_d, best_i)
+
+            inner = ~is_leaf
+            q, node, offset, lower = self._expand(queries, q[inner], node[inner], offset[inner], lower[inner],
+                                                  best_d[:, -1])
+
+        distances = np.sqrt(best_d)
+        if single:
+            return distances[0], best_i[0]
+        return distances, best_i
+
+    def query_radius(self, points, r: Real) -> Union[np.ndarray, List[np.ndarray]]:
+        """
+        Returns the sorted indices of all points within distance r, as one array for a single query point
+        and as a list of arrays for a batch
+        """
+        queries, single = as_query_array(points, self.dim)
+        if r < 0:
+            raise ValueError("r must not be negative")
+
+        m = len(queries)
+        bound = np.full(m, float(r) * r)
+        pairs_q, pairs_p = [np.empty(0, dtype=np.intp)], [np.empty(0, dtype=np.intp)]
+
+        q = np.arange(m)
+        node = np.zeros(m, dtype=np.intp)
+        offset = np.zeros((m, self.dim))
+        lower = np.zeros(m)
+        while q.size:
+            is_leaf = self._dim[node] < 0
+            for qs, d2, ids in self._scan(queries, q[is_leaf], node[is_leaf]):
+                rows, cols = np.nonzero(d2 <= bound[0])
+                pairs_q.append(qs[rows])
+                pairs_p.append(ids[rows, cols])
+
+            inner = ~is_leaf
+            q, node, offset, lower = self._expand(queries, q[inner], node[inner], offset[inner], lower[inner],
+                                                  bound)
+
+        pairs_q, pairs_p = np.concatenate(pairs_q), np.concatenate(pairs_p)
+        order = np.lexsort((pairs_p, pairs_q))
+        pairs_q, pairs_p = pairs_q[order], pairs_p[order]
+        bounds = np.searchsorted(pairs_q, np.arange(m + 1))
+        result = [pairs_p[bounds[i]:bounds[i + 1]] for i in range(m)]
+        return result[0] if single else result
@@ -0,0 +1,325 @@
+# -*- coding : utf-8 -*-
+
+from math import isfinite
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from geometry.error import InvalidSizeError
+from geometry.types import Real
+
+Box = Tuple[Tuple[float, ...], Tuple[float, ...]]
+
+_OUTSIDE, _PARTIAL, _INSIDE = 0, 1, 2
+
+
+def _coordinates(point) -> Tuple[float, ...]:
+    values = tuple(float(v) for v in getattr(point, "values", point))
+    if len(values) != 3:
+        raise InvalidSizeError(f"points must have 3 coordinates, got {len(values)}")
+    if not all(isfinite(v) for v in values):
+        raise ValueError("coordinates must be finite")
+    return values
+
+
+def _box(obj, bounds=None) -> Box:
+    # Points are stored as degenerate boxes, other objects through their bounds method
+    if bounds is None:
+        method = getattr(obj, "bounds", None)
+        bounds = method() if method is not None else (obj, obj)
+    lo, hi = (_coordinates(p) for p in bounds)
+    if any(low > high for low, high in zip(lo, hi)):
+        raise ValueError("the minimum corner of a box must not exceed its maximum corner")
+    return lo, hi
+
+
+class _Node:
+
+    __slots__ = ("center", "half", "parent", "items", "children", "count")
+
+    def __init__(self, center: Tuple[float, ...], half: float, parent: Optional["_Node"]) -> None:
+        self.center = center
+        self.half = half
+        self.parent = parent
+        self.items: List[int] = []
+        self.children: Optional[List["_Node"]] = None
+        # Number of items stored in the subtree
+        self.count = 0
+
+    def encloses(self, lo: Sequence[float], hi: Sequence[float]) -> bool:
+        h = self.half
+        return all(c - h <= low and u <= c + h for c, low, u in zip(self.center, lo, hi))
+
+    def octant(self, lo: Sequence[float], hi: Sequence[float]) -> Optional[int]:
+        # Index of the child enclosing the box, None when the box straddles a split plane
+        idx = 0
+        for axis, c in enumerate(self.center):
+            if lo[axis] >= c:
+                idx |= 1 << axis
+            elif hi[axis] > c:
+                return None
+        return idx
+
+    def make_children(self) -> List["_Node"]:
+        h = self.half / 2
+        return [_Node(tuple(c + h if i >> axis & 1 else c - h for axis, c in enumerate(self.center)), h, self)
+                for i in range(8)]
+
+
+class Octree:
+    """
+    Octree over the axis-aligned bounding boxes of Points, LineSegments, Paths, Polygons or any object
+    with a bounds method, for box and frustum range queries.
+
+    Objects are inserted one by one and identified by the handle returned from insert, so moving objects
+    are updated or removed without rebuilding the tree. A node splits into eight octants once it holds
+    more than capacity objects, objects straddling the split planes stay in the node itself, and nodes
+    merge back when removals leave their subtree with at most capacity objects. The root grows to cover
+    objects inserted outside of it. Queries skip every subtree whose cube misses the query region and
+    accept whole subtrees inside of it without testing their objects.
+    """
+
+    def __init__(self, objects: Iterable[Any] = (), capacity: int = 8, max_depth: int = 16,
+                 center: Optional[Sequence[Real]] = None, half_size: Optional[Real] = None) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be positive")
+        self.capacity = capacity
+        self.max_depth = max_depth
+        self._entries: Dict[int, list] = {}
+        self._next = 0
+        self._root: Optional[_Node] = None
+        self._min_half = 0.0
+
+        objects = list(objects)
+        boxes = [_box(obj) for obj in objects]
+        if center is not None or half_size is not None:
+            if center is None or half_size is None or half_size <= 0:
+                raise ValueError("center and a positive half_size must be given together")
+            self._set_root(_coordinates(center), float(half_size))
+        elif boxes:
+            lo = tuple(min(b[0][axis] for b in boxes) for axis in range(3))
+            hi = tuple(max(b[1][axis] for b in boxes) for axis in range(3))
+            self._set_root_around(lo, hi)
+        for obj, (lo, hi) in zip(objects, boxes):
+            self._insert(obj, lo, hi)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, handle: int) -> bool:
+        return handle in self._entries
+
+    def __getitem__(self, handle: int) -> Any:
+        return self._entry(handle)[0]
+
+    def _entry(self, handle: int) -> list:
+        entry = self._entries.get(handle)
+        if entry is None:
+            raise KeyError(f"Unknown handle {handle}")
+        return entry
+
+    def _set_root(self, center: Tuple[float, ...], half: float) -> None:
+        self._root = _Node(center, half, None)
+        # Depth is measured from the initial root, a grown root does not allow deeper splits
+        self._min_half = half / 2 ** self.max_depth
+
+    def _set_root_around(self, lo: Sequence[float], hi: Sequence[float]) -> None:
+        extent = max(u - low for low, u in zip(lo, hi))
+        self._set_root(tuple((low + u) / 2 for low, u in zip(lo, hi)), extent / 2 if extent > 0 else 1.0)
+
+    def _grow(self, lo: Sequence[float], hi: Sequence[float]) -> None:
+        # Doubles the root towards the box, the old root becomes one octant of the new root
+        root = self._root
+        h = root.half
+        center, idx = [], 0
+        for axis, c in enumerate(root.center):
+            if lo[axis] < c - h:
+                center.append(c - h)
+                idx |= 1 << axis
+            else:
+                center.append(c + h)
+        grown = _Node(tuple(center), 2 * h, None)
+        grown.children = grown.make_children()
+        grown.children[idx] = root
+        grown.count = root.count
+        root.parent = grown
+        self._root = grown
+
+    def _insert(self, obj: Any, lo: Tuple[float, ...], hi: Tuple[float, ...]) -> int:
+        handle = self._next
+        self._next += 1
+        entry = [obj, lo, hi, None]
+        self._entries[handle] = entry
+        self._place(handle, entry)
+        return handle
+
+    def _place(self, handle: int, entry: list) -> None:
+        lo, hi = entry[1], entry[2]
+        if self._root is None:
+            self._set_root_around(lo, hi)
+        while not self._root.encloses(lo, hi):
+            self._grow(lo, hi)
+
+        node = self._root
+        while True:
+            node.count += 1
+            if node.children is None:
+                break
+            idx = node.octant(lo, hi)
+            if idx is None:
+                break
+            node = node.children[idx]
+        node.items.append(handle)
+        entry[3] = node
+        if node.children is None and len(node.items) > self.capacity:
+            self._split(node)
+
+    def _split(self, node: _Node) -> None:
+        if node.half <= self._min_half:
+            return
+        entries = self._entries
+        node.children = node.make_children()
+        items, node.items = node.items, []
+        for handle in items:
+            entry = entries[handle]
+            idx = node.octant(entry[1], entry[2])
+            if idx is None:
+                node.items.append(handle)
+                continue
+            child = node.children[idx]
+            child.items.append(handle)
+            child.count += 1
+            entry[3] = child
+        for child in node.children:
+            if len(child.items) > self.capacity:
+                self._split(child)
+
+    def _detach(self, handle: int, entry: list) -> None:
+        node = entry[3]
+        node.items.remove(handle)
+        parent = node
+        while parent is not None:
+            parent.count -= 1
+            parent = parent.parent
+
+        # Merge the largest subtree around node that fits into a single node again
+        target = None
+        parent = node if node.children is not None else node.parent
+        while parent is not None and parent.count <= self.capacity:
+            target = parent
+            parent = parent.parent
+        if target is not None:
+            items, stack = [], list(target.children)
+            while stack:
+                child = stack.pop()
+                items.extend(child.items)
+                if child.children is not None:
+                    stack.extend(child.children)
+            for h in items:
+                self._entries[h][3] = target
+            target.items.extend(items)
+            target.children = None
+
+    def insert(self, obj: Any, bounds: Optional[Tuple[Any, Any]] = None) -> int:
+        """
+        Adds obj and returns its handle. The box is taken from bounds, given as minimum and maximum corner,
+        from obj.bounds() or from the coordinates of a Point.
+        """
+        lo, hi = _box(obj, bounds)
+        return self._insert(obj, lo, hi)
+
+    def remove(self, handle: int) -> Any:
+        """
+        Removes the object with handle from the tree and returns it
+        """
+        entry = self._entry(handle)
+        self._detach(handle, entry)
+        del self._entries[handle]
+        return entry[0]
+
+    def update(self, handle: int, bounds: Optional[Tuple[Any, Any]] = None) -> None:
+        """
+        Moves the object with handle to its current box, call it after the object was mutated
+        """
+        entry = self._entry(handle)
+        lo, hi = _box(entry[0], bounds)
+        node = entry[3]
+        if node.children is None and node.encloses(lo, hi):
+            entry[1], entry[2] = lo, hi
+            return
+        self._detach(handle, entry)
+        entry[1], entry[2] = lo, hi
+        self._place(handle, entry)
+
+    def _search(self, classify: Callable[[_Node], int], overlaps: Callable[..., bool]) -> List[Any]:
+        if self._root is None:
+            return []
+        entries = self._entries
+        found = []
+        stack = [(self._root, False)]
+        while stack:
+            node, inside = stack.pop()
+            if not inside:
+                state = classify(node)
+                if state == _OUTSIDE:
+                    continue
+                inside = state == _INSIDE
+            if inside:
+                found.extend(node.items)
+            else:
+                found.extend(h for h in node.items if overlaps(entries[h][1], entries[h][2]))
+            if node.children is not None:
+                stack.extend((child, inside) for child in node.children if child.count)
+        found.sort()
+        return [entries[h][0] for h in found]
+
+    def query_box(self, lo, hi) -> List[Any]:
+        """
+        Returns the objects whose bounding boxes intersect the box between the corners lo and hi, in
+        insertion order
+        """
+        lo, hi = _box(None, (lo, hi))
+
+        def classify(node: _Node) -> int:
+            h = node.half
+            state = _INSIDE
+            for c, low, u in zip(node.center, lo, hi):
+                if c + h < low or c - h > u:
+                    return _OUTSIDE
+                if c - h < low or c + h > u:
+                    state = _PARTIAL
+            return state
+
+        def overlaps(box_lo, box_hi) -> bool:
+            return all(bl <= u and low <= bu for bl, bu, low, u in zip(box_lo, box_hi, lo, hi))
+
+        return self._search(classify, overlaps)
+
+    def query_frustum(self, planes: Iterable[Tuple[Any, Real]]) -> List[Any]:
+        """
+        Returns the objects whose bounding boxes are not entirely outside of the convex region bounded by
+        planes, in insertion order. Every plane is a pair (normal, offset) and point p is on its inner side
+        when normal . p + offset >= 0. Like any box based culling the result is conservative, boxes near an
+        edge of the region may be reported even though they lie outside of it.
+        """
+        planes = [(_coordinates(normal), float(offset)) for normal, offset in planes]
+        extents = [sum(abs(n) for n in normal) for normal, _ in planes]
+
+        def classify(node: _Node) -> int:
+            state = _INSIDE
+            for (normal, offset), extent in zip(planes, extents):
+                s = sum(n * c for n, c in zip(normal, node.center)) + offset
+                r = node.half * extent
+                if s + r < 0:
+                    return _OUTSIDE
+                if s - r < 0:
+                    state = _PARTIAL
+            return state
+
+        def overlaps(box_lo, box_hi) -> bool:
+            for normal, offset in planes:
+                # The corner of the box furthest along the normal decides
+                s = sum(n * (u if n > 0 else low) for n, low, u in zip(normal, box_lo, box_hi))
+                if s + offset < 0:
+                    return False
+            return True
+
+        return self._search(classify, overlaps)
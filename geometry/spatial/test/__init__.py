@@ -0,0 +1,3 @@
+# -*- coding : utf-8 -*-
+
+# init in geometry.spatial.test package
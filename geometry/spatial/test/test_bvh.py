@@ -0,0 +1,169 @@
+# -*- coding : utf-8 -*-
+
+import numpy as np
+import pytest
+
+from geometry import LineSegment, Point
+from geometry.error import InvalidSizeError
+from geometry.object.polygon import Polygon
+from geometry.spatial import BVH
+from geometry.utilities.distance import _closest_on_triangles, project_onto_segments
+from geometry.utilities.intersection import _ray_segments, _ray_triangles
+
+
+@pytest.fixture
+def segments():
+    rng = np.random.default_rng(11)
+    starts = rng.random((500, 3)) * 10
+    return np.stack((starts, starts + rng.normal(size=(500, 3))), axis=1)
+
+
+@pytest.fixture
+def triangles():
+    rng = np.random.default_rng(13)
+    centers = rng.random((400, 1, 3)) * 10
+    return centers + rng.normal(size=(400, 3, 3))
+
+
+def repeat(values, n):
+    return np.repeat(np.asarray(values, dtype=np.float64)[None], n, axis=0)
+
+
+def test_bvh_generation(segments, triangles):
+    bvh = BVH(segments, leaf_size=8)
+    assert len(bvh) == 500 and bvh.dim == 3 and not bvh.is_triangles
+    assert np.all(bvh.lower[0] <= segments.min(axis=(0, 1))) and np.all(bvh.upper[0] >= segments.max(axis=(0, 1)))
+    assert BVH(triangles).is_triangles
+
+    with pytest.raises(ValueError):
+        BVH(segments, leaf_size=0)
+    with pytest.raises(ValueError):
+        BVH(np.empty((0, 2, 3)))
+    with pytest.raises(InvalidSizeError):
+        BVH(np.zeros((4, 3, 2)))
+
+
+def test_bvh_nearest_segments(segments):
+    bvh = BVH(segments)
+    queries = np.random.default_rng(3).random((100, 3)) * 12 - 1
+    distances, indices, closest = bvh.nearest(queries)
+    for query, d, i, c in zip(queries, distances, indices, closest):
+        _, _, reference = project_onto_segments(query, segments[:, 0], segments[:, 1])
+        assert np.isclose(d, reference.min()) and np.isclose(reference[i], d)
+        assert np.isclose(np.linalg.norm(c - query), d)
+
+    d, i, _ = bvh.nearest(Point(*segments[42, 0]))
+    assert d == 0 and i == 42
+
+
+def test_bvh_nearest_triangles(triangles):
+    bvh = BVH(triangles, leaf_size=2)
+    queries = np.random.default_rng(5).random((100, 3)) * 12 - 1
+    distances, indices, _ = bvh.nearest(queries)
+    for query, d, i in zip(queries, distances, indices):
+        _, reference = _closest_on_triangles(repeat(query, 400), triangles[:, 0], triangles[:, 1], triangles[:, 2])
+        assert np.isclose(d, reference.min()) and np.isclose(reference[i], d)
+
+
+def test_bvh_first_hit(segments, triangles):
+    rng = np.random.default_rng(7)
+    origins = rng.random((200, 3)) * 10
+    directions = rng.normal(size=(200, 3))
+
+    bvh = BVH(triangles)
+    t, indices = bvh.first_hit(origins, directions)
+    for o, d, ti, i in zip(origins, directions, t, indices):
+        reference = _ray_triangles(repeat(o, 400), repeat(d, 400), triangles[:, 0], triangles[:, 1],
+                                   triangles[:, 2])[0]
+        assert ti == reference.min() and (i == -1 if np.isinf(ti) else reference[i] == ti)
+    assert np.isfinite(t).any() and np.isinf(t).any()
+
+    # Axis aligned rays on a lattice start on box boundaries and run along slabs
+    planar = np.round(segments[:, :, :2])
+    bvh = BVH(planar)
+    origins = np.round(origins[:, :2])
+    directions = np.eye(2)[rng.integers(0, 2, 200)] * rng.choice([-1, 1], (200, 1))
+    t, indices = bvh.first_hit(origins, directions)
+    for o, d, ti in zip(origins, directions, t):
+        assert ti == _ray_segments(repeat(o, 500), repeat(d, 500), planar[:, 0], planar[:, 1]).min()
+
+    t, i = bvh.first_hit(origins, directions, max_distance=0.5)
+    assert np.all(t <= 0.5) and np.all((i == -1) == np.isinf(t))
+
+    with pytest.raises(ValueError):
+        bvh.first_hit(origins, (0, 0))
+
+
+def test_bvh_first_hit_single():
+    bvh = BVH.from_segments([LineSegment(Point(0, 0, 0), Point(0, 2, 0)), LineSegment(Point(3, 0, 0), Point(3, 2, 0))])
+    assert bvh.first_hit(Point(-1, 1, 0), (1, 0, 0)) == (1, 0)
+    assert bvh.first_hit(Point(1, 1, 0), (1, 0, 0)) == (2, 1)
+    assert bvh.first_hit(Point(1, 1, 0), (0, 0, 1))[1] == -1
+
+
+def test_bvh_query_box(segments):
+    bvh = BVH(segments)
+    lower, upper = np.array([2.0, 3.0, 4.0]), np.array([5.0, 5.0, 6.0])
+    reference = np.nonzero(np.all((segments.min(axis=1) <= upper) & (segments.max(axis=1) >= lower), axis=1))[0]
+    assert np.array_equal(bvh.query_box(Point(*lower), upper), reference)
+    assert bvh.query_box((20, 20, 20), (30, 30, 30)).size == 0
+
+
+def test_bvh_refit(segments):
+    bvh = BVH(segments)
+    moved = segments + np.random.default_rng(9).normal(size=segments.shape)
+    bvh.refit(moved)
+    queries = np.random.default_rng(1).random((50, 3)) * 10
+    distances, _, _ = bvh.nearest(queries)
+    for query, d in zip(queries, distances):
+        assert np.isclose(d, project_onto_segments(query, moved[:, 0], moved[:, 1])[2].min())
+
+    with pytest.raises(ValueError):
+        bvh.refit()
+    with pytest.raises(InvalidSizeError):
+        bvh.refit(segments[:10])
+
+    lines = [LineSegment(Point(0, 0, 0), Point(1, 0, 0)), LineSegment(Point(5, 0, 0), Point(6, 0, 0))]
+    bvh = BVH.from_segments(lines)
+    lines[1].a = Point(0, 1, 0)
+    lines[1].b = Point(1, 1, 0)
+    bvh.refit()
+    assert bvh.nearest(Point(0.5, 0.9, 0))[1] == 1
+
+
+def test_bvh_from_polygons():
+    square = Polygon([Point(0, 0, 0), Point(2, 0, 0), Point(2, 2, 0), Point(0, 2, 0)])
+    notch = Polygon([Point(0, 0, 5), Point(4, 0, 5), Point(4, 4, 5), Point(2, 1, 5), Point(0, 4, 5)])
+
+    edges = BVH.from_polygons([square, notch])
+    assert len(edges) == 9 and np.array_equal(edges.owner, [0] * 4 + [1] * 5)
+    t, i = edges.first_hit(Point(1, 1, 0), [(1, 0, 0), (-1, 0, 0), (0, 1, 0), (0, 0, 1)])
+    assert np.array_equal(t, [1, 1, 1, np.inf]) and np.all(edges.owner[i[:3]] == 0)
+
+    faces = BVH.from_polygons([square, notch], faces=True)
+    assert len(faces) == 5 and np.array_equal(faces.owner, [0, 0, 1, 1, 1])
+    t, i = faces.first_hit([(1, 1, -1), (2, 2, 6), (2, 0.5, 6)], (0, 0, 1))
+    assert t[0] == 1 and faces.owner[i[0]] == 0
+    assert np.isinf(t[1]) and np.isinf(t[2])
+    t, i = faces.first_hit((2, 0.5, 6), (0, 0, -1))
+    assert t == 1 and faces.owner[i] == 1
+
+    notch.vertices[3] = Point(2, 3, 5)
+    faces.refit()
+    assert faces.first_hit((2, 2, 6), (0, 0, -1))[0] == 1
+
+
+def test_polygon_triangulate():
+    square = Polygon([Point(0, 0, 0), Point(0, 2, 0), Point(2, 2, 0), Point(2, 0, 0)])
+    assert len(square.triangulate()) == 2
+
+    # A comb with three teeth is not convex, every triangle has to lie inside of it
+    outline = [(0, 0), (5, 0), (5, 3), (4, 3), (4, 1), (3, 1), (3, 3), (2, 3), (2, 1), (1, 1), (1, 3), (0, 3)]
+    comb = Polygon([Point(x, y, 0) for x, y in outline])
+    triangles = comb.triangulate()
+    assert len(triangles) == 10
+    corners = np.array([[comb.vertices[k].values for k in triangle] for triangle in triangles])
+    area = np.cross(corners[:, 1] - corners[:, 0], corners[:, 2] - corners[:, 0])[:, 2]
+    assert np.all(area > 0) and np.isclose(area.sum() / 2, 11)
+
+    assert Polygon([Point(0, 0, 0), Point(1, 1, 1), Point(2, 2, 2)]).triangulate() == []
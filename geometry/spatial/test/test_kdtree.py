@@ -0,0 +1,73 @@
+# -*- coding : utf-8 -*-
+
+import numpy as np
+import pytest
+
+from geometry import Point, PointCloud
+from geometry.spatial import KDTree
+
+
+@pytest.fixture
+def cloud():
+    rng = np.random.default_rng(7)
+    return PointCloud(rng.random((2000, 3)))
+
+
+def brute_force(data, query):
+    return np.sqrt(((data - query) ** 2).sum(axis=1))
+
+
+def test_kdtree_generation(cloud):
+    tree = KDTree(cloud)
+    assert len(tree) == 2000 and tree.dim == 3
+
+    tree = KDTree([Point(0, 0, 0), Point(1, 1, 1)])
+    assert len(tree) == 2
+
+    with pytest.raises(ValueError):
+        KDTree(cloud, leaf_size=0)
+
+
+def test_kdtree_nearest(cloud):
+    tree = KDTree(cloud, leaf_size=8)
+    query = Point(0.5, 0.25, 0.75)
+    distances, indices = tree.query(query, k=5)
+
+    reference = brute_force(cloud.values, query.values)
+    assert np.array_equal(indices, np.argsort(reference)[:5])
+    assert np.allclose(distances, np.sort(reference)[:5])
+
+    d, i = tree.query(cloud[17])
+    assert i[0] == 17 and d[0] == 0
+
+    with pytest.raises(ValueError):
+        tree.query(query, k=2001)
+
+
+def test_kdtree_nearest_batch(cloud):
+    tree = KDTree(cloud.values)
+    queries = np.random.default_rng(3).random((100, 3)) * 1.2 - 0.1
+    distances, indices = tree.query(queries, k=3)
+    assert distances.shape == indices.shape == (100, 3)
+
+    for query, d, i in zip(queries, distances, indices):
+        reference = brute_force(cloud.values, query)
+        assert np.array_equal(i, np.argsort(reference)[:3])
+        assert np.allclose(d, np.sort(reference)[:3])
+
+
+def test_kdtree_radius(cloud):
+    tree = KDTree(cloud)
+    queries = np.random.default_rng(5).random((50, 3))
+    result = tree.query_radius(queries, 0.1)
+    assert len(result) == 50
+    for query, indices in zip(queries, result):
+        assert np.array_equal(indices, np.nonzero(brute_force(cloud.values, query) <= 0.1)[0])
+
+    assert np.array_equal(tree.query_radius(cloud[3], 0.0), [3])
+
+
+def test_kdtree_duplicates():
+    tree = KDTree(np.zeros((50, 3)), leaf_size=4)
+    assert len(tree.query_radius(Point(0, 0, 0), 0.01)) == 50
+    assert np.allclose(tree.query(Point(1, 0, 0), k=4)[0], 1)
@@ -0,0 +1,117 @@
+# -*- coding : utf-8 -*-
+
+import numpy as np
+import pytest
+
+from geometry import LineSegment, Point
+from geometry.object.path import Path
+from geometry.object.polygon import Polygon
+from geometry.spatial import Octree
+
+
+def random_objects(rng, n):
+    objects = []
+    for i in range(n):
+        a = Point(*rng.uniform(-10, 10, 3).tolist())
+        if i % 3 == 0:
+            objects.append(a)
+        elif i % 3 == 1:
+            objects.append(LineSegment(a, Point(*(a.values + rng.uniform(-1, 1, 3)).tolist())))
+        else:
+            objects.append(Polygon([Point(*(a.values + rng.uniform(-1, 1, 3)).tolist()) for _ in range(4)]))
+    return objects
+
+
+def box_of(obj):
+    if isinstance(obj, Point):
+        return np.array(obj.values), np.array(obj.values)
+    lo, hi = obj.bounds()
+    return np.array(lo.values), np.array(hi.values)
+
+
+def brute_box(objects, lo, hi):
+    return [o for o in objects if np.all(box_of(o)[0] <= hi) and np.all(lo <= box_of(o)[1])]
+
+
+def check_counts(node):
+    total = len(node.items)
+    for child in node.children or ():
+        assert child.parent is node
+        total += check_counts(child)
+    assert total == node.count
+    return total
+
+
+def test_bounds():
+    segment = LineSegment(Point(1, -2, 3), Point(-1, 2, 0))
+    assert segment.bounds() == (Point(-1, -2, 0), Point(1, 2, 3))
+    path = Path([Point(0, 0, 0), Point(2, -1, 0), Point(1, 1, 5)])
+    assert path.bounds() == (Point(0, -1, 0), Point(2, 1, 5))
+    assert Polygon(path.points).bounds() == path.bounds()
+    with pytest.raises(ValueError):
+        Point.bounding_box([])
+
+
+def test_octree_query_box():
+    rng = np.random.default_rng(2)
+    objects = random_objects(rng, 600)
+    tree = Octree(objects, capacity=4)
+    assert len(tree) == 600
+    check_counts(tree._root)
+
+    for _ in range(30):
+        lo = rng.uniform(-12, 8, 3)
+        hi = lo + rng.uniform(0, 6, 3)
+        expected = brute_box(objects, lo, hi)
+        assert tree.query_box(Point(*lo.tolist()), tuple(hi)) == expected
+
+    assert tree.query_box((-100, -100, -100), (100, 100, 100)) == objects
+    assert tree.query_box((50, 50, 50), (60, 60, 60)) == []
+
+
+def test_octree_query_frustum():
+    rng = np.random.default_rng(4)
+    points = [Point(*p) for p in rng.uniform(-10, 10, (500, 3)).tolist()]
+    tree = Octree(points, capacity=8)
+
+    # Pyramid with its apex at the origin, opening towards +z
+    planes = [((0, 1, 1), 0), ((0, -1, 1), 0), ((1, 0, 1), 0), ((-1, 0, 1), 0), ((0, 0, -1), 8)]
+    expected = [p for p in points if abs(p.x) <= p.z and abs(p.y) <= p.z and p.z <= 8]
+    assert tree.query_frustum(planes) == expected
+
+    segment = LineSegment(Point(-1, -1, -1), Point(1, 1, 1))
+    handle = tree.insert(segment)
+    assert any(o is segment for o in tree.query_frustum(planes)) and tree[handle] is segment
+
+
+def test_octree_incremental():
+    rng = np.random.default_rng(6)
+    objects = random_objects(rng, 300)
+    tree = Octree(capacity=4)
+    handles = [tree.insert(o) for o in objects]
+    check_counts(tree._root)
+
+    # Moving points, including far outside of the current root
+    for h in handles[::3][:40]:
+        point = tree[h]
+        point.translate(*rng.uniform(-30, 30, 3).tolist())
+        tree.update(h)
+    check_counts(tree._root)
+    lo, hi = np.full(3, -5.0), np.full(3, 25.0)
+    assert tree.query_box(lo, hi) == brute_box(objects, lo, hi)
+
+    removed = [tree.remove(h) for h in handles[:250]]
+    assert removed == objects[:250] and len(tree) == 50
+    assert handles[0] not in tree
+    check_counts(tree._root)
+    assert tree.query_box((-100, -100, -100), (100, 100, 100)) == objects[250:]
+
+    with pytest.raises(KeyError):
+        tree.remove(handles[0])
+    with pytest.raises(ValueError):
+        tree.insert(Point(float("inf"), 0, 0))
+
+    tree = Octree(center=(0, 0, 0), half_size=1, capacity=1, max_depth=3)
+    for _ in range(20):
+        tree.insert(Point(0.1, 0.1, 0.1))
+    assert len(tree.query_box((0, 0, 0), (0.2, 0.2, 0.2))) == 20
@@ -1,5 +1,6 @@
 # -*- coding : utf-8 -*-
 
+from enum import IntEnum
 from typing import List, Union
 
 # Type definitions
@@ -7,3 +8,13 @@ Real = Union[int, float]
 RealList = List[Real]
 
 # Enums
+
+
+class IntersectionStatus(IntEnum):
+    """
+    Relation between two lines as reported by the intersection kernels
+    """
+    INTERSECTING = 0
+    PARALLEL = 1
+    SKEW = 2
+    COINCIDENT = 3
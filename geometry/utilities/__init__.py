@@ -2,6 +2,18 @@
 
 # init in geometry.utilities package
 
-from geometry.utilities.compare import round_compare, all_equal
+from geometry.utilities.compare import round_compare, all_equal, all_unique, unique_points, group_points
+from geometry.utilities.spatial_hash import SpatialHash
+from geometry.utilities.distance import (pairwise_distances, iter_distance_blocks, nearest_distances, min_distances,
+                                         argmin_distances, count_within, project_onto_lines, project_onto_segments,
+                                         nearest_segments)
+from geometry.utilities.predicates import (collinear, signed_area, orientation, orient2d, orient3d,
+                                           incircle)
+from geometry.utilities.intersection import intersect_lines, cast_rays
+from geometry.utilities.sweep import segment_intersections
 
-__all__ = ["round_compare", "all_equal"]
+__all__ = ["round_compare", "all_equal", "all_unique", "unique_points", "group_points", "SpatialHash",
+           "pairwise_distances", "iter_distance_blocks", "nearest_distances", "min_distances", "argmin_distances",
+           "count_within", "project_onto_lines", "project_onto_segments", "nearest_segments", "collinear",
+           "signed_area", "orientation", "orient2d", "orient3d", "incircle", "intersect_lines",
+           "cast_rays", "segment_intersections"]
@@ -0,0 +1,77 @@
+# -*- coding : utf-8 -*-
+
+from typing import Iterable, Optional, Tuple, Union
+
+import numpy as np
+
+from geometry.error import InvalidSizeError
+
+
+def as_array(points: Union[Iterable, np.ndarray], dim: Optional[int] = None) -> np.ndarray:
+    """
+    Utility function for viewing a batch of points as an (N, D) float64 array. Accepts array backed
+    containers, numpy arrays and iterables of Points, Vectors or tuples. Array input is not copied.
+    """
+    values = getattr(points, "values", None)
+    if isinstance(values, np.ndarray):
+        array = values
+    elif isinstance(points, np.ndarray):
+        array = np.asarray(points, dtype=np.float64)
+    else:
+        array = np.array([getattr(p, "values", p) for p in points], dtype=np.float64)
+
+    if array.ndim == 1 and array.size == 0:
+        array = array.reshape(0, 3 if dim is None else dim)
+    if array.ndim != 2:
+        raise InvalidSizeError(f"points must be two dimensional, got an array with {array.ndim} dimensions")
+    if dim is not None and array.shape[1] != dim:
+        raise InvalidSizeError(f"points must have {dim} coordinates, got {array.shape[1]}")
+    return array
+
+
+def as_float64_view(buffer) -> memoryview:
+    """
+    Utility function for viewing a buffer as a flat memoryview of float64 values without copying. Accepts
+    buffers of float64 values and untyped byte buffers like bytes and bytearray. Buffers of other types are
+    rejected instead of having their bytes reinterpreted, convert them to float64 first.
+    """
+    values = memoryview(buffer)
+    if values.format not in ("d", "B", "c"):
+        raise TypeError(f"buffer must hold float64 values or raw bytes, got format {values.format!r}")
+    if values.format == "d" and values.ndim == 1:
+        return values
+    if values.nbytes % 8:
+        raise ValueError(f"buffer of {values.nbytes} bytes does not hold a whole number of float64 values")
+    return values.cast("B").cast("d")
+
+
+def as_query_array(points, dim: Optional[int] = None) -> Tuple[np.ndarray, bool]:
+    """
+    Utility function like as_array which also accepts a single Vector, Point or one dimensional array,
+    returns the (N, D) array and whether a single point was given
+    """
+    # Imported here since geometry.object depends on this package
+    from geometry.object.vector import Vector
+
+    if isinstance(points, Vector):
+        return as_array([points], dim), True
+    if isinstance(points, np.ndarray) and points.ndim == 1:
+        return as_array(points[None, :], dim), True
+    return as_array(points, dim), False
+
+
+def as_segment_array(segments, dims: Tuple[int, ...] = (2, 3)) -> np.ndarray:
+    """
+    Utility function for viewing a batch of segments as an (N, 2, D) float64 array of end points. Accepts
+    numpy arrays, iterables of LineSegments and iterables of end point pairs. Array input is not copied.
+    """
+    if isinstance(segments, np.ndarray):
+        values = np.asarray(segments, dtype=np.float64)
+    else:
+        values = np.array([(s.a.values, s.b.values) if hasattr(s, "a") else s for s in segments],
+                          dtype=np.float64)
+    if values.size == 0:
+        values = values.reshape(0, 2, dims[0])
+    if values.ndim != 3 or values.shape[1] != 2 or values.shape[2] not in dims:
+        raise InvalidSizeError(f"segments must have shape (N, 2, D) with D in {dims}, got {values.shape}")
+    return values
@@ -1,7 +1,8 @@
 # -*- coding : utf-8 -*-
 
 from geometry.types import Real
-from typing import Iterable
+from geometry.utilities.spatial_hash import SpatialHash
+from typing import Iterable, List, Sequence
 
 
 def round_compare(a: Real, b: Real, precision: int = 4) -> bool:
@@ -34,6 +35,16 @@ def all_unique(iterable: Iterable):
     """
     Utility function for checking if all the elements are unique
     """
+    # Imported here since geometry.object depends on this package
+    from geometry.object.vector import Vector
+
+    if not isinstance(iterable, (list, tuple)):
+        iterable = list(iterable)
+    if iterable and all(isinstance(i, Vector) for i in iterable):
+        # Vectors compare with a tolerance, so their hashes cannot be relied upon for uniqueness
+        index = SpatialHash.for_points(iterable)
+        return all(index.insert(i)[1] for i in iterable)
+
     try:
         seen = set()
         return not any(i in seen or seen.add(i) for i in iterable)
@@ -41,3 +52,28 @@ def all_unique(iterable: Iterable):
         # Exception handling for unhashable types
         seen = list()
         return not any(i in seen or seen.append(i) for i in iterable)
+
+
+def unique_points(points: Sequence[Iterable[Real]], abs_tol: Real = 1e-04, rel_tol: Real = 1e-09) -> List:
+    """
+    Utility function for removing near-duplicate points, keeps the first of every group of points that
+    compare equal with the tolerances of Point.__eq__. Runs in expected O(n).
+    """
+    index = SpatialHash.for_points(points, abs_tol, rel_tol)
+    return [p for p in points if index.insert(p)[1]]
+
+
+def group_points(points: Sequence[Iterable[Real]], abs_tol: Real = 1e-04, rel_tol: Real = 1e-09) -> List[List[int]]:
+    """
+    Utility function for grouping the indices of near-duplicate points. Every point joins the group of the
+    first earlier point it compares equal to. Runs in expected O(n).
+    """
+    index = SpatialHash.for_points(points, abs_tol, rel_tol)
+    groups = []
+    for i, p in enumerate(points):
+        representative, inserted = index.insert(p)
+        if inserted:
+            groups.append([i])
+        else:
+            groups[representative].append(i)
+    return groups
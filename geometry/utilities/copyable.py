@@ -1,9 +1,23 @@
 # -*- coding : utf-8 -*-
 
-from copy import deepcopy
-
 
 class CopyableMixin:
+    """
+    Mixin for objects that know how to copy themselves.
+
+    Subclasses implement copy() as a flat structural copy of their own state, which avoids the memo
+    bookkeeping and reflection of copy.deepcopy. The copy module hooks are routed to it as well.
+    """
+
+    __slots__ = ()
 
     def copy(self):
-        return deepcopy(self)
+        raise NotImplementedError(f"{self.__class__.__name__} does not implement copy()")
+
+    def __copy__(self):
+        return self.copy()
+
+    def __deepcopy__(self, memo):
+        result = self.copy()
+        memo[id(self)] = result
+        return result
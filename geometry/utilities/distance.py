@@ -0,0 +1,223 @@
+# -*- coding : utf-8 -*-
+
+from typing import Generator, Optional, Tuple
+
+import numpy as np
+
+from geometry.error import InvalidSizeError
+from geometry.types import Real
+from geometry.utilities.arrays import as_array
+from geometry.utilities.predicates import _broadcast
+
+# Default cap on the memory used for distance blocks, 64 MiB
+DEFAULT_MAX_BYTES = 1 << 26
+
+
+def _block_rows(n_cols: int, max_bytes: int) -> int:
+    # A block needs its float64 result plus one temporary of the same size
+    return max(1, max_bytes // (16 * max(1, n_cols)))
+
+
+def iter_distance_blocks(a, b=None, max_bytes: int = DEFAULT_MAX_BYTES, squared: bool = False
+                         ) -> Generator[Tuple[int, np.ndarray], None, None]:
+    """
+    Utility function for streaming the distance matrix between the points of a and b in row blocks. Yields
+    the index of the first row and a (rows, len(b)) block, every block stays within max_bytes.
+    """
+    a = as_array(a)
+    b = a if b is None else as_array(b, a.shape[1])
+    step = _block_rows(len(b), max_bytes)
+    for start in range(0, len(a), step):
+        rows = a[start:start + step]
+        # Accumulating coordinate differences keeps small distances exact, unlike the |a|^2 + |b|^2 - 2 a.b
+        # expansion, while never holding more than two (rows, len(b)) arrays
+        block = np.zeros((len(rows), len(b)))
+        temp = np.empty_like(block)
+        for axis in range(a.shape[1]):
+            np.subtract(rows[:, axis, None], b[None, :, axis], out=temp)
+            temp *= temp
+            block += temp
+        if not squared:
+            np.sqrt(block, out=block)
+        yield start, block
+
+
+def pairwise_distances(a, b=None, max_bytes: int = DEFAULT_MAX_BYTES) -> np.ndarray:
+    """
+    Utility function for the dense (len(a), len(b)) distance matrix between the points of a and b, or among
+    the points of a when b is omitted. Raises ValueError when the matrix exceeds max_bytes, use
+    iter_distance_blocks or the reductions in this module for large inputs.
+    """
+    a = as_array(a)
+    b = None if b is None else as_array(b)
+    n_rows = len(a)
+    n_cols = n_rows if b is None else len(b)
+    if n_rows * n_cols * 8 > max_bytes:
+        raise ValueError(f"A {n_rows}x{n_cols} distance matrix exceeds max_bytes={max_bytes}")
+
+    result = np.empty((n_rows, n_cols))
+    for start, block in iter_distance_blocks(a, b, max_bytes=max_bytes):
+        result[start:start + len(block)] = block
+    return result
+
+
+def nearest_distances(a, b=None, max_bytes: int = DEFAULT_MAX_BYTES, exclude_self: Optional[bool] = None
+                      ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Utility function for the distance to and the index of the nearest point of b for every point of a,
+    without building the full distance matrix. When b is omitted the nearest other point of a is found.
+    """
+    if exclude_self is None:
+        exclude_self = b is None
+    a = as_array(a)
+    b = None if b is None else as_array(b)
+    n_rows = len(a)
+    distances = np.full(n_rows, np.inf)
+    indices = np.full(n_rows, -1, dtype=np.intp)
+    for start, block in iter_distance_blocks(a, b, max_bytes=max_bytes, squared=True):
+        rows = np.arange(len(block))
+        if exclude_self:
+            block[rows, rows + start] = np.inf
+        if block.shape[1]:
+            idx = np.argmin(block, axis=1)
+            distances[start:start + len(block)] = block[rows, idx]
+            indices[start:start + len(block)] = idx
+    return np.sqrt(distances), indices
+
+
+def min_distances(a, b=None, max_bytes: int = DEFAULT_MAX_BYTES) -> np.ndarray:
+    """
+    Utility function for the distance from every point of a to its nearest point of b
+    """
+    return nearest_distances(a, b, max_bytes)[0]
+
+
+def argmin_distances(a, b=None, max_bytes: int = DEFAULT_MAX_BYTES) -> np.ndarray:
+    """
+    Utility function for the index of the nearest point of b for every point of a
+    """
+    return nearest_distances(a, b, max_bytes)[1]
+
+
+def count_within(a, b=None, threshold: Real = 0.01, max_bytes: int = DEFAULT_MAX_BYTES) -> np.ndarray:
+    """
+    Utility function for the number of points of b within threshold of every point of a. When b is omitted
+    every point of a counts itself.
+    """
+    a = as_array(a)
+    b = None if b is None else as_array(b)
+    counts = np.zeros(len(a), dtype=np.intp)
+    limit = threshold * threshold
+    for start, block in iter_distance_blocks(a, b, max_bytes=max_bytes, squared=True):
+        counts[start:start + len(block)] = np.count_nonzero(block <= limit, axis=1)
+    return counts
+
+
+def _project(points: np.ndarray, origins: np.ndarray, directions: np.ndarray, clamp: bool
+             ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Closest points origins + t * directions to points, t is clamped to [0, 1] for segments
+    w = points - origins
+    directions = np.broadcast_to(directions, w.shape)
+    length = np.einsum("ij,ij->i", directions, directions)
+    t = np.einsum("ij,ij->i", w, directions)
+    t = np.divide(t, length, out=np.zeros_like(t), where=length > 0)
+    if clamp:
+        np.clip(t, 0.0, 1.0, out=t)
+    closest = origins + t[:, None] * directions
+    diff = points - closest
+    return closest, t, np.sqrt(np.einsum("ij,ij->i", diff, diff))
+
+
+def _closest_on_triangles(points: np.ndarray, a: np.ndarray, b: np.ndarray, c: np.ndarray
+                          ) -> Tuple[np.ndarray, np.ndarray]:
+    # Closest points of the triangles abc to points row by row and their distances. The projection onto the
+    # plane wins when it falls inside the triangle, otherwise the nearest of the three edges does.
+    closest, _, distances = _project(points, a, b - a, clamp=True)
+    for start, end in ((b, c), (c, a)):
+        edge_closest, _, edge_distances = _project(points, start, end - start, clamp=True)
+        nearer = edge_distances < distances
+        closest[nearer] = edge_closest[nearer]
+        distances[nearer] = edge_distances[nearer]
+
+    n = np.cross(b - a, c - a)
+    nn = np.einsum("ij,ij->i", n, n)
+    height = np.divide(np.einsum("ij,ij->i", points - a, n), nn, out=np.zeros_like(nn), where=nn > 0)
+    projected = points - height[:, None] * n
+    inside = nn > 0
+    for start, end in ((a, b), (b, c), (c, a)):
+        inside &= np.einsum("ij,ij->i", np.cross(end - start, projected - start), n) >= 0
+    closest[inside] = projected[inside]
+    distances[inside] = np.abs(height[inside]) * np.sqrt(nn[inside])
+    return closest, distances
+
+
+def project_onto_lines(points, origins, directions) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Utility function for the orthogonal projection of points onto the lines origins + t * directions, row by
+    row. Any argument may be a single point or vector, e.g. many points onto one line.
+
+    Returns the (N, D) closest points, the (N,) line parameters t and the (N,) distances.
+    """
+    (points, origins, directions), _ = _broadcast(points, origins, directions)
+    if not np.einsum("ij,ij->i", directions, directions).all():
+        raise ValueError("directions must not contain zero vectors")
+    return _project(*np.broadcast_arrays(points, origins), directions, clamp=False)
+
+
+def project_onto_segments(points, starts, ends) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Utility function for the closest points of the segments from starts to ends to points, row by row. Any
+    argument may be a single point, e.g. many points onto one segment.
+
+    Returns the (N, D) closest points, the (N,) parameters t in [0, 1] along each segment and the (N,)
+    distances. Degenerate segments project everything onto their start.
+    """
+    (points, starts, ends), _ = _broadcast(points, starts, ends)
+    return _project(*np.broadcast_arrays(points, starts), ends - starts, clamp=True)
+
+
+def nearest_segments(points, starts, ends, max_bytes: int = DEFAULT_MAX_BYTES
+                     ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Utility function for matching every point to its nearest segment among the segments from starts[j] to
+    ends[j], evaluated in row blocks that stay within max_bytes.
+
+    Returns the (N,) indices of the nearest segments and, like project_onto_segments, the closest points,
+    parameters and distances on them.
+    """
+    points = as_array(points)
+    starts = as_array(starts, points.shape[1])
+    ends = as_array(ends, points.shape[1])
+    if len(starts) != len(ends):
+        raise InvalidSizeError(f"Cannot pair {len(starts)} segment starts with {len(ends)} ends")
+    if not len(starts):
+        raise ValueError("Cannot match points to an empty set of segments")
+    directions = ends - starts
+    length = np.einsum("ij,ij->i", directions, directions)
+    inverse = np.divide(1.0, length, out=np.zeros_like(length), where=length > 0)
+
+    indices = np.empty(len(points), dtype=np.intp)
+    # A block needs the parameters, the squared distances and one temporary
+    step = max(1, max_bytes // (24 * len(starts)))
+    for start in range(0, len(points), step):
+        rows = points[start:start + step]
+        t = np.zeros((len(rows), len(starts)))
+        temp = np.empty_like(t)
+        for axis in range(points.shape[1]):
+            np.subtract(rows[:, axis, None], starts[None, :, axis], out=temp)
+            temp *= directions[None, :, axis]
+            t += temp
+        t *= inverse
+        np.clip(t, 0.0, 1.0, out=t)
+        # Accumulating coordinate differences keeps small distances exact, see iter_distance_blocks
+        squared = np.zeros_like(t)
+        for axis in range(points.shape[1]):
+            np.multiply(t, directions[None, :, axis], out=temp)
+            temp += starts[None, :, axis]
+            np.subtract(rows[:, axis, None], temp, out=temp)
+            temp *= temp
+            squared += temp
+        indices[start:start + len(rows)] = np.argmin(squared, axis=1)
+
+    closest, t, distances = _project(points, starts[indices], directions[indices], clamp=True)
+    return indices, closest, t, distances
@@ -0,0 +1,222 @@
+# -*- coding : utf-8 -*-
+
+from math import sqrt
+from typing import List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from geometry.error import InvalidSizeError
+from geometry.types import IntersectionStatus, Real
+from geometry.utilities.distance import DEFAULT_MAX_BYTES
+from geometry.utilities.predicates import _broadcast
+
+# Lines whose directions enclose an angle with a squared sine below this count as parallel
+PARALLEL_TOL = 1e-09
+
+
+def _closest_approach(a, b, c, d, e, denom):
+    # Closed form parameters s, t of the closest points p + s * u and q + t * v of two non parallel lines,
+    # from the dot products a = u.u, b = u.v, c = v.v, d = u.w, e = v.w with w = p - q and the
+    # determinant denom = a * c - b * b. Works on floats and arrays alike.
+    return (b * e - c * d) / denom, (a * e - b * d) / denom
+
+
+def _intersect_pair(p: Sequence[Real], u: Sequence[Real], q: Sequence[Real], v: Sequence[Real],
+                    abs_tol: Real = 1e-04) -> Tuple[IntersectionStatus, Optional[List[float]]]:
+    # Scalar counterpart of intersect_lines for a single pair of lines
+    a = b = c = d = e = 0.0
+    for pi, ui, qi, vi in zip(p, u, q, v):
+        wi = pi - qi
+        a += ui * ui
+        b += ui * vi
+        c += vi * vi
+        d += ui * wi
+        e += vi * wi
+    denom = a * c - b * b
+    if denom <= PARALLEL_TOL * a * c:
+        k = d / a
+        offset = sqrt(sum((pi - qi - k * ui) ** 2 for pi, ui, qi in zip(p, u, q)))
+        return (IntersectionStatus.COINCIDENT if offset <= abs_tol else IntersectionStatus.PARALLEL), None
+
+    s, t = _closest_approach(a, b, c, d, e, denom)
+    gap = 0.0
+    point = []
+    for pi, ui, qi, vi in zip(p, u, q, v):
+        on_self, on_other = pi + s * ui, qi + t * vi
+        gap += (on_self - on_other) ** 2
+        point.append((on_self + on_other) / 2)
+    if sqrt(gap) > abs_tol:
+        return IntersectionStatus.SKEW, None
+    return IntersectionStatus.INTERSECTING, point
+
+
+def intersect_lines(points_a, directions_a, points_b, directions_b, abs_tol: Real = 1e-04
+                    ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Utility function for intersecting the lines points_a[i] + s * directions_a[i] with the lines
+    points_b[i] + t * directions_b[i] row by row. Any argument may be a single point or vector, which is
+    broadcast against the batches.
+
+    Returns the (N, D) intersection points and an (N,) int8 array of IntersectionStatus codes, so that
+    status == IntersectionStatus.INTERSECTING is the validity mask. Rows of skew lines hold the midpoint
+    of their closest approach, as needed to triangulate two nearly meeting rays, rows of parallel and
+    coincident lines hold NaN. Lines meet when their closest points are within abs_tol.
+    """
+    (p, u, q, v), _ = _broadcast(points_a, directions_a, points_b, directions_b)
+    w = p - q
+    u, v, w = np.broadcast_arrays(u, v, w)
+    a = np.einsum("ij,ij->i", u, u)
+    b = np.einsum("ij,ij->i", u, v)
+    c = np.einsum("ij,ij->i", v, v)
+    d = np.einsum("ij,ij->i", u, w)
+    e = np.einsum("ij,ij->i", v, w)
+    if not (a.all() and c.all()):
+        raise ValueError("directions must not contain zero vectors")
+    denom = a * c - b * b
+    parallel = denom <= PARALLEL_TOL * a * c
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        s, t = _closest_approach(a, b, c, d, e, denom)
+    on_a = p + s[:, None] * u
+    on_b = q + t[:, None] * v
+    gap = np.sqrt(np.einsum("ij,ij->i", on_a - on_b, on_a - on_b))
+    points = on_a
+    points += on_b
+    points *= 0.5
+
+    status = np.where(gap > abs_tol, IntersectionStatus.SKEW, IntersectionStatus.INTERSECTING).astype(np.int8)
+    if parallel.any():
+        # Distance of the origin of line b from line a decides between parallel and coincident
+        rows = np.flatnonzero(parallel)
+        w, u = w[rows], u[rows]
+        offset = w - (d[rows] / a[rows])[:, None] * u
+        offset = np.sqrt(np.einsum("ij,ij->i", offset, offset))
+        status[rows] = np.where(offset <= abs_tol, IntersectionStatus.COINCIDENT, IntersectionStatus.PARALLEL)
+        points[rows] = np.nan
+    return points, status
+
+
+def _ray_triangles(origins: np.ndarray, directions: np.ndarray, v0: np.ndarray, v1: np.ndarray, v2: np.ndarray,
+                   lines: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    # Moller-Trumbore test of the rays origins + t * directions, t >= 0, against the triangles v0 v1 v2 row by
+    # row, from either side, any t is accepted for lines. The arguments broadcast along all leading axes.
+    # Returns t, inf for misses, and the barycentric weights u, v of v1 and v2 at the hits. Rays parallel to
+    # the plane of their triangle and degenerate triangles are never hit.
+    e1 = v1 - v0
+    e2 = v2 - v0
+    p = np.cross(directions, e2)
+    det = np.einsum("...j,...j->...", e1, p)
+    n = np.cross(e1, e2)
+    # det is the cosine between the ray and the normal scaled by both lengths
+    facing = det * det > PARALLEL_TOL * np.einsum("...j,...j->...", n, n) * np.einsum("...j,...j->...", directions,
+                                                                                      directions)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        inverse = 1.0 / det
+        s = origins - v0
+        u = np.einsum("...j,...j->...", s, p) * inverse
+        q = np.cross(s, e1)
+        v = np.einsum("...j,...j->...", directions, q) * inverse
+        t = np.einsum("...j,...j->...", e2, q) * inverse
+        hit = facing & (u >= 0) & (v >= 0) & (u + v <= 1)
+        if not lines:
+            hit &= t >= 0
+    return np.where(hit, t, np.inf), u, v
+
+
+def _ray_segments(origins: np.ndarray, directions: np.ndarray, starts: np.ndarray, ends: np.ndarray,
+                  abs_tol: Real = 1e-09) -> np.ndarray:
+    # First parameter t >= 0 at which each ray origins + t * directions passes within abs_tol of its segment,
+    # row by row, inf for misses. Segments running along a ray are hit where the ray enters them.
+    v = ends - starts
+    w = origins - starts
+    a = np.einsum("ij,ij->i", directions, directions)
+    b = np.einsum("ij,ij->i", directions, v)
+    c = np.einsum("ij,ij->i", v, v)
+    d = np.einsum("ij,ij->i", directions, w)
+    e = np.einsum("ij,ij->i", v, w)
+    denom = a * c - b * b
+    parallel = denom <= PARALLEL_TOL * a * c
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        _, u = _closest_approach(a, b, c, d, e, denom)
+        # Along a parallel segment the ray first meets the nearer end point, or its origin lies inside
+        u = np.where(parallel, np.where(b >= 0, 0.0, 1.0), u)
+        np.clip(u, 0.0, 1.0, out=u)
+        on_segment = starts + u[:, None] * v
+        t = np.maximum(np.einsum("ij,ij->i", on_segment - origins, directions) / a, 0.0)
+        # One more alternation settles end points and rays starting next to the segment
+        on_ray = origins + t[:, None] * directions
+        u = np.clip(np.einsum("ij,ij->i", on_ray - starts, v) / c, 0.0, 1.0)
+    u[c == 0] = 0.0
+    gap = on_ray - (starts + u[:, None] * v)
+    return np.where(np.einsum("ij,ij->i", gap, gap) <= abs_tol * abs_tol, t, np.inf)
+
+
+def cast_rays(origins, directions, triangles, max_distance: Real = np.inf, lines: bool = False,
+              max_bytes: int = DEFAULT_MAX_BYTES) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Utility function for casting the rays origins[i] + t * directions[i], t >= 0, against a mesh of triangles
+    and finding the first triangle each ray hits, from either side. A single origin or direction is broadcast
+    against the batch. triangles is an (M, 3, 3) array of triangle corners or a BVH built over them, which
+    answers each ray in O(log M) instead of testing every triangle. Polygons are cast against through
+    BVH.from_polygons(polygons, faces=True), whose owner maps the returned triangles back to the polygons.
+
+    Returns the (N,) parameters t of the hits, the (N,) indices of the triangles hit and their (N, 3)
+    barycentric weights of the three corners, so that the hit point is their weighted sum. Rays that hit
+    nothing up to max_distance get t = inf, index -1 and NaN weights. t is measured in multiples of
+    directions, so it is the distance for unit directions. With lines set, the rays extend backwards as well
+    and the hit closest to the origin is returned, with a negative t behind it. Without a BVH the triangles
+    are tested in blocks of rays that stay within max_bytes.
+    """
+    # Imported here, the BVH itself is built on the kernels of this module
+    from geometry.spatial.bvh import BVH
+
+    (origins, directions), single = _broadcast(origins, directions)
+    origins, directions = np.broadcast_arrays(origins, directions)
+    if origins.shape[1] != 3:
+        raise InvalidSizeError(f"rays must have 3 coordinates, got {origins.shape[1]}")
+    if not np.einsum("ij,ij->i", directions, directions).all():
+        raise ValueError("directions must not contain zero vectors")
+
+    if isinstance(triangles, BVH):
+        if not triangles.is_triangles:
+            raise ValueError("Cannot cast rays against a BVH of segments")
+        bvh, corners = triangles, triangles.primitives
+        t, indices = bvh.first_hit(origins, directions, max_distance)
+        if lines:
+            behind, behind_indices = bvh.first_hit(origins, -directions, max_distance)
+            closer = behind < t
+            t = np.where(closer, -behind, t)
+            indices = np.where(closer, behind_indices, indices)
+    else:
+        corners = np.asarray(triangles, dtype=np.float64)
+        if corners.ndim != 3 or corners.shape[1:] != (3, 3):
+            raise InvalidSizeError(f"triangles must have shape (M, 3, 3), got {corners.shape}")
+        t = np.full(len(origins), np.inf)
+        indices = np.full(len(origins), -1, dtype=np.intp)
+        if len(corners):
+            v0, v1, v2 = corners[None, :, 0], corners[None, :, 1], corners[None, :, 2]
+            # A block holds about twenty float temporaries per ray and triangle
+            step = max(1, max_bytes // (160 * len(corners)))
+            for start in range(0, len(origins), step):
+                rows = slice(start, start + step)
+                block, _, _ = _ray_triangles(origins[rows, None], directions[rows, None], v0, v1, v2, lines)
+                nearest = np.argmin(np.abs(block), axis=1)
+                t[rows] = block[np.arange(len(block)), nearest]
+                indices[rows] = nearest
+        missed = np.isinf(t) | (np.abs(t) > max_distance)
+        t[missed] = np.inf
+        indices[missed] = -1
+
+    weights = np.full((len(origins), 3), np.nan)
+    hit = np.flatnonzero(indices >= 0)
+    if hit.size:
+        hit_corners = corners[indices[hit]]
+        _, u, v = _ray_triangles(origins[hit], directions[hit], hit_corners[:, 0], hit_corners[:, 1],
+                                 hit_corners[:, 2], lines=True)
+        weights[hit, 0] = 1.0 - u - v
+        weights[hit, 1] = u
+        weights[hit, 2] = v
+    if single:
+        return t[0], indices[0], weights[0]
+    return t, indices, weights
@@ -0,0 +1,291 @@
+# -*- coding : utf-8 -*-
+
+from fractions import Fraction
+from itertools import combinations
+from typing import Callable, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from geometry.error import InvalidSizeError
+from geometry.types import Real
+from geometry.utilities.arrays import as_query_array
+
+# Bounds on the relative error of the floating point determinants from Shewchuk, "Adaptive Precision
+# Floating-Point Arithmetic and Fast Robust Geometric Predicates". Epsilon is half an ulp of 1.0.
+_EPSILON = 2.0 ** -53
+_CCW_BOUND = (3.0 + 16.0 * _EPSILON) * _EPSILON
+_O3D_BOUND = (7.0 + 56.0 * _EPSILON) * _EPSILON
+_ICC_BOUND = (10.0 + 96.0 * _EPSILON) * _EPSILON
+
+
+def _single_values(point) -> Optional[List[float]]:
+    # Coordinates of a single point given as a Vector, Point, flat sequence or one dimensional array,
+    # None for batches
+    values = getattr(point, "values", point)
+    if isinstance(values, np.ndarray):
+        return values.tolist() if values.ndim == 1 else None
+    try:
+        return [float(v) for v in values] or None
+    except TypeError:
+        return None
+
+
+def _broadcast(*points) -> Tuple[List[np.ndarray], bool]:
+    # Single points broadcast against batches, e.g. the end points of a segment against many query points
+    arrays, singles = [], []
+    for p in points:
+        values = _single_values(p)
+        if values is not None:
+            arrays.append(np.array([values], dtype=np.float64))
+            singles.append(True)
+        else:
+            arrays.append(as_query_array(p)[0])
+            singles.append(False)
+    if len({a.shape[1] for a in arrays}) > 1:
+        raise InvalidSizeError(f"Cannot combine points of size {', '.join(str(a.shape[1]) for a in arrays)}")
+    sizes = {len(a) for a, single in zip(arrays, singles) if not single}
+    if len(sizes) > 1:
+        raise InvalidSizeError(f"Cannot combine batches of {', '.join(str(s) for s in sorted(sizes))} points")
+    return arrays, all(singles)
+
+
+def _all_close(a: np.ndarray, b: np.ndarray, abs_tol: Real, rel_tol: Real) -> np.ndarray:
+    # Row-wise equivalent of Point.__eq__, which uses math.isclose on every component
+    return np.all(np.abs(a - b) <= np.maximum(rel_tol * np.maximum(np.abs(a), np.abs(b)), abs_tol), axis=1)
+
+
+def _cross(u: np.ndarray, v: np.ndarray) -> np.ndarray:
+    if u.shape[1] == 2:
+        return (u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0])[:, None]
+    return np.cross(u, v)
+
+
+def _to_float(value: Fraction) -> float:
+    # Keeps the sign of exact results too small for a float
+    result = float(value)
+    if result == 0.0 and value:
+        return 5e-324 if value > 0 else -5e-324
+    return result
+
+
+def _orient2d_exact(a: Sequence[float], b: Sequence[float], c: Sequence[float]) -> Fraction:
+    (ax, ay), (bx, by), (cx, cy) = ((Fraction(v) for v in p) for p in (a, b, c))
+    return (ax - cx) * (by - cy) - (ay - cy) * (bx - cx)
+
+
+def _orient3d_exact(a, b, c, d) -> Fraction:
+    (ax, ay, az), (bx, by, bz), (cx, cy, cz), (dx, dy, dz) = ((Fraction(v) for v in p) for p in (a, b, c, d))
+    adx, ady, adz = ax - dx, ay - dy, az - dz
+    bdx, bdy, bdz = bx - dx, by - dy, bz - dz
+    cdx, cdy, cdz = cx - dx, cy - dy, cz - dz
+    return (adz * (bdx * cdy - bdy * cdx) + bdz * (cdx * ady - cdy * adx) + cdz * (adx * bdy - ady * bdx))
+
+
+def _incircle_exact(a, b, c, d) -> Fraction:
+    (ax, ay), (bx, by), (cx, cy), (dx, dy) = ((Fraction(v) for v in p) for p in (a, b, c, d))
+    adx, ady, bdx, bdy, cdx, cdy = ax - dx, ay - dy, bx - dx, by - dy, cx - dx, cy - dy
+    return ((adx * adx + ady * ady) * (bdx * cdy - cdx * bdy) + (bdx * bdx + bdy * bdy) * (cdx * ady - adx * cdy) +
+            (cdx * cdx + cdy * cdy) * (adx * bdy - bdx * ady))
+
+
+def _orient2d(a: Sequence[float], b: Sequence[float], c: Sequence[float]) -> float:
+    left = (a[0] - c[0]) * (b[1] - c[1])
+    right = (a[1] - c[1]) * (b[0] - c[0])
+    det = left - right
+    # Without cancellation the sign of det is already exact
+    if left == 0 or (left > 0) != (right > 0) or right == 0:
+        return det
+    if abs(det) >= _CCW_BOUND * abs(left + right):
+        return det
+    return _to_float(_orient2d_exact(a, b, c))
+
+
+def _orient3d(a, b, c, d) -> float:
+    adx, ady, adz = a[0] - d[0], a[1] - d[1], a[2] - d[2]
+    bdx, bdy, bdz = b[0] - d[0], b[1] - d[1], b[2] - d[2]
+    cdx, cdy, cdz = c[0] - d[0], c[1] - d[1], c[2] - d[2]
+    bdxcdy, cdxbdy = bdx * cdy, cdx * bdy
+    cdxady, adxcdy = cdx * ady, adx * cdy
+    adxbdy, bdxady = adx * bdy, bdx * ady
+    det = adz * (bdxcdy - cdxbdy) + bdz * (cdxady - adxcdy) + cdz * (adxbdy - bdxady)
+    permanent = ((abs(bdxcdy) + abs(cdxbdy)) * abs(adz) + (abs(cdxady) + abs(adxcdy)) * abs(bdz) +
+                 (abs(adxbdy) + abs(bdxady)) * abs(cdz))
+    if abs(det) >= _O3D_BOUND * permanent:
+        return det
+    return _to_float(_orient3d_exact(a, b, c, d))
+
+
+def _incircle(a, b, c, d) -> float:
+    adx, ady = a[0] - d[0], a[1] - d[1]
+    bdx, bdy = b[0] - d[0], b[1] - d[1]
+    cdx, cdy = c[0] - d[0], c[1] - d[1]
+    bdxcdy, cdxbdy = bdx * cdy, cdx * bdy
+    cdxady, adxcdy = cdx * ady, adx * cdy
+    adxbdy, bdxady = adx * bdy, bdx * ady
+    alift, blift, clift = adx * adx + ady * ady, bdx * bdx + bdy * bdy, cdx * cdx + cdy * cdy
+    det = alift * (bdxcdy - cdxbdy) + blift * (cdxady - adxcdy) + clift * (adxbdy - bdxady)
+    permanent = ((abs(bdxcdy) + abs(cdxbdy)) * alift + (abs(cdxady) + abs(adxcdy)) * blift +
+                 (abs(adxbdy) + abs(bdxady)) * clift)
+    if abs(det) >= _ICC_BOUND * permanent:
+        return det
+    return _to_float(_incircle_exact(a, b, c, d))
+
+
+def _refine(det: np.ndarray, uncertain: np.ndarray, exact: Callable, *points: np.ndarray) -> np.ndarray:
+    # Recomputes the rows the floating point filter could not decide in exact arithmetic
+    for i in np.nonzero(uncertain)[0]:
+        det[i] = _to_float(exact(*(p[i].tolist() for p in points)))
+    return det
+
+
+def _orient2d_batch(a: np.ndarray, b: np.ndarray, c: np.ndarray) -> np.ndarray:
+    left = (a[:, 0] - c[:, 0]) * (b[:, 1] - c[:, 1])
+    right = (a[:, 1] - c[:, 1]) * (b[:, 0] - c[:, 0])
+    det = left - right
+    cancels = (left > 0) & (right > 0) | (left < 0) & (right < 0)
+    uncertain = cancels & (np.abs(det) < _CCW_BOUND * np.abs(left + right))
+    return _refine(det, uncertain, _orient2d_exact, a, b, c)
+
+
+def _orient3d_batch(a, b, c, d) -> np.ndarray:
+    ad, bd, cd = a - d, b - d, c - d
+    bdxcdy, cdxbdy = bd[:, 0] * cd[:, 1], cd[:, 0] * bd[:, 1]
+    cdxady, adxcdy = cd[:, 0] * ad[:, 1], ad[:, 0] * cd[:, 1]
+    adxbdy, bdxady = ad[:, 0] * bd[:, 1], bd[:, 0] * ad[:, 1]
+    det = ad[:, 2] * (bdxcdy - cdxbdy) + bd[:, 2] * (cdxady - adxcdy) + cd[:, 2] * (adxbdy - bdxady)
+    permanent = ((np.abs(bdxcdy) + np.abs(cdxbdy)) * np.abs(ad[:, 2]) +
+                 (np.abs(cdxady) + np.abs(adxcdy)) * np.abs(bd[:, 2]) +
+                 (np.abs(adxbdy) + np.abs(bdxady)) * np.abs(cd[:, 2]))
+    return _refine(det, np.abs(det) < _O3D_BOUND * permanent, _orient3d_exact, a, b, c, d)
+
+
+def _incircle_batch(a, b, c, d) -> np.ndarray:
+    ad, bd, cd = a - d, b - d, c - d
+    bdxcdy, cdxbdy = bd[:, 0] * cd[:, 1], cd[:, 0] * bd[:, 1]
+    cdxady, adxcdy = cd[:, 0] * ad[:, 1], ad[:, 0] * cd[:, 1]
+    adxbdy, bdxady = ad[:, 0] * bd[:, 1], bd[:, 0] * ad[:, 1]
+    alift, blift, clift = (np.einsum("ij,ij->i", p, p) for p in (ad, bd, cd))
+    det = alift * (bdxcdy - cdxbdy) + blift * (cdxady - adxcdy) + clift * (adxbdy - bdxady)
+    permanent = ((np.abs(bdxcdy) + np.abs(cdxbdy)) * alift + (np.abs(cdxady) + np.abs(adxcdy)) * blift +
+                 (np.abs(adxbdy) + np.abs(bdxady)) * clift)
+    return _refine(det, np.abs(det) < _ICC_BOUND * permanent, _incircle_exact, a, b, c, d)
+
+
+def _evaluate(points: Tuple, dim: int, scalar: Callable, batch: Callable):
+    singles = [_single_values(p) for p in points]
+    if all(s is not None for s in singles):
+        if any(len(s) < dim for s in singles):
+            raise InvalidSizeError(f"points must have at least {dim} coordinates")
+        return scalar(*(s[:dim] for s in singles))
+    arrays, _ = _broadcast(*points)
+    if arrays[0].shape[1] < dim:
+        raise InvalidSizeError(f"points must have at least {dim} coordinates")
+    return batch(*np.broadcast_arrays(*(np.ascontiguousarray(a[:, :dim]) for a in arrays)))
+
+
+def orient2d(a, b, c):
+    """
+    Robust orientation test, positive when a, b and c turn counter-clockwise, negative when they turn
+    clockwise and exactly zero when they are collinear. Only the x and y coordinates are used.
+
+    The determinant is computed in floating point and only recomputed in exact arithmetic when it is
+    smaller than its error bound, so the sign is always correct while most calls stay on the fast path.
+    Accepts single points or batches like collinear.
+    """
+    return _evaluate((a, b, c), 2, _orient2d, _orient2d_batch)
+
+
+def orient3d(a, b, c, d):
+    """
+    Robust orientation test in space, positive when d lies below the plane through a, b and c, where below
+    means that a, b and c turn counter-clockwise seen from above, and exactly zero when the four points are
+    coplanar. See orient2d.
+    """
+    return _evaluate((a, b, c, d), 3, _orient3d, _orient3d_batch)
+
+
+def incircle(a, b, c, d):
+    """
+    Robust in-circle test, positive when d lies inside the circle through the counter-clockwise points a, b
+    and c, negative when it lies outside and exactly zero when the four points are cocircular. Only the x
+    and y coordinates are used. See orient2d.
+    """
+    return _evaluate((a, b, c, d), 2, _incircle, _incircle_batch)
+
+
+def _collinear_exact(a, b, c, ordered: bool):
+    singles = [_single_values(p) for p in (a, b, c)]
+    if all(s is not None for s in singles):
+        a, b, c = singles
+        if not len(a) == len(b) == len(c):
+            raise InvalidSizeError(f"Cannot combine points of size {len(a)}, {len(b)} and {len(c)}")
+        if a == b or b == c:
+            return True
+        elif c == a:
+            return not ordered
+        # The points are collinear when all 2x2 minors of (b - a, c - a) vanish, i.e. in every axis plane
+        for i, j in combinations(range(len(a)), 2):
+            if _orient2d((a[i], a[j]), (b[i], b[j]), (c[i], c[j])) != 0:
+                return False
+        return not ordered or all(min(p, r) <= q <= max(p, r) for p, q, r in zip(a, b, c))
+
+    (a, b, c), _ = _broadcast(a, b, c)
+    a, b, c = np.broadcast_arrays(a, b, c)
+    result = np.ones(len(a), dtype=bool)
+    for i, j in combinations(range(a.shape[1]), 2):
+        plane = [i, j]
+        result &= _orient2d_batch(a[:, plane], b[:, plane], c[:, plane]) == 0
+    if ordered:
+        result &= np.all((np.minimum(a, c) <= b) & (b <= np.maximum(a, c)), axis=1)
+    result = np.where(np.all(c == a, axis=1), not ordered, result)
+    return result | np.all(a == b, axis=1) | np.all(b == c, axis=1)
+
+
+def collinear(a, b, c, ordered: bool = False, abs_tol: Real = 1e-04, rel_tol: Real = 1e-09,
+              exact: bool = False) -> np.ndarray:
+    """
+    Batched version of Point.check_collinear. Takes batches of N points, or single points which are broadcast,
+    and returns a boolean mask of the triplets (a, b, c) that are collinear. With ordered the mask marks the
+    triplets where b also lies between a and c.
+
+    With exact the tolerances are ignored and the robust orient2d test decides, in every axis plane, whether
+    the points are exactly collinear, which stays correct at any coordinate magnitude.
+    """
+    if exact:
+        return _collinear_exact(a, b, c, ordered)
+
+    (a, b, c), single = _broadcast(a, b, c)
+    u, v = b - a, c - a
+    result = np.all(np.abs(_cross(u, v)) <= abs_tol, axis=1)
+    if ordered:
+        uv = np.einsum("ij,ij->i", *np.broadcast_arrays(u, v))
+        result &= (uv >= 0) & (uv <= np.einsum("ij,ij->i", v, v))
+
+    # Coincident points decide the result on their own, like in Point.check_collinear
+    result = np.where(_all_close(c, a, abs_tol, rel_tol), not ordered, result)
+    result |= _all_close(a, b, abs_tol, rel_tol) | _all_close(b, c, abs_tol, rel_tol)
+    return bool(result[0]) if single else result
+
+
+def signed_area(a, b, c, normal: Iterable[Real] = (0.0, 0.0, 1.0)) -> np.ndarray:
+    """
+    Returns the signed area of the triangles (a, b, c), positive when the triangle turns counter-clockwise
+    seen from the tip of normal. Two dimensional points are oriented in their own plane.
+    """
+    (a, b, c), single = _broadcast(a, b, c)
+    cross = _cross(b - a, c - a)
+    if cross.shape[1] == 1:
+        area = 0.5 * cross[:, 0]
+    else:
+        normal = np.asarray(getattr(normal, "values", normal), dtype=np.float64)
+        area = 0.5 * (cross @ (normal / np.linalg.norm(normal)))
+    return float(area[0]) if single else area
+
+
+def orientation(a, b, c, normal: Iterable[Real] = (0.0, 0.0, 1.0), abs_tol: Real = 0.0) -> np.ndarray:
+    """
+    Returns 1 for counter-clockwise, -1 for clockwise and 0 for degenerate triangles (a, b, c), see signed_area
+    """
+    area = np.asarray(signed_area(a, b, c, normal))
+    result = np.where(np.abs(area) <= abs_tol, 0, np.sign(area)).astype(np.int8)
+    return int(result) if result.ndim == 0 else result
@@ -0,0 +1,113 @@
+# -*- coding : utf-8 -*-
+
+from itertools import product
+from math import floor, isclose, isfinite
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from geometry.types import Real
+
+
+def grid_key(values: Iterable[Real], cell_size: Real) -> Tuple:
+    """
+    Utility function for snapping coordinates to the cell of a uniform grid
+    """
+    return tuple(floor(v / cell_size) if isfinite(v) else v for v in values)
+
+
+class SpatialHash:
+    """
+    Uniform grid index over points which finds stored points equal to a query within a tolerance.
+
+    Equality uses the same per-component isclose test as Point.__eq__. Cells are twice as wide as the
+    largest tolerance for coordinates up to extent, so at most two cells per axis have to be probed and
+    lookups are expected O(1).
+    """
+
+    def __init__(self, abs_tol: Real = 1e-04, rel_tol: Real = 1e-09, extent: Real = 0.0) -> None:
+        if abs_tol <= 0:
+            raise ValueError("abs_tol must be positive")
+        self.abs_tol = abs_tol
+        self.rel_tol = rel_tol
+        self._reach = max(abs_tol, rel_tol * extent)
+        self.cell_size = 2 * self._reach
+        self.points: List[Sequence[Real]] = []
+        self._cells: Dict[Tuple, List[int]] = {}
+
+    def __len__(self) -> int:
+        return len(self.points)
+
+    def _candidate_keys(self, values: Sequence[Real]) -> List[Tuple]:
+        # The home cell of values always comes first
+        h, reach = self.cell_size, self._reach
+        axes = []
+        for v in values:
+            if not isfinite(v):
+                axes.append((v,))
+                continue
+            cell = floor(v / h)
+            offset = v - cell * h
+            if offset <= reach:
+                axes.append((cell, cell - 1))
+            elif offset >= h - reach:
+                axes.append((cell, cell + 1))
+            else:
+                axes.append((cell,))
+        return list(product(*axes))
+
+    def _equal(self, a: Sequence[Real], b: Sequence[Real]) -> bool:
+        return len(a) == len(b) and all(isclose(i, j, rel_tol=self.rel_tol, abs_tol=self.abs_tol)
+                                        for i, j in zip(a, b))
+
+    def _find(self, values: Tuple, keys: List[Tuple]) -> Optional[int]:
+        cells, points = self._cells, self.points
+        found = None
+        for key in keys:
+            for idx in cells.get(key, ()):
+                if found is not None and idx >= found:
+                    break
+                if self._equal(points[idx], values):
+                    found = idx
+                    break
+        return found
+
+    def find(self, point: Iterable[Real]) -> Optional[int]:
+        """
+        Returns the index of the first stored point equal to point, or None
+        """
+        values = tuple(point)
+        return self._find(values, self._candidate_keys(values))
+
+    def add(self, point: Iterable[Real]) -> int:
+        """
+        Stores point unconditionally and returns its index
+        """
+        values = tuple(point)
+        idx = len(self.points)
+        self.points.append(values)
+        self._cells.setdefault(grid_key(values, self.cell_size), []).append(idx)
+        return idx
+
+    def insert(self, point: Iterable[Real]) -> Tuple[int, bool]:
+        """
+        Stores point unless an equal point is already stored, returns the index of the representative and
+        whether point was inserted
+        """
+        values = tuple(point)
+        keys = self._candidate_keys(values)
+        idx = self._find(values, keys)
+        if idx is not None:
+            return idx, False
+        idx = len(self.points)
+        self.points.append(values)
+        self._cells.setdefault(keys[0], []).append(idx)
+        return idx, True
+
+    @classmethod
+    def for_points(cls, points: Sequence[Sequence[Real]], abs_tol: Real = 1e-04,
+                   rel_tol: Real = 1e-09) -> "SpatialHash":
+        """
+        Creates an empty index whose cells are wide enough for the relative tolerance at the largest coordinate
+        among points
+        """
+        extent = max((abs(v) for p in points for v in p if isfinite(v)), default=0.0)
+        return cls(abs_tol, rel_tol, extent)
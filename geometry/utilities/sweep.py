@@ -0,0 +1,200 @@
+# -*- coding : utf-8 -*-
+
+import heapq
+from itertools import combinations
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+
+from geometry.error import InvalidSizeError
+from geometry.types import Real
+from geometry.utilities.arrays import as_segment_array
+from geometry.utilities.predicates import _orient2d
+
+Point2 = Tuple[float, float]
+
+
+def _plane_basis(normal: Iterable[Real]) -> np.ndarray:
+    # Two orthonormal rows spanning the plane orthogonal to normal. Axis aligned normals drop the
+    # corresponding coordinate, so the projected coordinates stay exact.
+    n = np.asarray(getattr(normal, "values", normal), dtype=np.float64)
+    if n.shape != (3,):
+        raise InvalidSizeError(f"normal must have 3 coordinates, got {n.size}")
+    if not n.any():
+        raise ValueError("normal must not be a zero vector")
+    if np.count_nonzero(n) == 1:
+        return np.delete(np.eye(3), np.flatnonzero(n)[0], axis=0)
+    n = n / np.linalg.norm(n)
+    helper = np.eye(3)[np.argmin(np.abs(n))]
+    e1 = np.cross(n, helper)
+    e1 /= np.linalg.norm(e1)
+    return np.array([e1, np.cross(n, e1)])
+
+
+def _opposite(o1: float, o2: float) -> bool:
+    # True unless both orientations are strictly on the same side
+    return not ((o1 > 0 and o2 > 0) or (o1 < 0 and o2 < 0))
+
+
+def _segments_meet(a: Point2, b: Point2, c: Point2, d: Point2) -> bool:
+    # Exact test whether the segments ab and cd share a point, end points are sorted so that a <= b
+    # and c <= d lexicographically
+    if a == b:
+        return c <= a <= d and _orient2d(c, d, a) == 0
+    if c == d:
+        return a <= c <= b and _orient2d(a, b, c) == 0
+    o1, o2 = _orient2d(a, b, c), _orient2d(a, b, d)
+    if o1 == 0 and o2 == 0:
+        return max(a, c) <= min(b, d)
+    return _opposite(o1, o2) and _opposite(_orient2d(c, d, a), _orient2d(c, d, b))
+
+
+def _crossing(a: Point2, b: Point2, c: Point2, d: Point2) -> Optional[Point2]:
+    # Point where the lines through ab and cd cross, None when they are parallel
+    dxs, dys = b[0] - a[0], b[1] - a[1]
+    dxt, dyt = d[0] - c[0], d[1] - c[1]
+    denom = dxs * dyt - dys * dxt
+    if denom == 0:
+        return None
+    t = ((c[0] - a[0]) * dyt - (c[1] - a[1]) * dxt) / denom
+    if t <= 0:
+        return a
+    if t >= 1:
+        return b
+    return a[0] + t * dxs, a[1] + t * dys
+
+
+def _sweep(starts: List[Point2], ends: List[Point2], abs_tol: Real) -> Tuple[List[Tuple[int, int]], List[Point2]]:
+    # Bentley-Ottmann sweep from left to right over segments with starts[i] <= ends[i] lexicographically.
+    # The status list holds the segments cut by the sweep line ordered by their y coordinate on it and is
+    # searched by bisection, the heap holds the end points and the crossings found between neighbors.
+    n = len(starts)
+    x1 = [p[0] for p in starts]
+    y1 = [p[1] for p in starts]
+    vertical = [starts[i][0] == ends[i][0] for i in range(n)]
+    slope = [0.0 if vertical[i] else (ends[i][1] - y1[i]) / (ends[i][0] - x1[i]) for i in range(n)]
+    # Order of the segments just right of a common point, vertical segments point up and come last
+    steepness = [float("inf") if vertical[i] else slope[i] for i in range(n)]
+
+    starting: Dict[Point2, List[int]] = {}
+    for i, p in enumerate(starts):
+        starting.setdefault(p, []).append(i)
+    queued: Set[Point2] = set(starts)
+    queued.update(ends)
+    events = list(queued)
+    heapq.heapify(events)
+    # Segments whose crossing created an event, they pass through it even when rounding says otherwise
+    crossing_pairs: Dict[Point2, List[int]] = {}
+
+    status: List[int] = []
+    reported: Set[Tuple[int, int]] = set()
+    pairs: List[Tuple[int, int]] = []
+    points: List[Point2] = []
+
+    def check(s: int, t: int, p: Point2) -> None:
+        if not _segments_meet(starts[s], ends[s], starts[t], ends[t]):
+            return
+        q = _crossing(starts[s], ends[s], starts[t], ends[t])
+        if q is None or q <= p:
+            return
+        crossing_pairs.setdefault(q, []).extend((s, t))
+        if q not in queued:
+            queued.add(q)
+            heapq.heappush(events, q)
+
+    while events:
+        p = heapq.heappop(events)
+        px, py = p
+
+        def y_at(s: int) -> float:
+            return py if vertical[s] else y1[s] + (px - x1[s]) * slope[s]
+
+        lo, hi = 0, len(status)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if y_at(status[mid]) < py - abs_tol:
+                lo = mid + 1
+            else:
+                hi = mid
+        hi = lo
+        while hi < len(status) and y_at(status[hi]) <= py + abs_tol:
+            hi += 1
+        through = set(status[lo:hi])
+        for s in crossing_pairs.pop(p, ()):
+            # Rounding may put the crossing just past the end of a segment that already left the status
+            if s not in through and ends[s] >= p:
+                idx = status.index(s)
+                lo, hi = min(lo, idx), max(hi, idx + 1)
+                through.add(s)
+
+        block = status[lo:hi]
+        new = starting.get(p, [])
+        involved = [s for s in block if s in through] + new
+        if len(involved) > 1:
+            for s, t in combinations(involved, 2):
+                pair = (s, t) if s < t else (t, s)
+                if pair not in reported and _segments_meet(starts[s], ends[s], starts[t], ends[t]):
+                    reported.add(pair)
+                    pairs.append(pair)
+                    points.append(p)
+
+        # Segments ending at p leave the status, the ones through p reverse their order and the ones
+        # starting at p join in the order they take right of p
+        remaining = [s for s in block if ends[s] != p] + [s for s in new if ends[s] != p]
+        remaining.sort(key=lambda s: (py, steepness[s], s) if s in through or s in new else (y_at(s), 0.0, s))
+        status[lo:hi] = remaining
+
+        if remaining:
+            if lo > 0:
+                check(status[lo - 1], status[lo], p)
+            top = lo + len(remaining)
+            if top < len(status):
+                check(status[top - 1], status[top], p)
+        elif 0 < lo < len(status):
+            check(status[lo - 1], status[lo], p)
+    return pairs, points
+
+
+def segment_intersections(segments, normal: Iterable[Real] = (0, 0, 1), abs_tol: Real = 1e-09
+                          ) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Utility function for finding every intersecting pair among segments with a Bentley-Ottmann sweep instead
+    of testing all pairs. segments is an iterable of LineSegments or an (N, 2, D) array of end points. For N
+    segments and K intersections the sweep handles O(N + K) events with O(log N) comparisons each, but the
+    status is a plain list updated by splicing and linear lookups, so the worst case is O((N + K) N).
+
+    Two dimensional segments are swept in their plane. Three dimensional segments, which includes all
+    LineSegments, are projected onto the plane orthogonal to normal, the xy plane by default, so that
+    e.g. a bridge crossing a road is reported as well.
+
+    Returns a (K, 2) array of index pairs i < j in sweep order and a (K, D) array holding, for every pair,
+    the point of segments[i] where it meets segments[j]. Touching end points count as intersections,
+    overlapping collinear segments are reported once at the start of their overlap. Whether two segments
+    meet is decided exactly, abs_tol only bounds the rounding of computed crossing points.
+    """
+    values = as_segment_array(segments)
+    if values.shape[2] == 3:
+        planar = values @ _plane_basis(normal).T
+    else:
+        planar = values
+    # Sort the end points of each segment so that it runs from left to right, bottom to top when vertical
+    a, b = planar[:, 0], planar[:, 1]
+    swap = (a[:, 0] > b[:, 0]) | ((a[:, 0] == b[:, 0]) & (a[:, 1] > b[:, 1]))
+    starts = np.where(swap[:, None], b, a)
+    ends = np.where(swap[:, None], a, b)
+
+    pairs, points = _sweep(list(map(tuple, starts.tolist())), list(map(tuple, ends.tolist())), abs_tol)
+    pairs = np.array(pairs, dtype=np.int64).reshape(-1, 2)
+    points = np.array(points, dtype=np.float64).reshape(-1, 2)
+    if values.shape[2] == 2:
+        return pairs, points
+
+    # Lifts the crossings back onto the first segment of each pair
+    first = pairs[:, 0]
+    direction = ends[first] - starts[first]
+    length = np.einsum("ij,ij->i", direction, direction)
+    t = np.einsum("ij,ij->i", points - starts[first], direction)
+    t = np.divide(t, length, out=np.zeros_like(t), where=length > 0)
+    start3 = np.where(swap[first, None], values[first, 1], values[first, 0])
+    end3 = np.where(swap[first, None], values[first, 0], values[first, 1])
+    return pairs, start3 + t[:, None] * (end3 - start3)
@@ -0,0 +1,65 @@
+# -*- coding : utf-8 -*-
+
+import random
+
+from geometry import Point
+from geometry.utilities import SpatialHash, all_unique, group_points, unique_points
+
+
+def test_all_unique():
+    assert all_unique([1, 2, 3])
+    assert not all_unique([1, 2, 1])
+    assert not all_unique([[1], [2], [1]])
+
+    assert all_unique([Point(0, 0, 0), Point(1, 0, 0)])
+    assert not all_unique([Point(0, 0, 0), Point(1, 0, 0), Point(0.00005, 0, 0)])
+    assert not all_unique(p for p in (Point(1, 1, 1), Point(1, 1, 1.00009)))
+
+
+def test_unique_points_across_cells():
+    # 0.00019 and 0.00021 straddle a grid cell boundary but still compare equal
+    points = [Point(0.00019, 0, 0), Point(0.00021, 0, 0), Point(1, 1, 1), Point(1, 1, 1.0002)]
+    unique = unique_points(points)
+    assert unique == [points[0], points[2], points[3]]
+    assert unique[0] is points[0]
+
+
+def test_unique_points_matches_eq():
+    random.seed(4)
+    points = [Point(round(random.random(), 3), round(random.random(), 3), 0.0) for _ in range(300)]
+    points += [p + Point(0.00005, -0.00005, 0.00009) for p in points[:100]]
+
+    expected = []
+    for p in points:
+        if not any(p == q for q in expected):
+            expected.append(p)
+    assert unique_points(points) == expected
+
+
+def test_group_points():
+    points = [Point(0, 0, 0), Point(5, 5, 5), Point(0.00001, 0, 0), Point(5, 5, 5.00001)]
+    assert group_points(points) == [[0, 2], [1, 3]]
+
+
+def test_spatial_hash_relative_tolerance():
+    index = SpatialHash.for_points([(1e9, 0, 0)])
+    index.add((1e9, 0, 0))
+    # Equal through rel_tol=1e-09 only, which is far wider than abs_tol at this magnitude
+    assert index.find((1e9 + 0.9, 0, 0)) == 0
+    assert index.find((1e9 + 3, 0, 0)) is None
+
+
+def test_point_hash_uses_tolerance_cells():
+    p0 = Point(1.23456, 2.0, 3.0)
+    assert len({p0, Point(1.23456000001, 2.0, 3.0)}) == 1
+    assert len({p0, Point(5, 5, 5), Point(1.3, 2.0, 3.0)}) == 3
+
+    # Equal points on either side of a cell boundary hash differently, unique_points still merges them
+    p1, p2 = Point(0.00019999, 0, 0), Point(0.00020001, 0, 0)
+    assert p1 == p2 and hash(p1) != hash(p2) and len({p1, p2}) == 2
+    assert unique_points([p1, p2]) == [p1]
+
+    # Distinct points spread over the buckets, a set of them stays fast
+    rng = random.Random(3)
+    points = [Point(rng.random(), rng.random(), rng.random()) for _ in range(2000)]
+    assert len({hash(p) for p in points}) == len(points)
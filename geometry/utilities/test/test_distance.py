@@ -0,0 +1,98 @@
+# -*- coding : utf-8 -*-
+
+import numpy as np
+import pytest
+
+from geometry import Point, PointCloud, Vector
+from geometry.utilities import (argmin_distances, count_within, iter_distance_blocks, min_distances,
+                                nearest_distances, nearest_segments, pairwise_distances, project_onto_lines,
+                                project_onto_segments)
+
+
+@pytest.fixture
+def clouds():
+    rng = np.random.default_rng(11)
+    return rng.random((300, 3)) * 10, rng.random((200, 3)) * 10
+
+
+def reference(a, b):
+    return np.sqrt(((a[:, None, :] - b[None, :, :]) ** 2).sum(axis=2))
+
+
+def test_pairwise_distances(clouds):
+    a, b = clouds
+    assert np.allclose(pairwise_distances(a, b), reference(a, b))
+    assert np.allclose(pairwise_distances(a), reference(a, a))
+
+    points = [Point(0, 0, 0), Point(3, 4, 0)]
+    assert np.allclose(pairwise_distances(points, PointCloud.from_points(points)), [[0, 5], [5, 0]])
+
+    with pytest.raises(ValueError):
+        pairwise_distances(a, b, max_bytes=1024)
+
+
+def test_distance_blocks(clouds):
+    a, b = clouds
+    blocks = list(iter_distance_blocks(a, b, max_bytes=16 * 200 * 7))
+    assert len(blocks) == 43 and all(block.shape[0] <= 7 for _, block in blocks)
+    assert np.allclose(np.vstack([block for _, block in blocks]), reference(a, b))
+
+
+def test_reductions(clouds):
+    a, b = clouds
+    full = reference(a, b)
+    assert np.allclose(min_distances(a, b, max_bytes=4096), full.min(axis=1))
+    assert np.array_equal(argmin_distances(a, b, max_bytes=4096), full.argmin(axis=1))
+    assert np.array_equal(count_within(a, b, 1.5, max_bytes=4096), (full <= 1.5).sum(axis=1))
+
+    self_full = reference(a, a)
+    np.fill_diagonal(self_full, np.inf)
+    distances, indices = nearest_distances(a, max_bytes=4096)
+    assert np.allclose(distances, self_full.min(axis=1))
+    assert np.array_equal(indices, self_full.argmin(axis=1))
+
+
+def test_project_onto_lines():
+    points = np.array([(1, 1, 0), (3, -2, 5), (-4, 0, 0)], dtype=float)
+    closest, t, distances = project_onto_lines(points, Point(0, 0, 0), Vector([2, 0, 0]))
+    assert np.allclose(closest, [(1, 0, 0), (3, 0, 0), (-4, 0, 0)])
+    assert np.allclose(t, [0.5, 1.5, -2])
+    assert np.allclose(distances, [1, np.sqrt(29), 0])
+
+    # Row wise lines
+    closest, _, distances = project_onto_lines(points, points + 1, [(1, 0, 0), (0, 1, 0), (0, 0, 1)])
+    assert np.allclose(distances, np.sqrt(2))
+
+    with pytest.raises(ValueError):
+        project_onto_lines(points, Point(0, 0, 0), Vector([0, 0, 0]))
+
+
+def test_project_onto_segments(clouds):
+    points, _ = clouds
+    closest, t, distances = project_onto_segments(points, Point(2, 2, 2), Point(8, 2, 2))
+    assert ((0 <= t) & (t <= 1)).all()
+    assert np.allclose(closest[:, 1:], 2) and np.allclose(closest[:, 0], 2 + 6 * t)
+    assert np.allclose(distances, np.linalg.norm(points - closest, axis=1))
+    assert np.allclose(closest[points[:, 0] < 2], (2, 2, 2))
+
+    # A degenerate segment projects everything onto its start
+    closest, t, _ = project_onto_segments(points[:3], Point(1, 1, 1), Point(1, 1, 1))
+    assert np.allclose(closest, 1) and not t.any()
+
+
+def test_nearest_segments(clouds):
+    points, ends = clouds
+    starts = ends[:50]
+    ends = ends[50:100]
+    indices, closest, t, distances = nearest_segments(points, starts, ends, max_bytes=4096)
+
+    # Reference projecting every point onto every segment
+    n, m = len(points), len(starts)
+    reference = project_onto_segments(np.repeat(points, m, axis=0), np.tile(starts, (n, 1)), np.tile(ends, (n, 1)))
+    expected = reference[2].reshape(n, m)
+    assert np.allclose(distances, expected.min(axis=1))
+    assert np.allclose(expected[np.arange(n), indices], distances)
+    assert np.allclose(closest, starts[indices] + t[:, None] * (ends[indices] - starts[indices]))
+
+    with pytest.raises(ValueError):
+        nearest_segments(points, np.empty((0, 3)), np.empty((0, 3)))
@@ -0,0 +1,122 @@
+# -*- coding : utf-8 -*-
+
+import numpy as np
+import pytest
+
+from geometry import Line, Point, Vector
+from geometry.error import InvalidSizeError
+from geometry.object.polygon import Polygon
+from geometry.spatial import BVH
+from geometry.types import IntersectionStatus
+from geometry.utilities import cast_rays, intersect_lines
+
+
+def test_intersect_lines_recovers_meeting_points():
+    rng = np.random.default_rng(5)
+    meet = rng.normal(size=(500, 3))
+    u, v = rng.normal(size=(500, 3)), rng.normal(size=(500, 3))
+    p = meet - rng.normal(size=(500, 1)) * u
+    q = meet - rng.normal(size=(500, 1)) * v
+
+    points, status = intersect_lines(p, u, q, v)
+    assert (status == IntersectionStatus.INTERSECTING).all()
+    assert np.allclose(points, meet)
+
+    # Lifting line b off the plane of line a makes the pairs skew, their rows hold the closest approach
+    lift = np.cross(u, v)
+    lift /= np.linalg.norm(lift, axis=1)[:, None]
+    points, status = intersect_lines(p, u, q + lift, v)
+    assert (status == IntersectionStatus.SKEW).all()
+    assert np.allclose(points, meet + lift / 2)
+
+
+def test_intersect_lines_status():
+    p = [(0, 0, 0), (0, 0, 0), (0, 0, 0), (0, 0, 0)]
+    u = [(1, 0, 0), (1, 0, 0), (1, 0, 0), (1, 0, 0)]
+    q = [(0, 1, 0), (0, 1, 0), (0, 1, 1), (5, 0, 0)]
+    v = [(0, 1, 0), (-2, 0, 0), (0, 1, 0), (3, 0, 0)]
+    points, status = intersect_lines(p, u, q, v)
+    assert status.tolist() == [IntersectionStatus.INTERSECTING, IntersectionStatus.PARALLEL,
+                               IntersectionStatus.SKEW, IntersectionStatus.COINCIDENT]
+    assert np.allclose(points[0], (0, 0, 0))
+    assert np.isnan(points[[1, 3]]).all()
+
+    # Single lines broadcast against batches, also in 2D
+    points, status = intersect_lines(np.array([0.0, 0.0]), Vector([1, 1]), [(2, 0), (0, 4)], [(0, 1), (1, 0)])
+    assert status.tolist() == [IntersectionStatus.INTERSECTING] * 2
+    assert np.allclose(points, [(2, 2), (4, 4)])
+
+    with pytest.raises(ValueError):
+        intersect_lines(p, u, q, [(0, 0, 0)] * 4)
+
+
+def test_line_intersection_matches_batch():
+    rng = np.random.default_rng(8)
+    p, u, q, v = (rng.integers(-3, 4, (300, 3)).astype(float) for _ in range(4))
+    u[~u.any(axis=1)] = 1.0
+    v[~v.any(axis=1)] = 1.0
+    points, status = intersect_lines(p, u, q, v)
+    for row in range(300):
+        result = Line(Vector(u[row].tolist()), Point(*p[row])).intersection(Line(Vector(v[row].tolist()),
+                                                                                 Point(*q[row])))
+        if status[row] == IntersectionStatus.INTERSECTING:
+            assert result == Point(*points[row])
+        else:
+            assert result is None
+
+
+@pytest.fixture
+def terrain():
+    x, y = np.meshgrid(np.linspace(0, 10, 21), np.linspace(0, 10, 21))
+    grid = np.stack((x, y, np.sin(x) * np.cos(y)), axis=-1)
+    a, b, c, d = grid[:-1, :-1], grid[1:, :-1], grid[1:, 1:], grid[:-1, 1:]
+    return np.concatenate((np.stack((a, b, c), axis=-2).reshape(-1, 3, 3),
+                           np.stack((a, c, d), axis=-2).reshape(-1, 3, 3)))
+
+
+def test_cast_rays(terrain):
+    rng = np.random.default_rng(2)
+    origins = np.column_stack((rng.random((1000, 2)) * 12 - 1, np.full(1000, 5.0)))
+    directions = np.column_stack((rng.normal(size=(1000, 2)) * 0.3, -np.ones(1000)))
+
+    t, indices, weights = cast_rays(origins, directions, terrain, max_bytes=1 << 16)
+    hit = indices >= 0
+    assert hit.any() and not hit.all()
+    assert np.all(np.isinf(t[~hit])) and np.all(np.isnan(weights[~hit]))
+    assert np.all(weights[hit] >= 0) and np.allclose(weights[hit].sum(axis=1), 1)
+    on_mesh = np.einsum("ij,ijk->ik", weights[hit], terrain[indices[hit]])
+    assert np.allclose(on_mesh, origins[hit] + t[hit, None] * directions[hit])
+    # The terrain is a height field, so the hit point is the only one below the ray origin
+    assert np.allclose(on_mesh[:, 2], np.sin(on_mesh[:, 0]) * np.cos(on_mesh[:, 1]), atol=0.3)
+
+    bvh_t, bvh_indices, bvh_weights = cast_rays(origins, directions, BVH(terrain))
+    assert np.array_equal(bvh_t, t)
+    # Rays through a shared edge may report either triangle
+    same = bvh_indices == indices
+    assert same.mean() > 0.95 and np.allclose(bvh_weights[same], weights[same], equal_nan=True)
+
+    near_t, _, _ = cast_rays(origins, directions, terrain, max_distance=4.5)
+    assert np.array_equal(np.isfinite(near_t), t <= 4.5)
+
+
+def test_cast_rays_lines_and_polygons():
+    triangle = np.array([[[0.0, 0.0, 0.0], [2.0, 0.0, 0.0], [0.0, 2.0, 0.0]]])
+    t, i, w = cast_rays(Point(0.5, 0.5, 1), Vector([0, 0, 1]), triangle)
+    assert np.isinf(t) and i == -1
+    t, i, w = cast_rays(Point(0.5, 0.5, 1), Vector([0, 0, 1]), triangle, lines=True)
+    assert t == -1 and i == 0 and np.allclose(w, [0.5, 0.25, 0.25])
+    t, _, _ = cast_rays((0.5, 0.5, 1), (1, 0, 0), triangle, lines=True)
+    assert np.isinf(t)
+
+    square = Polygon([Point(0, 0, 0), Point(2, 0, 0), Point(2, 2, 0), Point(0, 2, 0)])
+    roof = Polygon([Point(0, 0, 3), Point(2, 0, 3), Point(1, 2, 3)])
+    bvh = BVH.from_polygons([square, roof], faces=True)
+    t, i, _ = cast_rays([(1, 1, -1), (1, 1, 1), (1, 1, 4), (1.9, 1.9, 4)], (0, 0, 1), bvh, lines=True)
+    assert np.array_equal(t, [1, -1, -1, -4]) and np.array_equal(bvh.owner[i], [0, 0, 1, 0])
+
+    with pytest.raises(ValueError):
+        cast_rays((0, 0, 0), (0, 0, 0), triangle)
+    with pytest.raises(ValueError):
+        cast_rays((0, 0, 0), (0, 0, 1), BVH(np.zeros((1, 2, 3))))
+    with pytest.raises(InvalidSizeError):
+        cast_rays((0, 0, 0), (0, 0, 1), np.zeros((2, 3, 2)))
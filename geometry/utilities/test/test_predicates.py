@@ -0,0 +1,116 @@
+# -*- coding : utf-8 -*-
+
+from fractions import Fraction
+
+import numpy as np
+import pytest
+
+from geometry import Point, PointCloud
+from geometry.error import InvalidSizeError
+from geometry.utilities import collinear, incircle, orient2d, orient3d, orientation, signed_area
+
+
+def test_collinear_matches_check_collinear():
+    rng = np.random.default_rng(3)
+    a = rng.integers(-2, 3, (400, 3)).astype(float)
+    b = rng.integers(-2, 3, (400, 3)).astype(float)
+    c = rng.integers(-2, 3, (400, 3)).astype(float)
+    points = [[Point(*row) for row in arr.tolist()] for arr in (a, b, c)]
+
+    for ordered in (False, True):
+        expected = [Point.check_collinear(p, q, r, ordered=ordered) for p, q, r in zip(*points)]
+        assert collinear(a, b, c, ordered=ordered).tolist() == expected
+        assert collinear(*points, ordered=ordered).tolist() == expected
+
+
+def test_collinear_broadcast():
+    a, c = Point(0, 0, 0), Point(2, 2, 0)
+    queries = PointCloud([(1, 1, 0), (3, 3, 0), (1, 0, 0), (0, 0, 0), (-1, -1, 0)])
+    assert collinear(a, queries, c).tolist() == [True, True, False, True, True]
+    assert collinear(a, queries, c, ordered=True).tolist() == [True, False, False, True, False]
+    assert collinear(a, Point(1, 1, 0), c) is True
+
+    with pytest.raises(InvalidSizeError):
+        collinear(np.zeros((3, 3)), np.zeros((4, 3)), a)
+    with pytest.raises(InvalidSizeError):
+        collinear(np.zeros((3, 2)), np.zeros((3, 3)), a)
+
+
+def test_signed_area_and_orientation():
+    a = np.zeros((3, 3))
+    b = np.array([(1, 0, 0), (1, 0, 0), (1, 0, 0)], dtype=float)
+    c = np.array([(0, 1, 0), (0, -1, 0), (2, 0, 0)], dtype=float)
+    assert np.allclose(signed_area(a, b, c), [0.5, -0.5, 0])
+    assert np.allclose(signed_area(a, b, c, normal=(0, 0, -2)), [-0.5, 0.5, 0])
+    assert orientation(a, b, c).tolist() == [1, -1, 0]
+
+    assert signed_area(a[:, :2], b[:, :2], c[:, :2]).tolist() == [0.5, -0.5, 0]
+    assert orientation(Point(0, 0, 0), Point(1, 0, 0), Point(1, 1e-9, 0), abs_tol=1e-6) == 0
+    assert orientation(Point(0, 0, 0), Point(1, 0, 0), Point(1, 1, 0)) == 1
+
+
+def exact_sign(value):
+    return (value > 0) - (value < 0)
+
+
+def test_orient2d_near_degenerate():
+    # Points a few ulps away from the line through (12, 12) and (24, 24), where the naive determinant
+    # returns arbitrary signs
+    b, c = (12.0, 12.0), (24.0, 24.0)
+    ulp = np.spacing(0.5)
+    a = np.array([(0.5 + i * ulp, 0.5 + j * ulp) for i in range(16) for j in range(16)])
+
+    expected = []
+    for x, y in a.tolist():
+        det = (Fraction(x) - 24) * (12 - 24) - (Fraction(y) - 24) * (12 - 24)
+        expected.append(exact_sign(det))
+
+    assert np.sign(orient2d(a, b, c)).tolist() == expected
+    assert [exact_sign(orient2d(row, b, c)) for row in a.tolist()] == expected
+    assert 0 in expected and 1 in expected and -1 in expected
+
+    assert orient2d((0, 0), (1, 0), (0, 1)) > 0
+    assert orient2d(Point(0, 0, 5), Point(1, 0, 5), Point(0, -1, 5)) < 0
+
+
+def test_orient3d_and_incircle():
+    a, b, c = (0.0, 0.0, 0.0), (1.0, 0.0, 0.0), (0.0, 1.0, 0.0)
+    assert orient3d(a, b, c, (0.3, 0.3, -1.0)) > 0
+    assert orient3d(a, b, c, (0.3, 0.3, 1.0)) < 0
+    assert orient3d(a, b, c, (0.1, 0.7, 0.0)) == 0
+
+    ulp = np.spacing(1.0)
+    d = np.array([(0.25, 0.25, z) for z in (-ulp, 0.0, ulp)])
+    assert np.sign(orient3d(a, b, c, d)).tolist() == [1, 0, -1]
+
+    a, b, c = a[:2], b[:2], c[:2]
+    assert incircle(a, b, c, (0.5, 0.5)) > 0
+    assert incircle(a, b, c, (2.0, 2.0)) < 0
+    assert incircle(a, b, c, (1.0, 1.0)) == 0
+    d = np.array([(1.0 + ulp, 1.0), (1.0, 1.0), (1.0 - ulp / 2, 1.0)])
+    assert np.sign(incircle(a, b, c, d)).tolist() == [-1, 0, 1]
+
+    with pytest.raises(InvalidSizeError):
+        orient3d((0, 0), (1, 0), (0, 1), (1, 1))
+
+
+def test_collinear_exact():
+    # A fixed tolerance accepts small triangles and rejects large collinear points
+    a, b, c = Point(0, 0, 0), Point(1e-3, 0, 0), Point(0, 1e-3, 0)
+    assert Point.check_collinear(a, b, c)
+    assert not Point.check_collinear(a, b, c, exact=True)
+
+    a, b, c = Point(1e9, 3e9, -2e9), Point(2e9, 6e9, -4e9), Point(4e9, 12e9, -8e9)
+    assert Point.check_collinear(a, b, c, exact=True)
+    assert Point.check_collinear(a, b, c, ordered=True, exact=True)
+    assert not Point.check_collinear(a, c, b, ordered=True, exact=True)
+    assert Point.check_collinear(a, b, a, exact=True)
+    assert not Point.check_collinear(a, b, a, ordered=True, exact=True)
+
+    rng = np.random.default_rng(5)
+    points = rng.integers(-2, 3, (3, 300, 3)).astype(float) * 1e12
+    for ordered in (False, True):
+        expected = [Point.check_collinear(Point(*p), Point(*q), Point(*r), ordered=ordered, exact=True)
+                    for p, q, r in zip(*points.tolist())]
+        assert collinear(*points, ordered=ordered, exact=True).tolist() == expected
+        assert collinear(*(p / 1e12 for p in points), ordered=ordered).tolist() == expected
@@ -0,0 +1,92 @@
+# -*- coding : utf-8 -*-
+
+from fractions import Fraction
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+from geometry import LineSegment, Point
+from geometry.error import InvalidSizeError
+from geometry.utilities import segment_intersections
+
+
+def _orient(a, b, c):
+    return (b[0] - a[0]) * (c[1] - a[1]) - (b[1] - a[1]) * (c[0] - a[0])
+
+
+def _within(a, b, p):
+    return min(a[0], b[0]) <= p[0] <= max(a[0], b[0]) and min(a[1], b[1]) <= p[1] <= max(a[1], b[1])
+
+
+def _brute_force(segments):
+    # All pairs, decided in exact arithmetic
+    found = set()
+    for i, j in combinations(range(len(segments)), 2):
+        (a, b), (c, d) = ([tuple(map(Fraction, p)) for p in s] for s in (segments[i], segments[j]))
+        o1, o2, o3, o4 = _orient(a, b, c), _orient(a, b, d), _orient(c, d, a), _orient(c, d, b)
+        if (o1 * o2 < 0 and o3 * o4 < 0 or o1 == 0 and _within(a, b, c) or o2 == 0 and _within(a, b, d) or
+                o3 == 0 and _within(c, d, a) or o4 == 0 and _within(c, d, b)):
+            found.add((i, j))
+    return found
+
+
+def _distance_to_segment(p, a, b):
+    d = b - a
+    t = np.clip((p - a) @ d / (d @ d), 0, 1) if d @ d else 0.0
+    return np.linalg.norm(a + t * d - p)
+
+
+@pytest.mark.parametrize("seed", range(2))
+def test_segment_intersections_match_brute_force(seed):
+    rng = np.random.default_rng(seed)
+    # Small integer grids produce shared end points, collinear overlaps and vertical segments
+    segments = np.concatenate([rng.integers(0, 6, (60, 2, 2)).astype(float), rng.random((60, 2, 2)) * 6])
+    pairs, points = segment_intersections(segments)
+    assert len({tuple(p) for p in pairs.tolist()}) == len(pairs)
+    assert {tuple(p) for p in pairs.tolist()} == _brute_force(segments.tolist())
+    assert (pairs[:, 0] < pairs[:, 1]).all()
+    for (i, j), p in zip(pairs, points):
+        assert _distance_to_segment(p, *segments[i]) < 1e-09
+        assert _distance_to_segment(p, *segments[j]) < 1e-09
+
+
+def test_segment_intersections_degenerate():
+    segments = np.array([
+        [(0, 0), (4, 4)],
+        [(0, 4), (4, 0)],  # crosses 0 at (2, 2)
+        [(2, 0), (2, 4)],  # vertical through the same point
+        [(4, 4), (6, 4)],  # touches 0 at its end point
+        [(1, 1), (3, 3)],  # overlaps 0
+        [(5, 0), (5, 1)],  # isolated
+    ], dtype=float)
+    pairs, points = segment_intersections(segments)
+    found = dict(zip(map(tuple, pairs.tolist()), map(tuple, points.tolist())))
+    assert found == {(0, 1): (2, 2), (0, 2): (2, 2), (1, 2): (2, 2), (0, 3): (4, 4), (0, 4): (1, 1),
+                     (1, 4): (2, 2), (2, 4): (2, 2)}
+
+    pairs, points = segment_intersections(np.empty((0, 2, 2)))
+    assert pairs.shape == (0, 2) and points.shape == (0, 2)
+
+
+def test_segment_intersections_projected():
+    # A bridge over a road meets it in the xy plane, the point is reported on the first segment
+    road = LineSegment(Point(0, 0, 0), Point(10, 0, 0))
+    bridge = LineSegment(Point(5, -5, 3), Point(5, 5, 3))
+    ramp = LineSegment(Point(0, 2, 0), Point(10, 2, 10))
+    pairs, points = segment_intersections([road, bridge, ramp])
+    assert pairs.tolist() == [[0, 1], [1, 2]]
+    assert np.allclose(points, [(5, 0, 0), (5, 2, 3)])
+
+    # Seen along the x axis the road collapses to a point below the bridge, only the ramp climbs through it
+    pairs, points = segment_intersections([road, bridge, ramp], normal=(1, 0, 0))
+    assert pairs.tolist() == [[1, 2]]
+    assert np.allclose(points, [(5, 2, 3)])
+    pairs, points = segment_intersections([road, bridge, ramp], normal=(0, 1, 1))
+    assert sorted(pairs.tolist()) == [[0, 1], [0, 2], [1, 2]]
+    assert np.allclose(points[np.argsort(pairs[:, 0] * 3 + pairs[:, 1])], [(5, 0, 0), (2, 0, 0), (5, 0, 3)])
+
+    with pytest.raises(InvalidSizeError):
+        segment_intersections(np.zeros((3, 3, 2)))
+    with pytest.raises(ValueError):
+        segment_intersections([road, bridge], normal=(0, 0, 0))
@@ -0,0 +1,51 @@
+# -*- coding : utf-8 -*-
+
+from typing import List, Optional
+
+from geometry import Point, Quaternion, Vector
+from geometry.object.transform import Transform
+from geometry.types import Real
+
+
+class TransformableMixin:
+    """
+    Mixin for shapes made of Points that transform lazily.
+
+    translate, rotate and transform only compose a pending Transform, which is applied to all Points of the
+    shape in one pass the next time its coordinates are read. Chains of calls therefore cost one matrix
+    product each plus a single pass over the Points. Subclasses keep the pending Transform in _transform,
+    return their Points from _transform_targets and call _apply_pending before handing out Points.
+    """
+
+    __slots__ = ()
+
+    def _transform_targets(self) -> List[Point]:
+        raise NotImplementedError(f"{self.__class__.__name__} does not implement _transform_targets()")
+
+    def _apply_pending(self) -> None:
+        pending = self._transform
+        if pending is not None:
+            self._transform = None
+            pending.apply_to_points(self._transform_targets())
+
+    @property
+    def pending_transform(self) -> Transform:
+        return Transform.identity() if self._transform is None else self._transform
+
+    def transform(self, t: Transform) -> None:
+        self._transform = t if self._transform is None else t * self._transform
+
+    def translate(self, dx: Real, dy: Real, dz: Real) -> None:
+        self.transform(Transform.translation(dx, dy, dz))
+
+    def rotate(self, q: Quaternion, center: Optional[Point] = None) -> None:
+        """
+        Rotates the shape by the quaternion q around center, or around the origin when center is omitted
+        """
+        self.transform(Transform.rotation(q, center))
+
+    def rotate_around_axis(self, axis: Vector, angle: Real, center: Optional[Point] = None) -> None:
+        self.transform(Transform.rotation_around_axis(axis, angle, center))
+
+    def scale(self, sx: Real, sy: Optional[Real] = None, sz: Optional[Real] = None) -> None:
+        self.transform(Transform.scaling(sx, sy, sz))